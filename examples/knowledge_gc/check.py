@@ -0,0 +1,96 @@
+"""
+Check that `data-ai gc` (`store.gc`) collects legacy team documents on the Chroma backend.
+
+Team documents stored before they had a fixed ID only carried their agent as the
+document name, which Chroma does not keep, so they cannot be attributed. They must be
+kept and reported while a registered agent has no current team document, and deleted
+once every agent has one, including after they were moved into the shared collection.
+Runs on a Chroma store in a temporary directory with stored embeddings, so no embedding
+API is called; exits with status 1 if a check fails.
+
+    python check.py
+"""
+
+import atexit
+import os
+import shutil
+import sys
+import tempfile
+from uuid import uuid4
+
+# The store lives under the home directory, which is read when the constants are imported
+os.environ["HOME"] = tempfile.mkdtemp(prefix="data-ai-gc-check-")
+atexit.register(shutil.rmtree, os.environ["HOME"], True)
+os.environ["DATA_AI_VECTOR_BACKEND"] = "chroma"
+# Embedders are only constructed, never called
+os.environ.setdefault("OPENAI_API_KEY", "check")
+
+import typer  # noqa: E402
+from rich.console import Console  # noqa: E402
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from agno.document import Document  # noqa: E402
+
+from constants import SHARED_KNOWLEDGE_COLLECTION, TEAM_KNOWLEDGE_COLLECTION  # noqa: E402
+from store import StoreDb, migrate_collections  # noqa: E402
+from store.gc import collect_garbage  # noqa: E402
+
+AGENTS = {"orders", "users"}
+
+def _document(content: str, **kwargs) -> Document:
+    embedding = [float(ord(c) % 7) + 1.0 for c in content[:8].ljust(8)]
+    return Document(content=content, embedding=embedding, **kwargs)
+
+def legacy(agent: str, version: int) -> Document:
+    """A team document as stored before fixed IDs: named after its agent, with a random ID."""
+    return _document(f"{agent} team knowledge v{version}", name=agent, id=str(uuid4()), meta_data={"page": 0})
+
+def current(agent: str) -> Document:
+    """A team document as stored now."""
+    return _document(f"{agent} team knowledge", id=f"{agent}:team", meta_data={"page": 0, "agent": agent})
+
+def ids(collection: str):
+    return sorted(document.id for document in StoreDb().vector_db(collection=collection).export_documents())
+
+def main():
+    console = Console()
+    failed = []
+    store = StoreDb()
+    team = store.vector_db(collection=TEAM_KNOWLEDGE_COLLECTION)
+
+    # Legacy documents of a registered agent, of a deleted one, and one registered agent not re-analyzed yet
+    team.import_documents([legacy("orders", 1), legacy("orders", 2), legacy("deleted", 1), legacy("users", 1), current("orders")])
+    if any(document.name for document in team.export_documents()):
+        failed.append("Chroma kept the document names; legacy documents would be attributed")
+
+    report = collect_garbage(agents=AGENTS)
+    console.print(f"Before 'users' is re-analyzed: {report.duplicates} deleted, {report.unattributed} kept unattributed")
+    if report.unattributed != 4 or report.duplicates or report.without_team_document != ["users"]:
+        failed.append(f"legacy documents were not kept and reported: {report}")
+    if len(ids(TEAM_KNOWLEDGE_COLLECTION)) != 5:
+        failed.append(f"documents were deleted while 'users' has no current team document: {ids(TEAM_KNOWLEDGE_COLLECTION)}")
+
+    team.import_documents([current("users")])
+    report = collect_garbage(agents=AGENTS)
+    console.print(f"After 'users' is re-analyzed: {report.duplicates} deleted, {report.unattributed} kept unattributed")
+    if report.duplicates != 4 or report.unattributed or ids(TEAM_KNOWLEDGE_COLLECTION) != ["orders:team", "users:team"]:
+        failed.append(f"legacy documents were not collected: {ids(TEAM_KNOWLEDGE_COLLECTION)}")
+
+    # The shared layout: legacy documents are moved without their agent
+    team.import_documents([legacy("orders", 3), legacy("deleted", 2)])
+    shared = store.vector_db(collection=SHARED_KNOWLEDGE_COLLECTION)
+    migrate_collections(shared, TEAM_KNOWLEDGE_COLLECTION, lambda collection: store.vector_db(collection=collection))
+    report = collect_garbage(agents=AGENTS)
+    console.print(f"Shared collection: {report.duplicates} deleted, {report.unattributed} kept unattributed")
+    if report.duplicates != 2 or ids(SHARED_KNOWLEDGE_COLLECTION) != ["orders:team", "users:team"]:
+        failed.append(f"migrated legacy documents were not collected: {ids(SHARED_KNOWLEDGE_COLLECTION)}")
+
+    for failure in failed:
+        console.print(f"[red]FAIL[/red] {failure}")
+    if failed:
+        raise typer.Exit(code=1)
+    console.print("[green]ok[/green] legacy team documents are reported, then collected")
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,101 @@
+"""
+Check that member prompts keep a byte-identical prefix across turns, so providers can
+reuse their prompt cache (see `agents.layout`).
+
+A SQL member is built for two turns at different times, with different questions, and
+its system message and tool definitions are compared byte for byte. The current time
+must only appear in the user message. The default agno layout, which writes the time
+into the system message, is checked to differ, showing the comparison detects it.
+No model or database is called; exits with status 1 if a check fails.
+
+    python check.py
+"""
+
+import json
+import os
+import sys
+from datetime import datetime
+
+import typer
+from rich.console import Console
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+# Models are only constructed, never called
+os.environ.setdefault("OPENAI_API_KEY", "check")
+
+import datetime as datetime_module  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+
+import agents.layout as layout  # noqa: E402
+from agents.base import get_sql_agent  # noqa: E402
+from config import Config  # noqa: E402
+
+SEMANTIC_MODEL = json.dumps({"tables": [{"table_name": "orders", "table_description": "Customer orders", "Use Case": "Revenue"}]})
+SCHEMA = json.dumps({"database": "shop", "tables": [{"name": "orders", "columns": [{"name": "id"}, {"name": "total"}]}]})
+
+# (time of the turn, question)
+TURNS = [
+    (datetime(2024, 1, 1, 9, 0, 0), "How many orders are there?"),
+    (datetime(2024, 1, 1, 9, 5, 42), "What is the total revenue?"),
+]
+
+def _frozen(moment: datetime):
+    class Frozen(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return moment.replace(tzinfo=tz) if tz else moment
+    return Frozen
+
+def build_turn(moment: datetime, question: str):
+    """
+    Build a member as for one turn at `moment`: its system message, tool definitions and user message.
+    """
+    # agno imports datetime when it writes the time; the stable layout imports it at module level
+    datetime_module.datetime = layout.datetime = _frozen(moment)
+    agent = get_sql_agent(
+        name="shop",
+        debug_mode=False,
+        db_engine=create_engine("postgresql+psycopg2://check@localhost/shop"),
+        semantic_model=SEMANTIC_MODEL,
+        schema=SCHEMA,
+    )
+    agent.update_model(session_id="check")
+    run_messages = agent.get_run_messages(message=question, session_id="check")
+    system = run_messages.system_message.content if run_messages.system_message else ""
+    tools = json.dumps(agent.model.get_tools(), sort_keys=True, default=str)
+    return system.encode(), tools.encode(), run_messages.user_message.content
+
+def main():
+    console = Console()
+    real_datetime = datetime_module.datetime
+    failed = []
+    try:
+        Config().app_config.stable_prompt = True
+        turns = [build_turn(moment, question) for moment, question in TURNS]
+        (system_1, tools_1, user_1), (system_2, tools_2, user_2) = turns
+        if system_1 != system_2:
+            failed.append("system messages differ across turns")
+        if tools_1 != tools_2:
+            failed.append("tool definitions differ across turns")
+        if "2024-01-01" in system_1.decode():
+            failed.append("the system message holds the current time")
+        if not user_2.rstrip().endswith("</volatile_context>") or "09:05:42" not in user_2:
+            failed.append("the current time is not at the end of the user message")
+        console.print(f"Stable layout: system message {len(system_1)} bytes, tool definitions {len(tools_1)} bytes")
+
+        # The default layout puts the time in the system message, so the same comparison must fail
+        Config().app_config.stable_prompt = False
+        default = [build_turn(moment, question) for moment, question in TURNS]
+        if default[0][0] == default[1][0]:
+            failed.append("the comparison did not detect the time in the default layout's system message")
+    finally:
+        datetime_module.datetime = layout.datetime = real_datetime
+
+    for failure in failed:
+        console.print(f"[red]FAIL[/red] {failure}")
+    if failed:
+        raise typer.Exit(code=1)
+    console.print("[green]ok[/green] system message and tool definitions are byte-identical across turns")
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,251 @@
+"""
+Check the LLM call scheduler (`scheduler`) against a local fake provider that enforces
+rate limits the way hosted providers do and rejects calls over them with 429.
+
+- token buckets: sequential calls on a simulated clock stay within the provider's
+  requests and tokens per minute, with at most a second's burst, without being
+  slower than the limits require
+- concurrency cap: parallel calls never exceed the lane's in-flight limit
+- backoff: calls rejected with 429 or 5xx are retried after jittered exponential
+  backoff, and the error is raised once retries run out; other errors are not retried
+
+No model is called and nothing is written to the stats log; exits with status 1 if a
+check fails.
+
+    python check.py
+"""
+
+import os
+import random
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Deque, List, Tuple
+
+import typer
+from rich.console import Console
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+import scheduler as scheduler_module  # noqa: E402
+from scheduler import Limits, Scheduler  # noqa: E402
+
+# Simulated time never needs to round
+EPSILON = 1e-9
+
+class ProviderError(Exception):
+    """An HTTP error returned by the fake provider."""
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(f"{status_code} {message}")
+        self.status_code = status_code
+
+class SimulatedClock:
+    """A clock whose `sleep` advances time instantly; for single-threaded checks."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def clock(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += max(0.0, seconds)
+
+class FakeProvider:
+    """
+    A provider that enforces requests and tokens per minute and a concurrency limit,
+    answering calls over any of them with 429.
+
+    Limits are enforced over a sliding minute, each allowing one second's allowance of
+    burst. Like hosted providers, requests are also limited over a sliding second;
+    tokens are not, so a single long prompt is held to the minute only. Rejected calls
+    do not count against the limits.
+    """
+
+    def __init__(
+        self,
+        rpm: float = 0,
+        tpm: float = 0,
+        concurrency: int = 0,
+        latency: float = 0.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.concurrency = concurrency
+        self.latency = latency
+        self.clock = clock
+        self.sleep = sleep
+        self.accepted: Deque[Tuple[float, float]] = deque()
+        self.calls: List[float] = []
+        self.rejected = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.failures: List[int] = []
+        self._lock = threading.Lock()
+
+    def _over(self, per_minute: float, used: Callable[[float], float], amount: float, now: float, windows: Tuple[float, ...]) -> bool:
+        if per_minute <= 0:
+            return False
+        rate = per_minute / 60.0
+        burst = max(1.0, rate)
+        return any(used(now - window) + amount > burst + rate * window + EPSILON for window in windows)
+
+    def __call__(self, tokens: float = 0) -> str:
+        with self._lock:
+            now = self.clock()
+            self.calls.append(now)
+            if self.failures:
+                self.rejected += 1
+                raise ProviderError(self.failures.pop(0), "injected failure")
+            while self.accepted and self.accepted[0][0] <= now - 60.0:
+                self.accepted.popleft()
+            requests = lambda since: sum(1 for at, _ in self.accepted if at > since)
+            used = lambda since: sum(amount for at, amount in self.accepted if at > since)
+            if (
+                self._over(self.rpm, requests, 1, now, (60.0, 1.0))
+                or self._over(self.tpm, used, tokens, now, (60.0,))
+                or (self.concurrency and self.in_flight >= self.concurrency)
+            ):
+                self.rejected += 1
+                raise ProviderError(429, "rate limit exceeded")
+            self.accepted.append((now, tokens))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.latency:
+                self.sleep(self.latency)
+            return "ok"
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+def check_requests_per_minute(failed: List[str]) -> str:
+    """Sequential calls at the provider's requests per minute."""
+    sim = SimulatedClock()
+    provider = FakeProvider(rpm=120, latency=0.05, clock=sim.clock, sleep=sim.sleep)
+    scheduler = Scheduler(limits={"fake": Limits(rpm=120, tpm=0, concurrency=1)}, clock=sim.clock, sleep=sim.sleep)
+    calls = 300
+    for _ in range(calls):
+        scheduler.call("fake:model", provider)
+    # Two calls per second after a one-call burst, plus the last call's latency
+    expected = (calls - 2) / 2 + 0.05
+    if provider.rejected:
+        failed.append(f"rpm: the provider rejected {provider.rejected} calls paced by the scheduler")
+    if abs(sim.now - expected) > 0.5:
+        failed.append(f"rpm: {calls} calls took {sim.now:.1f}s, the limit allows {expected:.1f}s")
+    return f"{calls} calls at 120 requests/min in {sim.now:.1f}s of simulated time, {provider.rejected} rejected"
+
+def check_tokens_per_minute(failed: List[str]) -> str:
+    """Sequential calls of varying size at the provider's tokens per minute, one larger than a second's allowance."""
+    sim = SimulatedClock()
+    provider = FakeProvider(tpm=6000, clock=sim.clock, sleep=sim.sleep)
+    scheduler = Scheduler(limits={"fake": Limits(rpm=0, tpm=6000, concurrency=1)}, clock=sim.clock, sleep=sim.sleep)
+    sizes = [random.Random(seed).choice([10, 50, 80]) for seed in range(200)] + [450] + [30] * 50
+    for tokens in sizes:
+        scheduler.call("fake:model", lambda: provider(tokens), tokens)
+    # 100 tokens per second after a 100-token burst
+    expected = (sum(sizes) - 100) / 100
+    if provider.rejected:
+        failed.append(f"tpm: the provider rejected {provider.rejected} calls paced by the scheduler")
+    if abs(sim.now - expected) > 0.5:
+        failed.append(f"tpm: {sum(sizes)} tokens took {sim.now:.1f}s, the limit allows {expected:.1f}s")
+    return f"{len(sizes)} calls, {sum(sizes)} tokens at 6000 tokens/min in {sim.now:.1f}s of simulated time, {provider.rejected} rejected"
+
+def check_concurrency(failed: List[str]) -> str:
+    """Parallel calls against a provider that rejects more than 3 in flight."""
+    provider = FakeProvider(concurrency=3, latency=0.05)
+    scheduler = Scheduler(limits={"fake": Limits(rpm=0, tpm=0, concurrency=3)})
+    with ThreadPoolExecutor(max_workers=24) as executor:
+        results = list(executor.map(lambda _: scheduler.call("fake:model", provider), range(48)))
+    lane = scheduler.lane("fake:model")
+    if provider.rejected:
+        failed.append(f"concurrency: the provider rejected {provider.rejected} calls")
+    if provider.max_in_flight != 3:
+        failed.append(f"concurrency: {provider.max_in_flight} calls were in flight at most, expected 3")
+    if results != ["ok"] * 48 or lane.in_flight or lane.queued:
+        failed.append(f"concurrency: lane left with {lane.in_flight} in flight and {lane.queued} queued")
+    return f"48 calls from 24 threads, at most {provider.max_in_flight} in flight, {provider.rejected} rejected"
+
+def check_backoff(failed: List[str], events: List[dict]) -> str:
+    """Calls over the provider's limits, and injected 5xx, 4xx and persistent 429 errors."""
+    sim = SimulatedClock()
+    # The scheduler is configured for four times what the provider accepts, e.g. another client shares the key
+    provider = FakeProvider(rpm=60, clock=sim.clock, sleep=sim.sleep)
+    scheduler = Scheduler(
+        limits={"fake": Limits(rpm=240, tpm=0, concurrency=1)},
+        max_retries=8,
+        backoff_base=0.5,
+        backoff_max=4.0,
+        clock=sim.clock,
+        sleep=sim.sleep,
+    )
+    delays: List[Tuple[int, float]] = []
+    backoff = scheduler.backoff
+    def recorded_backoff(attempt: int) -> float:
+        delay = backoff(attempt)
+        delays.append((attempt, delay))
+        return delay
+    scheduler.backoff = recorded_backoff
+
+    for _ in range(60):
+        scheduler.call("fake:model", provider)
+    retried = provider.rejected
+    if not retried or len(delays) != retried:
+        failed.append(f"backoff: {retried} calls were rejected but {len(delays)} were retried")
+    out_of_range = [(a, d) for a, d in delays if not 0 <= d <= min(4.0, 0.5 * 2 ** a)]
+    if out_of_range:
+        failed.append(f"backoff: delays outside the jittered exponential range: {out_of_range[:3]}")
+    if sum(event.get("retries", 0) for event in events) != retried:
+        failed.append("backoff: retries are not recorded under llm.call")
+
+    # 5xx is retried, 4xx is not, and 429 is raised once retries run out
+    provider = FakeProvider(clock=sim.clock, sleep=sim.sleep)
+    provider.failures = [503, 502]
+    if scheduler.call("fake:model", provider) != "ok" or len(provider.calls) != 3:
+        failed.append(f"backoff: 5xx errors were not retried ({len(provider.calls)} attempts)")
+    for status, attempts in ((400, 1), (429, scheduler.max_retries + 1)):
+        provider = FakeProvider(clock=sim.clock, sleep=sim.sleep)
+        provider.failures = [status] * 20
+        try:
+            scheduler.call("fake:model", provider)
+            failed.append(f"backoff: a persistent {status} was not raised")
+        except ProviderError as e:
+            if e.status_code != status or len(provider.calls) != attempts:
+                failed.append(f"backoff: {status} was raised after {len(provider.calls)} attempts, expected {attempts}")
+    lane = scheduler.lane("fake:model")
+    if lane.in_flight or lane.queued:
+        failed.append(f"backoff: lane left with {lane.in_flight} in flight and {lane.queued} queued")
+    return f"60 calls paced for four times the provider's limit: {retried} rejected with 429, all retried and completed"
+
+def main():
+    console = Console()
+    failed: List[str] = []
+    events: List[dict] = []
+    # Keep the check out of the stats log
+    scheduler_module.record = lambda stage, wall, **fields: events.append(fields)
+    random.seed(0)
+    for name, check in (
+        ("requests/min", lambda: check_requests_per_minute(failed)),
+        ("tokens/min", lambda: check_tokens_per_minute(failed)),
+        ("concurrency", lambda: check_concurrency(failed)),
+        ("backoff", lambda: check_backoff(failed, events)),
+    ):
+        events.clear()
+        try:
+            console.print(f"[cyan]{name}[/cyan]: {check()}")
+        except ProviderError as e:
+            failed.append(f"{name}: the provider's {e.status_code} reached the caller")
+
+    for failure in failed:
+        console.print(f"[red]FAIL[/red] {failure}")
+    if failed:
+        raise typer.Exit(code=1)
+    console.print("[green]ok[/green] no call over the provider's limits leaked through the scheduler")
+
+if __name__ == "__main__":
+    typer.run(main)
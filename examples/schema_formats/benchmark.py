@@ -0,0 +1,141 @@
+"""
+Compare the analyzer input size of the JSON and compact schema serializations.
+
+Token counts use tiktoken (cl100k_base). When its encoding cannot be loaded, they are
+estimated at about four characters per token and labelled as estimates; the ratio is
+then a size ratio, not a token ratio. With --quality, the table use-case extractor is
+run on a fixture schema in both formats and its answers are checked against the
+fixture's tables (requires the API key of the configured analyze model).
+
+    python benchmark.py --tables 1000
+    python benchmark.py --quality
+"""
+
+import json
+import os
+import random
+import sys
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from db.compact import SCHEMA_FORMATS, render_schema  # noqa: E402
+from helper import count_tokens, exact_token_counts  # noqa: E402
+
+TYPES = [
+    "integer", "bigint", "smallint", "numeric(12,2)", "double precision", "boolean", "text",
+    "character varying(255)", "character varying(20)", "date", "timestamp without time zone",
+    "timestamp with time zone", "jsonb", "uuid",
+]
+
+# Small e-commerce schema used to check analyzer output in both formats
+FIXTURE = {
+    "database": "shop",
+    "tables": [
+        {"name": "customers", "description": "", "primary_key": ["id"], "rows": 52000, "columns": [
+            {"name": "id", "type": "integer", "description": ""},
+            {"name": "email", "type": "character varying(255)", "description": ""},
+            {"name": "country", "type": "character(2)", "description": "ISO country code"},
+            {"name": "created_at", "type": "timestamp with time zone", "description": ""},
+        ]},
+        {"name": "products", "description": "", "primary_key": ["id"], "rows": 1800, "columns": [
+            {"name": "id", "type": "integer", "description": ""},
+            {"name": "name", "type": "text", "description": ""},
+            {"name": "price", "type": "numeric(10,2)", "description": ""},
+            {"name": "active", "type": "boolean", "description": ""},
+        ]},
+        {"name": "orders", "description": "", "primary_key": ["id"], "rows": 410000, "columns": [
+            {"name": "id", "type": "bigint", "description": ""},
+            {"name": "customer_id", "type": "integer", "description": ""},
+            {"name": "status", "type": "character varying(20)", "description": "open, paid, shipped or cancelled"},
+            {"name": "ordered_at", "type": "timestamp with time zone", "description": ""},
+        ], "foreign_keys": [{"columns": ["customer_id"], "ref_table": "customers", "ref_columns": ["id"]}],
+            "indexes": [{"name": "orders_ordered_at", "columns": ["ordered_at"], "unique": False}]},
+        {"name": "order_items", "description": "", "primary_key": ["order_id", "product_id"], "rows": 1200000, "columns": [
+            {"name": "order_id", "type": "bigint", "description": ""},
+            {"name": "product_id", "type": "integer", "description": ""},
+            {"name": "quantity", "type": "integer", "description": ""},
+            {"name": "unit_price", "type": "numeric(10,2)", "description": ""},
+        ], "foreign_keys": [
+            {"columns": ["order_id"], "ref_table": "orders", "ref_columns": ["id"]},
+            {"columns": ["product_id"], "ref_table": "products", "ref_columns": ["id"]},
+        ]},
+    ],
+}
+
+app = typer.Typer(add_completion=False)
+
+def synthetic_schema(tables: int, seed: int = 7) -> dict:
+    """
+    Catalog JSON shaped like `Database.to_json()` output, with mostly empty descriptions.
+    """
+    rng = random.Random(seed)
+    data = {"database": "synthetic", "tables": []}
+    for t in range(tables):
+        name = f"table_{t:04d}"
+        columns = [{"name": "id", "type": "bigint", "description": ""}]
+        for c in range(rng.randint(4, 40)):
+            description = f"Attribute {c} of {name}" if rng.random() < 0.1 else ""
+            columns.append({"name": f"col_{c:02d}", "type": rng.choice(TYPES), "description": description})
+        table = {"name": name, "description": "", "columns": columns, "primary_key": ["id"], "rows": rng.randint(0, 50_000_000)}
+        if t and rng.random() < 0.5:
+            ref = f"table_{rng.randrange(t):04d}"
+            columns.append({"name": f"{ref}_id", "type": "bigint", "description": ""})
+            table["foreign_keys"] = [{"columns": [f"{ref}_id"], "ref_table": ref, "ref_columns": ["id"]}]
+        if rng.random() < 0.3:
+            table["indexes"] = [{"name": f"{name}_col_00_idx", "columns": ["col_00"], "unique": False}]
+        data["tables"].append(table)
+    return data
+
+def check_answer(content: str) -> str:
+    """
+    Compare the extractor's answer with the fixture's tables; returns 'ok' or what is wrong.
+    """
+    text = content.strip().removeprefix("```json").removeprefix("```").removesuffix("```")
+    try:
+        answer = json.loads(text)
+    except ValueError:
+        return "invalid JSON"
+    items = answer.get("tables", answer) if isinstance(answer, dict) else answer
+    names = {item.get("table_name") for item in items if isinstance(item, dict)}
+    expected = {table["name"] for table in FIXTURE["tables"]}
+    if names != expected:
+        return f"tables {sorted(n for n in names if n)} != {sorted(expected)}"
+    return "ok"
+
+@app.command()
+def benchmark(
+    tables: int = typer.Option(1000, help="Number of tables in the synthetic schema"),
+    quality: bool = typer.Option(False, help="Also run the table use-case extractor on the fixture in both formats"),
+):
+    console = Console()
+    exact = exact_token_counts()
+    tokens_label = "Tokens" if exact else "Tokens (est.)"
+    if not exact:
+        console.print("[yellow]tiktoken's cl100k_base encoding is not available: token counts are estimated at four characters per token.[/yellow]")
+    schema = json.dumps(synthetic_schema(tables))
+    sizes = {schema_format: render_schema(schema, schema_format) for schema_format in SCHEMA_FORMATS}
+
+    table = Table(title=f"Synthetic schema, {tables} tables")
+    table.add_column("Format", style="cyan")
+    table.add_column("Bytes", justify="right")
+    table.add_column(tokens_label, justify="right")
+    table.add_column("vs json", justify="right", style="green")
+    baseline = count_tokens(sizes["json"])
+    for schema_format, text in sizes.items():
+        tokens = count_tokens(text)
+        table.add_row(schema_format, f"{len(text):,}", f"{tokens:,}", f"{tokens / baseline:.0%}")
+    console.print(table)
+
+    if quality:
+        from agents import get_table_use_case_extractor
+        for schema_format in SCHEMA_FORMATS:
+            message = render_schema(FIXTURE, schema_format)
+            response = get_table_use_case_extractor().run(message=message)
+            console.print(f"{schema_format}: {count_tokens(message)} input {tokens_label.lower()}, extractor answer {check_answer(response.content)}")
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,80 @@
+"""
+Check the local SQL validator (`tools.validation`) against queries with known outcomes:
+read-only enforcement, and table and column resolution with each dialect's identifier
+case folding. Exits with status 1 if any case fails.
+
+    python check.py
+"""
+
+import os
+import sys
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from tools.validation import SchemaSnapshot, validate  # noqa: E402
+
+SNAPSHOT = SchemaSnapshot(
+    database="shop",
+    tables={
+        "Orders": ["Id", "UserId", "total"],
+        "users": ["id", "name"],
+        "sales.Items": ["Sku"],
+    },
+)
+
+# (dialect, query, whether it is accepted)
+CASES = [
+    # Read-only enforcement
+    ("postgresql", "select 1", True),
+    ("postgresql", "delete from users", False),
+    ("postgresql", "select 1; select 2", False),
+    ("mysql", "create table t (id int)", False),
+    # PostgreSQL folds unquoted identifiers to lowercase; quoted ones keep their case
+    ("postgresql", 'select "UserId" from "Orders"', True),
+    ("postgresql", "select UserId from Orders", False),
+    ("postgresql", 'select UserId from "Orders"', False),
+    ("postgresql", 'select "UserId" from Orders', False),
+    ("postgresql", 'select total from "Orders"', True),
+    ("postgresql", "select ID from users", True),
+    ("postgresql", 'select "ID" from users', False),
+    ("postgresql", 'select o."Id", u.name from "Orders" o join users u on u.id = o."UserId"', True),
+    ("postgresql", 'select "Sku" from sales."Items"', True),
+    ("postgresql", 'select "Sku" from sales.Items', False),
+    # MySQL and ClickHouse column names resolve regardless of case
+    ("mysql", "select ID from orders", True),
+    ("mysql", "select `userid` from Orders", True),
+    ("mysql", "select USERID, Total from Orders", True),
+    ("mysql", "select nope from Orders", False),
+    ("clickhouse", "select userid from Orders", True),
+    ("clickhouse", "select nope from Orders", False),
+]
+
+def main():
+    console = Console()
+    table = Table()
+    table.add_column("Dialect", style="cyan")
+    table.add_column("Query")
+    table.add_column("Expected")
+    table.add_column("Result")
+    failed = 0
+    for dialect, sql, accepted in CASES:
+        errors = validate(sql, dialect, SNAPSHOT)
+        ok = (not errors) == accepted
+        failed += not ok
+        table.add_row(
+            dialect,
+            sql,
+            "accept" if accepted else "reject",
+            "[green]ok[/green]" if ok else f"[red]FAIL[/red] {' '.join(errors) or 'accepted'}",
+        )
+    console.print(table)
+    console.print(f"{len(CASES) - failed} of {len(CASES)} cases passed.")
+    if failed:
+        raise typer.Exit(code=1)
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,157 @@
+"""
+Compare the Chroma and NumPy vector backends on startup time, query latency and memory.
+
+Both backends are filled with the same synthetic collections in a temporary
+directory, using a deterministic local embedder (no API calls). Each backend is
+then measured in a fresh process: startup is the time to import the backend and
+answer a first query, and RSS is the peak resident memory of that process.
+
+    python benchmark.py --collections 5 --docs 2000
+"""
+
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+import numpy as np  # noqa: E402
+from agno.document import Document  # noqa: E402
+from agno.embedder import Embedder  # noqa: E402
+
+from store.vector import VECTOR_BACKENDS  # noqa: E402
+
+app = typer.Typer(add_completion=False)
+
+@dataclass
+class HashEmbedder(Embedder):
+    """
+    Deterministic embedder: a random vector seeded by the text's hash.
+    """
+    dimensions: Optional[int] = 1536
+
+    def get_embedding(self, text: str) -> List[float]:
+        seed = int(hashlib.md5(text.encode()).hexdigest()[:8], 16)
+        return np.random.default_rng(seed).standard_normal(self.dimensions).tolist()
+
+    def get_embedding_and_usage(self, text: str) -> Tuple[List[float], Optional[Dict]]:
+        return self.get_embedding(text), None
+
+def open_collection(backend: str, path: str, collection: str, dimensions: int):
+    if backend == "numpy":
+        from store.vector import NumpyVectorDb
+        return NumpyVectorDb(collection=collection, path=path, embedder=HashEmbedder(dimensions=dimensions))
+    from store.chroma import TimedChromaDb
+    db = TimedChromaDb(collection=collection, path=path, embedder=HashEmbedder(dimensions=dimensions), persistent_client=True)
+    db.create()
+    return db
+
+def peak_rss() -> int:
+    """
+    Peak resident memory of this process in bytes.
+
+    On Linux this is VmHWM, which starts over when the process image is replaced;
+    ru_maxrss carries over the high-water mark of the parent that started the probe.
+    """
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    import resource
+
+    # ru_maxrss is in bytes on macOS
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+def probe(backend: str, path: str, collections: int, dimensions: int, queries: int):
+    """
+    Measure one backend in this process and print the results as JSON.
+    """
+    start = time.perf_counter()
+    dbs = [open_collection(backend, path, f"agent_{c}", dimensions) for c in range(collections)]
+    dbs[0].search("warm up", limit=5)
+    startup = time.perf_counter() - start
+
+    latencies = []
+    for q in range(queries):
+        start = time.perf_counter()
+        dbs[q % collections].search(f"question {q}", limit=5)
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    print(json.dumps({
+        "startup": startup,
+        "p50": latencies[len(latencies) // 2],
+        "p95": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+        "rss": peak_rss(),
+    }))
+
+@app.command()
+def benchmark(
+    collections: int = typer.Option(5, help="Number of agent collections"),
+    docs: int = typer.Option(2000, help="Documents per collection"),
+    dimensions: int = typer.Option(1536, help="Embedding dimensions"),
+    queries: int = typer.Option(200, help="Queries measured per backend"),
+    probe_backend: str = typer.Option("", hidden=True),
+    probe_path: str = typer.Option("", hidden=True),
+):
+    import instrument
+
+    # Keep the benchmark's stages out of the stats file
+    instrument.record = lambda *args, **kwargs: None
+    if probe_backend:
+        return probe(probe_backend, probe_path, collections, dimensions, queries)
+
+    console = Console()
+    table = Table(title=f"{collections} collections x {docs} documents, {dimensions} dimensions")
+    table.add_column("Backend", style="cyan")
+    table.add_column("Fill", justify="right")
+    table.add_column("Startup", justify="right")
+    table.add_column("Query p50", justify="right")
+    table.add_column("Query p95", justify="right")
+    table.add_column("Peak RSS", justify="right")
+
+    with tempfile.TemporaryDirectory() as root:
+        for backend in VECTOR_BACKENDS:
+            path = os.path.join(root, backend)
+            start = time.perf_counter()
+            for c in range(collections):
+                db = open_collection(backend, path, f"agent_{c}", dimensions)
+                for offset in range(0, docs, 500):
+                    db.upsert([
+                        Document(content=f"agent {c} document {d}", id=f"{c}:{d}", meta_data={"level": "member"})
+                        for d in range(offset, min(docs, offset + 500))
+                    ])
+            fill = time.perf_counter() - start
+
+            output = subprocess.run(
+                [
+                    sys.executable, __file__, "--probe-backend", backend, "--probe-path", path,
+                    "--collections", str(collections), "--dimensions", str(dimensions), "--queries", str(queries),
+                ],
+                check=True, capture_output=True, text=True,
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            table.add_row(
+                backend,
+                f"{fill:.1f}s",
+                f"{result['startup'] * 1000:.0f}ms",
+                f"{result['p50'] * 1000:.2f}ms",
+                f"{result['p95'] * 1000:.2f}ms",
+                f"{result['rss'] / 2**20:.0f} MiB",
+            )
+    console.print(table)
+
+if __name__ == "__main__":
+    app()
@@ -1,22 +1,22 @@
 from typing import Optional
 from agno.agent import Agent, AgentKnowledge
 from agno.tools.reasoning import ReasoningTools
-from agno.tools.sql import SQLTools
 from agno.tools.file import FileTools
 from textwrap import dedent
 
+from agents.history import BoundedMemory
+from agents.layout import StablePrefixAgent
 from agents.promt import (
     additional_context,
     description, 
     get_sql_instruction
 )
-from constants import (
-    IMAGES_PATH,
-    MEMBER_MODEL_NAME,
-    ANALYZE_MODEL_NAME
-)
+from cascade import CascadeModel, invalid_json, low_confidence
+from config import Config
+from constants import IMAGES_PATH
 
 from sqlalchemy import Engine
+from tools import DatabaseSQLTools, JoinGraph, JoinPathTools
 from helper import (
     db_name,
     get_model,
@@ -24,42 +24,56 @@ from helper import (
 
 def get_sql_agent(
     name: str = "SQL Agent",
-    model_id: str = MEMBER_MODEL_NAME,
+    model_id: Optional[str] = None,
     reasoning: bool = False,
     debug_mode: bool = True,
     db_engine: Optional[Engine] = None,
     knowledge_base: Optional[AgentKnowledge] = None,
     semantic_model: str = "",
+    schema: str = "",
+    join_graph: str = "",
 ) -> Agent:
     """
     Create a SQL Agent capable of querying databases using natural language instructions.
 
     Parameters:
     - name: Agent identifier and display name.
-    - model_id: Language model backend to use (e.g., OpenAI GPT model ID).
+    - model_id: Language model backend to use (e.g., OpenAI GPT model ID, or a cascade); defaults to the configured member model.
     - reasoning: Whether to include reasoning tools for chain-of-thought or justification.
     - debug_mode: Enables detailed logs, tool visibility, and chat history traceability.
     - db_engine: SQLAlchemy engine to access the target database.
     - knowledge_base: Optional vectorized knowledge base (e.g., Chroma, Qdrant).
     - semantic_model: Serialized semantic metadata about the database.
+    - schema: Catalog snapshot (JSON) used to validate queries before they run.
+    - join_graph: Precomputed join-path graph (JSON) for multi-table queries.
 
     Returns:
     - An Agent instance equipped with SQLTools, optional reasoning, and knowledge-enhanced instructions.
     """
     # Load the language model specified
-    model = get_model(model_id=model_id)
+    model = get_model(model_id=model_id or Config().app_config.member_model, validator=low_confidence)
 
-    # Attach core tools: SQL access and file saving
+    # Attach core tools: SQL access and file saving; in a cascade, a rejected query escalates to the next tier
+    on_rejected = model.escalate if isinstance(model, CascadeModel) else None
     tools = [
-        SQLTools(list_tables=False, db_engine=db_engine),
+        DatabaseSQLTools(database=name, snapshot=schema, list_tables=False, db_engine=db_engine, on_rejected=on_rejected),
     ]
 
+    # Join paths are looked up in the graph stored at add time instead of discovered by trial
+    graph = JoinGraph.from_json(join_graph)
+    if graph is not None and graph.edges:
+        tools.append(JoinPathTools(graph))
+
     # Optionally add reasoning toolset for higher-level tasks
     if reasoning:
         tools.append(ReasoningTools(add_instructions=True, add_few_shot=True))
 
+    # In the stable layout the current time moves from the system message to the end of the user message
+    stable_prompt = Config().app_config.stable_prompt
+    agent_class = StablePrefixAgent if stable_prompt else Agent
+
     # Build the agent object
-    return Agent(
+    return agent_class(
         name=name,
         model=model,
         agent_id=name,
@@ -73,21 +87,23 @@ def get_sql_agent(
         read_chat_history=True,
         read_tool_call_history=True,
         debug_mode=debug_mode,
+        # History is bounded by a token budget; SQL results are not replayed
+        memory=BoundedMemory(),
         add_history_to_messages=True,
-        add_datetime_to_instructions=True,
+        add_datetime_to_instructions=not stable_prompt,
         show_tool_calls=debug_mode,
         add_name_to_instructions=True,
     )
 
 def get_structure_usage_explainer(
     name: str = "Structure Usage Explainer",
-    model_id: str = ANALYZE_MODEL_NAME
+    model_id: Optional[str] = None
 ) -> Agent:
     """
     Returns an Agent that explains in what scenarios a database structure should be used.
     This agent does not describe specific tables or columns, only the general use of the structure.
     """
-    model = get_model(model_id=model_id)
+    model = get_model(model_id=model_id or Config().app_config.analyze_model, validator=low_confidence)
     return Agent(
         name=name,
         model=model,
@@ -114,13 +130,13 @@ def get_structure_usage_explainer(
 
 def get_structure_explainer_with_example(
     name: str = "Structure Usage with Example",
-    model_id: str = ANALYZE_MODEL_NAME
+    model_id: Optional[str] = None
 ) -> Agent:
     """
     Returns an Agent that explains a database structure and when it is useful, along with an example query.
     Includes instruction to describe table usage and generate a sample query for context.
     """
-    model = get_model(model_id=model_id)
+    model = get_model(model_id=model_id or Config().app_config.analyze_model, validator=low_confidence)
     return Agent(
         name=name,
         model=model,
@@ -152,13 +168,13 @@ def get_structure_explainer_with_example(
 
 def get_table_use_case_extractor(
     name: str = "Table Use Case Extractor",
-    model_id: str = ANALYZE_MODEL_NAME
+    model_id: Optional[str] = None
 ) -> Agent:
     """
     Returns an Agent that extracts table information and use cases in JSON format.
     Designed to output clean structured data with no extra explanation.
     """
-    model = get_model(model_id=model_id)
+    model = get_model(model_id=model_id or Config().app_config.analyze_model, validator=invalid_json)
     return Agent(
         name=name,
         model=model,
@@ -0,0 +1,140 @@
+"""
+This module answers a file of questions without the interactive chat, for nightly
+question suites used in regression runs and reporting.
+
+Questions are read from JSONL and answered by a pool of workers. Each worker owns
+a data team, because agno teams keep per-run state on the instance, and every
+question runs in its own session so no history leaks between questions. Answers
+are appended to the output file as they finish, with latency and token usage.
+"""
+
+import json
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+from uuid import uuid4
+
+from agno.team.team import Team
+from agno.utils.log import logger
+
+from instrument import record_team_run, run_tokens, timed
+
+@dataclass
+class Question:
+    """
+    One question of a batch.
+
+    Attributes:
+        id (str): Identifier copied to the answer; defaults to the line number.
+        question (str): The natural-language question.
+        meta (dict): Any other fields of the input line, copied to the answer.
+    """
+    id: str
+    question: str
+    meta: dict
+
+def load_questions(path: str) -> List[Question]:
+    """
+    Read questions from a JSONL file.
+
+    Each line is either a JSON string or an object with a `question` field and an
+    optional `id`; other fields are kept and copied to the answer. Blank lines are skipped.
+    """
+    questions = []
+    with open(path) as f:
+        for number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                item = json.loads(line)
+            except ValueError as e:
+                raise ValueError(f"{path}:{number}: invalid JSON: {e}")
+            if isinstance(item, str):
+                item = {"question": item}
+            if not isinstance(item, dict) or not item.get("question"):
+                raise ValueError(f"{path}:{number}: expected a string or an object with a 'question' field")
+            meta = {k: v for k, v in item.items() if k not in ("id", "question")}
+            questions.append(Question(id=str(item.get("id", number)), question=str(item["question"]), meta=meta))
+    return questions
+
+def team_tokens(run_response: Any) -> Dict[str, int]:
+    """
+    Sum prompt and completion tokens of a team run, leader and members included.
+    """
+    tokens = run_tokens(run_response)
+    for member_response in getattr(run_response, "member_responses", None) or []:
+        for key, value in run_tokens(member_response).items():
+            tokens[key] += value
+    return tokens
+
+def _answer(team: Team, question: Question) -> Dict[str, Any]:
+    """
+    Answer one question in a fresh session and describe the outcome.
+    """
+    session_id = f"batch-{uuid4()}"
+    result: Dict[str, Any] = {"id": question.id, "question": question.question, **question.meta, "session_id": session_id}
+    started = time.perf_counter()
+    try:
+        with timed("batch.question", question=question.id) as span:
+            response = team.run(message=question.question, session_id=session_id)
+            span.update(team_tokens(response))
+        result["answer"] = response.content if isinstance(response.content, str) else json.dumps(response.content, default=str)
+        result.update(team_tokens(response))
+        record_team_run(response, time.perf_counter() - started)
+    except Exception as e:
+        logger.warning(f"Question {question.id} failed: {e}")
+        result["answer"] = None
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["latency"] = round(time.perf_counter() - started, 3)
+    return result
+
+def run_batch(
+    questions: List[Question],
+    output: str,
+    teams: List[Team],
+    on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Answer questions concurrently and append one JSON line per answer to `output`.
+
+    Args:
+        questions (List[Question]): Questions to answer.
+        output (str): JSONL file answers are appended to, in completion order.
+        teams (List[Team]): Data teams built up front; one question runs on each at a time,
+            so their number is the concurrency.
+        on_result (Callable): Called with each answer as it is written, e.g. to report progress.
+
+    Returns:
+        List[Dict]: The answers, in completion order.
+    """
+    idle: "queue.Queue[Team]" = queue.Queue()
+    for team in teams:
+        idle.put(team)
+
+    def answer(question: Question) -> Dict[str, Any]:
+        team = idle.get()
+        try:
+            return _answer(team, question)
+        finally:
+            idle.put(team)
+
+    # Answers are written from this thread only, as workers finish
+    results = []
+    with open(output, "a") as f, ThreadPoolExecutor(max_workers=max(1, len(teams))) as executor:
+        futures = [executor.submit(answer, question) for question in questions]
+        try:
+            for future in as_completed(futures):
+                result = future.result()
+                f.write(json.dumps(result, default=str) + "\n")
+                # Flush per answer so partial runs keep everything answered so far
+                f.flush()
+                results.append(result)
+                if on_result is not None:
+                    on_result(result)
+        except KeyboardInterrupt:
+            for future in futures:
+                future.cancel()
+            raise
+    return results
@@ -0,0 +1,238 @@
+"""
+This module exports a registered database with its precomputed knowledge as a
+portable bundle, and imports bundles, for `data-ai export` and `data-ai import`.
+
+A bundle is a single zip file holding:
+
+- manifest.json: the database entry (URI without credentials, options, semantic
+  model, schema snapshot and join graph), fingerprints of the schema snapshot,
+  the embedder the vectors were computed with, and the knowledge documents
+- vectors.npy: the documents' embeddings, as a float32 matrix in document order
+
+Importing a bundle registers the database and loads its knowledge without any LLM
+or embedding calls, so machines sharing the same databases analyze them once.
+Credentials are never exported; they are supplied when the bundle is imported.
+"""
+
+import io
+import json
+import re
+import time
+import zipfile
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from agno.document import Document
+from sqlalchemy.engine import URL, make_url
+
+from db.fingerprint import changed_tables, schema_fingerprints
+from helper import agent_name as map_agent_name
+from instrument import timed
+from store import StoreDb
+from store.partition import MEMBER_LEVEL, TEAM_LEVEL
+from store.vector import TimedOpenAIEmbedder
+
+# Version of the bundle layout, checked on import
+BUNDLE_FORMAT = 1
+
+# URI query parameters that may hold credentials
+_SECRET_PARAMETERS = re.compile(r"pass|secret|token|key", re.IGNORECASE)
+
+@dataclass
+class Bundle:
+    """
+    Contents of a bundle.
+
+    Attributes:
+        database (dict): Database entry: name, driver, uri (without credentials), options,
+            meta_data (semantic model), schema and join_graph.
+        fingerprints (dict): `schema_fingerprints` of the schema snapshot.
+        embedder (dict): Embedding model id and dimensions of the vectors.
+        documents (List[Document]): Knowledge documents with their embeddings; `meta_data["level"]`
+            is 'member' or 'team'.
+        created_at (float): Export time.
+    """
+    database: Dict[str, Any]
+    fingerprints: Dict[str, Any]
+    embedder: Dict[str, Any]
+    documents: List[Document] = field(default_factory=list)
+    created_at: float = 0.0
+
+def strip_credentials(uri: str) -> str:
+    """
+    The URI without user name, password and secret-looking query parameters.
+    """
+    url = make_url(uri)
+    url = URL.create(
+        drivername=url.drivername,
+        host=url.host,
+        port=url.port,
+        database=url.database,
+        query={key: value for key, value in url.query.items() if not _SECRET_PARAMETERS.search(key)},
+    )
+    return url.render_as_string(hide_password=False)
+
+def with_credentials(uri: str, username: Optional[str] = None, password: Optional[str] = None) -> str:
+    """
+    The URI with the given user name and password.
+    """
+    url = make_url(uri)
+    if username is not None:
+        url = url.set(username=username)
+    if password is not None:
+        url = url.set(password=password)
+    return url.render_as_string(hide_password=False)
+
+def _embedder() -> Dict[str, Any]:
+    embedder = TimedOpenAIEmbedder()
+    return {"id": embedder.id, "dimensions": embedder.dimensions}
+
+def export_bundle(name: str, path: str) -> Bundle:
+    """
+    Write a registered database and its knowledge to a bundle file.
+
+    Raises:
+        ValueError: If no database with this name is registered.
+    """
+    store = StoreDb()
+    entry = next((entry for entry in store.app_store.get_all() if entry.name == name), None)
+    if entry is None:
+        raise ValueError(f"No database named '{name}' is registered")
+    agent_name = map_agent_name(name)
+
+    with timed("bundle.export", database=name) as span:
+        documents = []
+        for document in store.knowleged_base_db(collection=agent_name).export_documents():
+            document.meta_data = {**document.meta_data, "level": MEMBER_LEVEL}
+            documents.append(document)
+        for document in store.data_team_knowledge.vector_db.export_documents():
+            if agent_name in (document.meta_data.get("agent"), document.name) or document.id == f"{agent_name}:team":
+                document.meta_data = {**document.meta_data, "level": TEAM_LEVEL}
+                documents.append(document)
+
+        bundle = Bundle(
+            database={
+                "name": entry.name,
+                "driver": entry.driver,
+                "uri": strip_credentials(entry.uri),
+                "options": entry.options,
+                "meta_data": entry.meta_data,
+                "schema": entry.schema,
+                "join_graph": entry.join_graph,
+            },
+            fingerprints=schema_fingerprints(entry.schema) if entry.schema else {},
+            embedder=_embedder(),
+            documents=documents,
+            created_at=time.time(),
+        )
+        manifest = {
+            "format": BUNDLE_FORMAT,
+            "created_at": bundle.created_at,
+            "database": bundle.database,
+            "fingerprints": bundle.fingerprints,
+            "embedder": bundle.embedder,
+            "documents": [
+                {"id": document.id, "name": document.name, "content": document.content, "meta_data": document.meta_data}
+                for document in documents
+            ],
+        }
+        vectors = io.BytesIO()
+        np.save(vectors, np.asarray([document.embedding for document in documents], dtype=np.float32))
+        with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr("manifest.json", json.dumps(manifest))
+            archive.writestr("vectors.npy", vectors.getvalue())
+        span["rows"] = len(documents)
+    return bundle
+
+def read_bundle(path: str) -> Bundle:
+    """
+    Read a bundle file.
+
+    Raises:
+        ValueError: If the file is not a bundle or was written by an unsupported version.
+    """
+    try:
+        with zipfile.ZipFile(path) as archive:
+            manifest = json.loads(archive.read("manifest.json"))
+            vectors = np.load(io.BytesIO(archive.read("vectors.npy")))
+    except (KeyError, zipfile.BadZipFile) as e:
+        raise ValueError(f"{path} is not a data-ai bundle: {e}")
+    if manifest.get("format") != BUNDLE_FORMAT:
+        raise ValueError(f"{path}: unsupported bundle format {manifest.get('format')} (expected {BUNDLE_FORMAT})")
+    documents = [
+        Document(id=item["id"], name=item["name"], content=item["content"], meta_data=item["meta_data"], embedding=vector.tolist())
+        for item, vector in zip(manifest["documents"], vectors)
+    ]
+    return Bundle(
+        database=manifest["database"],
+        fingerprints=manifest["fingerprints"],
+        embedder=manifest["embedder"],
+        documents=documents,
+        created_at=manifest["created_at"],
+    )
+
+def _rename(document: Document, old_agent: str, new_agent: str) -> Document:
+    """
+    Move a document to another agent: its ID, name and agent metadata name the agent.
+    """
+    def renamed(value: Optional[str]) -> Optional[str]:
+        if value == old_agent or (value or "").startswith(f"{old_agent}:"):
+            return new_agent + value[len(old_agent):]
+        return value
+    document.id = renamed(document.id)
+    document.name = renamed(document.name)
+    if "agent" in document.meta_data:
+        document.meta_data["agent"] = new_agent
+    return document
+
+def import_bundle(bundle: Bundle, uri: str, name: Optional[str] = None) -> int:
+    """
+    Register the bundle's database under `uri` and load its knowledge, without LLM or embedding calls.
+
+    Args:
+        bundle (Bundle): The bundle, as read by `read_bundle`.
+        uri (str): Connection URI with credentials.
+        name (str): Register the database under another name.
+
+    Returns:
+        int: Number of knowledge documents loaded.
+
+    Raises:
+        ValueError: If the name or URI is already registered, or the vectors were computed
+            with another embedding model than the one configured.
+    """
+    store = StoreDb()
+    old_name = bundle.database["name"]
+    name = name or old_name
+    for entry in store.app_store.get_all():
+        if entry.name == name:
+            raise ValueError(f"A database named '{name}' is already registered; import it with another name")
+        if entry.uri == uri:
+            raise ValueError(f"This URI is already registered as '{entry.name}'")
+    embedder = _embedder()
+    if bundle.embedder.get("id") != embedder["id"] or bundle.embedder.get("dimensions") != embedder["dimensions"]:
+        raise ValueError(
+            f"The bundle's vectors were computed with {bundle.embedder.get('id')} ({bundle.embedder.get('dimensions')} dimensions), "
+            f"but {embedder['id']} ({embedder['dimensions']} dimensions) is configured"
+        )
+
+    agent_name = map_agent_name(name)
+    documents = [_rename(document, map_agent_name(old_name), agent_name) for document in bundle.documents]
+    with timed("bundle.import", database=name, rows=len(documents)):
+        member = [document for document in documents if document.meta_data.get("level") == MEMBER_LEVEL]
+        team = [document for document in documents if document.meta_data.get("level") == TEAM_LEVEL]
+        store.knowleged_base_db(collection=agent_name).import_documents(member)
+        store.data_team_knowledge.vector_db.import_documents(team)
+        store.app_store.create({
+            **bundle.database,
+            "name": name,
+            "uri": uri,
+        })
+    return len(member) + len(team)
+
+def schema_drift(bundle: Bundle, schema: str) -> Dict[str, List[str]]:
+    """
+    Tables added, removed or changed in the live catalog since the bundle's snapshot.
+    """
+    return changed_tables(bundle.fingerprints, schema_fingerprints(schema))
@@ -0,0 +1,141 @@
+"""
+This module detects schema drift of registered databases: catalog changes made since
+a database was indexed, which leave its knowledge and schema snapshot stale, so agents
+write SQL against dropped or renamed columns.
+
+Detection compares the catalog watermark stored with each `DatabaseStore` entry with
+the current one (`Database.watermark()`, a single catalog query per database), so it
+is cheap enough to run whenever agents load. `reindex` refreshes a database:
+
+- the catalog is introspected and compared with the stored snapshot, table by table
+- if no table's structure changed, only the snapshot and watermark are updated,
+  without any LLM calls
+- otherwise the snapshot, join graph and watermark are updated right away, so queries
+  are validated against the current catalog, and a job re-analyzing the database's
+  knowledge is queued (see `agents.jobs`)
+"""
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from agno.utils.log import logger
+from sqlalchemy import create_engine
+
+from agents.knowledge import get_schema_json, get_watermark
+from constants import WATERMARK_CONCURRENCY, WATERMARK_TIMEOUT_SECONDS
+from db.engine import create_db_engine
+from db.fingerprint import changed_tables, schema_fingerprints
+from instrument import timed
+from store import StoreDb
+from store.app import DatabaseObject
+from tools.joins import JoinGraph
+
+@dataclass
+class Drift:
+    """
+    A database whose catalog changed since it was indexed.
+
+    Attributes:
+        name (str): Name of the database.
+        stored (str): Watermark stored when the database was indexed.
+        current (str): Watermark read now.
+    """
+    name: str
+    stored: str
+    current: str
+
+@dataclass
+class Reindex:
+    """
+    Outcome of re-indexing a database.
+
+    Attributes:
+        name (str): Name of the database.
+        changes (dict): Table names under "added", "removed" and "changed" since the stored snapshot.
+        job_id (int): Job re-analyzing the database, queued when its structure changed.
+    """
+    name: str
+    changes: Dict[str, List[str]] = field(default_factory=dict)
+    job_id: Optional[int] = None
+
+def read_watermark(entry: DatabaseObject) -> Optional[str]:
+    """
+    Current catalog watermark of a registered database, read with a short statement timeout.
+    """
+    engine = create_db_engine(uri=entry.uri, statement_timeout=WATERMARK_TIMEOUT_SECONDS)
+    try:
+        return get_watermark(engine=engine, options=entry.options)
+    finally:
+        engine.dispose()
+
+def check_drift(entries: List[DatabaseObject]) -> List[Drift]:
+    """
+    Compare the stored watermark of each database with the current one, reading up to
+    `WATERMARK_CONCURRENCY` databases at the same time.
+
+    Entries without a stored watermark (registered before watermarks were recorded, or
+    imported from a bundle) take the current one as their baseline. Databases whose
+    watermark cannot be read are skipped with a warning.
+
+    Returns:
+        List[Drift]: Databases whose catalog changed, in entry order.
+    """
+    if not entries:
+        return []
+    current: Dict[str, Optional[str]] = {}
+    with timed("catalog.drift", rows=len(entries)) as span:
+        with ThreadPoolExecutor(max_workers=min(WATERMARK_CONCURRENCY, len(entries))) as executor:
+            futures = {executor.submit(read_watermark, entry): entry for entry in entries}
+            for future in as_completed(futures):
+                entry = futures[future]
+                try:
+                    current[entry.name] = future.result()
+                except Exception as e:
+                    logger.warning(f"Could not read the catalog watermark of {entry.name}: {e}")
+
+        app_store = StoreDb().app_store
+        drifts = []
+        for entry in entries:
+            watermark = current.get(entry.name)
+            if watermark is None:
+                continue
+            if not entry.watermark:
+                app_store.update(entry.name, {"watermark": watermark})
+            elif watermark != entry.watermark:
+                drifts.append(Drift(name=entry.name, stored=entry.watermark, current=watermark))
+        span["drifted"] = len(drifts)
+    return drifts
+
+def reindex(entry: DatabaseObject, profile: bool = False) -> Reindex:
+    """
+    Refresh a registered database's schema snapshot, join graph and watermark, and queue a job
+    re-analyzing its knowledge if the structure of any table changed.
+
+    Args:
+        entry (DatabaseObject): The registered database.
+        profile (bool): Also recompute column statistics when the database is re-analyzed.
+
+    Returns:
+        Reindex: Tables changed since the stored snapshot, and the queued job if any.
+
+    Raises:
+        ValueError: If the database needs re-analysis and a job for it is already queued or running.
+    """
+    engine = create_engine(url=entry.uri)
+    with timed("reindex", database=entry.name) as span:
+        # Read before the catalog, so changes made during introspection show up as drift later
+        watermark = get_watermark(engine=engine, options=entry.options) or ""
+        schema = get_schema_json(engine=engine, options=entry.options)
+        before = schema_fingerprints(entry.schema) if entry.schema else {}
+        result = Reindex(name=entry.name, changes=changed_tables(before, schema_fingerprints(schema)))
+        store = StoreDb()
+        store.app_store.update(entry.name, {
+            "schema": schema,
+            "join_graph": JoinGraph.from_schema(schema).to_json() if schema else "",
+            "watermark": watermark,
+        })
+        if any(result.changes.values()):
+            result.job_id = store.job_store.enqueue(name=entry.name, uri=entry.uri, profile=profile, options=entry.options)
+        span["rows"] = sum(len(tables) for tables in result.changes.values())
+    return result
@@ -0,0 +1,233 @@
+"""
+This module provides a token-bounded conversation memory for the data team and its members.
+
+The most recent runs are replayed verbatim, older runs are folded into a running
+summary, and bulky tool outputs (SQL results) are dropped from history while the
+SQL text of the tool calls is kept.
+"""
+
+import json
+from textwrap import dedent
+from typing import Dict, List, Optional
+
+from agno.memory.v2.memory import Memory
+from agno.models.base import Model
+from agno.models.message import Message
+from agno.utils.log import log_debug, logger
+
+from constants import (
+    HISTORY_TOKEN_BUDGET,
+    HISTORY_TOOL_OUTPUT_CHARS,
+    HISTORY_VERBATIM_RUNS,
+)
+from helper import count_tokens
+
+# Tools whose outputs are raw result sets; they are never replayed from history
+RESULT_TOOLS = {"run_sql_query", "run_local_query", "load_query_result"}
+
+def _message_tokens(message: Message) -> int:
+    """
+    Estimate tokens used by a message, including its tool call arguments.
+    """
+    tokens = count_tokens(message.get_content_string() if message.content is not None else "")
+    if message.tool_calls:
+        tokens += count_tokens(json.dumps(message.tool_calls, default=str))
+    return tokens
+
+def _tool_call_sql(message: Message) -> List[str]:
+    """
+    Extract SQL text from the tool calls of an assistant message.
+    """
+    queries = []
+    for tool_call in message.tool_calls or []:
+        arguments = tool_call.get("function", {}).get("arguments") or "{}"
+        try:
+            arguments = json.loads(arguments) if isinstance(arguments, str) else arguments
+        except ValueError:
+            continue
+        if isinstance(arguments, dict) and arguments.get("query"):
+            queries.append(str(arguments["query"]))
+    return queries
+
+class BoundedMemory(Memory):
+    """
+    Memory that keeps the history added to each prompt under a token budget.
+
+    Attributes:
+        summary_model (Model): Model used to compress older runs. Without it, an
+            extractive summary (questions, SQL and the start of each answer) is used.
+        token_budget (int): Maximum tokens of history added to a prompt.
+        verbatim_runs (int): Number of most recent runs replayed verbatim.
+        tool_output_chars (int): Characters kept from non-result tool outputs.
+    """
+
+    def __init__(
+        self,
+        summary_model: Optional[Model] = None,
+        token_budget: int = HISTORY_TOKEN_BUDGET,
+        verbatim_runs: int = HISTORY_VERBATIM_RUNS,
+        tool_output_chars: int = HISTORY_TOOL_OUTPUT_CHARS,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.summary_model = summary_model
+        self.token_budget = token_budget
+        self.verbatim_runs = verbatim_runs
+        self.tool_output_chars = tool_output_chars
+
+        # Running summary per session and the number of runs it already covers
+        self.running_summaries: Dict[str, str] = {}
+        self.summarized_runs: Dict[str, int] = {}
+
+        # Tokens of history added to the latest prompt, and per-turn token reports
+        self.history_tokens: Dict[str, int] = {}
+        self.turn_reports: Dict[str, List[Dict]] = {}
+
+    def add_run(self, session_id: str, run) -> None:
+        """
+        Store the run and record how many prompt tokens it used.
+        """
+        super().add_run(session_id=session_id, run=run)
+        metrics = run.metrics or {}
+        report = {
+            "run": len(self.runs.get(session_id, [])),
+            "prompt_tokens": sum(metrics.get("input_tokens", []) or []),
+            "completion_tokens": sum(metrics.get("output_tokens", []) or []),
+            "history_tokens": self.history_tokens.get(session_id, 0),
+        }
+        self.turn_reports.setdefault(session_id, []).append(report)
+        log_debug(f"Turn tokens: {report}")
+
+    def get_turn_reports(self, session_id: str) -> List[Dict]:
+        """
+        Return the per-turn token counts recorded for a session.
+        """
+        return self.turn_reports.get(session_id, [])
+
+    def get_messages_from_last_n_runs(
+        self,
+        session_id: str,
+        last_n: Optional[int] = None,
+        skip_role: Optional[str] = None,
+        skip_history_messages: bool = True,
+    ) -> List[Message]:
+        """
+        Return history for the next prompt, bounded by the token budget.
+        """
+        session_runs = (self.runs or {}).get(session_id, [])
+        if not session_runs:
+            return []
+
+        candidates = session_runs[-last_n:] if last_n is not None else session_runs
+        runs_messages = [self._run_messages(run, skip_role, skip_history_messages) for run in candidates]
+
+        # Keep the newest runs verbatim, dropping down to one run if they alone exceed the budget
+        keep = min(self.verbatim_runs, len(runs_messages))
+        while keep > 1 and sum(_message_tokens(m) for msgs in runs_messages[-keep:] for m in msgs) > self.token_budget:
+            keep -= 1
+        verbatim = [m for msgs in runs_messages[len(runs_messages) - keep:] for m in msgs]
+        verbatim_tokens = sum(_message_tokens(m) for m in verbatim)
+
+        history: List[Message] = []
+        older_runs = session_runs[: len(session_runs) - keep]
+        if older_runs:
+            summary = self._update_summary(session_id, older_runs, max(self.token_budget - verbatim_tokens, 200))
+            if summary:
+                history.append(Message(role="user", content=f"<conversation_summary>\n{summary}\n</conversation_summary>"))
+                history.append(Message(role="assistant", content="Noted, I will use this summary of our earlier conversation."))
+        history.extend(verbatim)
+
+        self.history_tokens[session_id] = sum(_message_tokens(m) for m in history)
+        log_debug(f"History: {len(older_runs)} runs summarized, {keep} verbatim, {self.history_tokens[session_id]} tokens")
+        return history
+
+    def _run_messages(self, run, skip_role: Optional[str], skip_history_messages: bool) -> List[Message]:
+        """
+        Collect the messages of one run with tool outputs compacted.
+        """
+        messages = []
+        for message in run.messages or []:
+            if message.role == "system" or (skip_role and message.role == skip_role):
+                continue
+            if skip_history_messages and message.from_history:
+                continue
+            if message.role == "tool":
+                message = self._compact_tool_output(message)
+            messages.append(message)
+        return messages
+
+    def _compact_tool_output(self, message: Message) -> Message:
+        """
+        Replace result sets with a stub and truncate other long tool outputs.
+        """
+        content = message.get_content_string() if message.content is not None else ""
+        if message.tool_name in RESULT_TOOLS:
+            content = f"[{len(content)} characters of query results omitted from history; the SQL is in the tool call above]"
+        elif len(content) > self.tool_output_chars:
+            content = content[: self.tool_output_chars] + f"... [{len(content) - self.tool_output_chars} characters omitted]"
+        else:
+            return message
+        return message.model_copy(update={"content": content})
+
+    def _update_summary(self, session_id: str, older_runs: List, max_tokens: int) -> str:
+        """
+        Fold runs that left the verbatim window into the running summary for the session.
+        """
+        covered = self.summarized_runs.get(session_id, 0)
+        summary = self.running_summaries.get(session_id, "")
+        if covered >= len(older_runs):
+            return summary
+
+        transcript = "\n\n".join(self._run_digest(run) for run in older_runs[covered:])
+        if self.summary_model is not None:
+            try:
+                summary = self._summarize(summary, transcript, max_tokens)
+            except Exception as e:
+                logger.warning(f"History summarization failed, using extractive summary: {e}")
+                summary = f"{summary}\n\n{transcript}".strip()
+        else:
+            summary = f"{summary}\n\n{transcript}".strip()
+
+        # Extractive summaries are trimmed from the front so the newest context survives
+        while count_tokens(summary) > max_tokens and "\n\n" in summary:
+            summary = summary.split("\n\n", 1)[1]
+
+        self.running_summaries[session_id] = summary
+        self.summarized_runs[session_id] = len(older_runs)
+        return summary
+
+    def _summarize(self, summary: str, transcript: str, max_tokens: int) -> str:
+        """
+        Ask the summary model to merge new turns into the existing summary.
+        """
+        response = self.summary_model.response(messages=[
+            Message(role="system", content=dedent(f"""\
+                You maintain a running summary of a conversation between a user and a data team.
+                Merge the new turns into the existing summary. Keep user goals, table and column names,
+                filters, SQL queries that were run, and key numbers from the answers. Drop raw result rows.
+                Stay under {int(max_tokens * 0.75)} words and return only the summary.
+            """)),
+            Message(role="user", content=f"<summary>\n{summary}\n</summary>\n\n<new_turns>\n{transcript}\n</new_turns>"),
+        ])
+        return (response.content or summary).strip()
+
+    def _run_digest(self, run) -> str:
+        """
+        Reduce a run to its question, the SQL it ran and the start of its answer.
+        """
+        question = ""
+        queries: List[str] = []
+        for message in run.messages or []:
+            if message.from_history:
+                continue
+            if message.role == "user" and not question:
+                question = message.get_content_string()
+            if message.tool_calls:
+                queries.extend(_tool_call_sql(message))
+        answer = run.content if isinstance(run.content, str) else str(run.content or "")
+
+        digest = f"Q: {question[:500]}"
+        for query in queries:
+            digest += f"\nSQL: {query}"
+        digest += f"\nA: {answer[:500]}"
+        return digest
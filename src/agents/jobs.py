@@ -0,0 +1,178 @@
+"""
+This module runs indexing jobs from the persistent job queue (`store.jobs`).
+
+Registering a database is split into stages whose outputs are checkpointed with
+the job, so a network error during an LLM call only costs the stage it happened in:
+
+- introspect: read the catalog watermark, then the catalog into the schema JSON
+- analyze-member: structure explanation with example queries, for the member agent
+- analyze-team: structure usage explanation, for the team leader
+- semantic: table use cases plus keys and indexes (the semantic model)
+- embed: load the explanations (and column statistics with `--profile`) into the vector stores
+- register: store the database, its schema, join graph and watermark in `DatabaseStore`;
+  a database that is already registered (a re-index) is updated in place
+
+Jobs are run by `data-ai worker`, started in the background by `add --background`,
+or inline by `add`.
+"""
+
+import os
+import subprocess
+import sys
+import time
+from typing import Any, Callable, Dict, Optional
+
+from agno.utils.log import logger
+from sqlalchemy import create_engine
+
+from agents.knowledge import (
+    analyze_member_knowledge,
+    analyze_team_knowledge,
+    get_schema_json,
+    get_table_semantic,
+    get_watermark,
+    process_column_stats,
+    store_member_knowledge,
+    store_team_knowledge,
+)
+from constants import JOB_MAX_ATTEMPTS, JOB_POLL_SECONDS, JOB_RETRY_DELAY_SECONDS, WORKER_LOG_FILE
+from helper import agent_name as map_agent_name
+from instrument import timed
+from store import StoreDb
+from store.jobs import Job, JobStore
+from tools.joins import JoinGraph
+
+# Pipeline stages of an indexing job, in order
+JOB_STAGES = ("introspect", "analyze-member", "analyze-team", "semantic", "embed", "register")
+
+def _introspect(job: Job, outputs: Dict[str, Any]) -> str:
+    engine = create_engine(url=job.uri)
+    # Read before the catalog, so changes made during introspection show up as drift later
+    outputs["watermark"] = get_watermark(engine=engine, options=job.options) or ""
+    return get_schema_json(engine=engine, options=job.options)
+
+def _analyze_member(job: Job, outputs: Dict[str, Any]) -> str:
+    return analyze_member_knowledge(outputs["introspect"])
+
+def _analyze_team(job: Job, outputs: Dict[str, Any]) -> str:
+    return analyze_team_knowledge(outputs["introspect"])
+
+def _semantic(job: Job, outputs: Dict[str, Any]) -> str:
+    return get_table_semantic(uri=job.uri, schema=outputs["introspect"])
+
+def _embed(job: Job, outputs: Dict[str, Any]) -> int:
+    agent_name = map_agent_name(job.name)
+    store_member_knowledge(agent_name=agent_name, content=outputs["analyze-member"])
+    store_team_knowledge(agent_name=agent_name, content=outputs["analyze-team"])
+    if job.profile:
+        return process_column_stats(agent_name=agent_name, engine=create_engine(url=job.uri), options=job.options)
+    return 0
+
+def _register(job: Job, outputs: Dict[str, Any]) -> str:
+    schema = outputs["introspect"]
+    app_store = StoreDb().app_store
+    fields = {
+        "meta_data": outputs["semantic"],
+        "options": job.options,
+        "schema": schema,
+        "join_graph": JoinGraph.from_schema(schema).to_json() if schema else "",
+        # Jobs checkpointed before watermarks were recorded have none; the first drift check sets it
+        "watermark": outputs.get("watermark", ""),
+    }
+    if any(entry.name == job.name for entry in app_store.get_all()):
+        app_store.update(job.name, fields)
+    else:
+        app_store.create({"name": job.name, "uri": job.uri, "driver": create_engine(url=job.uri).driver, **fields})
+    return ""
+
+_STAGE_RUNNERS: Dict[str, Callable[[Job, Dict[str, Any]], Any]] = {
+    "introspect": _introspect,
+    "analyze-member": _analyze_member,
+    "analyze-team": _analyze_team,
+    "semantic": _semantic,
+    "embed": _embed,
+    "register": _register,
+}
+
+def run_job(job: Job, jobs: JobStore, on_stage: Optional[Callable[[str], None]] = None) -> None:
+    """
+    Run a claimed job from the stage after its last completed one, checkpointing every stage.
+
+    Raises:
+        Exception: The error of the stage that failed; the job's checkpoints are kept.
+    """
+    outputs = dict(job.outputs)
+    start = JOB_STAGES.index(job.stage) + 1 if job.stage in JOB_STAGES else 0
+    for stage in JOB_STAGES[start:]:
+        if on_stage is not None:
+            on_stage(stage)
+        jobs.start_stage(job.id, stage)
+        with timed(f"job.{stage}", job=job.id, database=job.name, attempt=job.attempts):
+            outputs[stage] = _STAGE_RUNNERS[stage](job, outputs)
+        jobs.checkpoint(job.id, stage, outputs)
+
+def process_job(job: Job, jobs: JobStore, on_stage: Optional[Callable[[str], None]] = None, retry: bool = True) -> bool:
+    """
+    Run a claimed job and record how it ended. With `retry`, a failed job is queued
+    again until it has been attempted `JOB_MAX_ATTEMPTS` times; otherwise it is left failed.
+
+    Returns:
+        bool: Whether the job completed.
+    """
+    try:
+        run_job(job, jobs, on_stage=on_stage)
+    except Exception as e:
+        current = jobs.get(job.id).current
+        logger.warning(f"Job {job.id} ({job.name}) failed in stage {current}: {e}")
+        jobs.finish(job.id, error=f"{current}: {e}", retry=retry and job.attempts < JOB_MAX_ATTEMPTS)
+        return False
+    jobs.finish(job.id)
+    return True
+
+def work(exit_when_idle: bool = True, on_job: Optional[Callable[[Job, bool], None]] = None) -> int:
+    """
+    Process queued jobs one at a time until the queue is empty (or forever).
+
+    Returns:
+        int: Number of jobs processed.
+    """
+    jobs = StoreDb().job_store
+    processed = 0
+    while True:
+        job = jobs.claim()
+        if job is None:
+            if exit_when_idle:
+                return processed
+            time.sleep(JOB_POLL_SECONDS)
+            continue
+        completed = process_job(job, jobs)
+        processed += 1
+        if on_job is not None:
+            on_job(job, completed)
+        if not completed:
+            # Give a transient failure (network, rate limit) time to clear before the job is resumed
+            time.sleep(JOB_RETRY_DELAY_SECONDS * job.attempts)
+
+def spawn_worker() -> int:
+    """
+    Start a detached `data-ai worker` process that exits once the queue is empty; returns its PID.
+    Its output goes to the worker log.
+    """
+    return spawn_command("worker")
+
+def spawn_command(*arguments: str) -> int:
+    """
+    Start a detached `data-ai` command, e.g. `spawn_command("reindex", name)`; returns its PID.
+    Its output goes to the worker log.
+    """
+    main = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py")
+    os.makedirs(os.path.dirname(WORKER_LOG_FILE), exist_ok=True)
+    with open(WORKER_LOG_FILE, "a") as log:
+        process = subprocess.Popen(
+            [sys.executable, main, *arguments],
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+            start_new_session=True,
+        )
+    return process.pid
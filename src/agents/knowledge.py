@@ -1,10 +1,12 @@
 import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Optional, Tuple
 from sqlalchemy import Engine
-from uuid import uuid4
 from db.pg import PostgreSQLDatabase
 from db.mysql import MySQLDatabase
 from db.clickhouse import ClickHouseDatabase
 from db import Database
+from db.compact import render_schema
 from store import StoreDb
 from agno.knowledge.json import JSONKnowledgeBase
 from agno.document.base import Document
@@ -15,76 +17,195 @@ from agents import (
 )
 from textwrap import dedent
 from helper import agent_name as map_agent_name
+from instrument import timed, run_tokens
 from sqlalchemy import create_engine
+from config import Config
+from constants import PROFILE_SAMPLE_ROWS, PROFILE_TIME_BUDGET_SECONDS
 
-# Determine which database implementation to use based on the SQLAlchemy engine driver
-def db_knowledge(engine: Engine) -> Database:
+# Determine which database implementation to use based on the SQLAlchemy engine driver.
+# `options` are the per-database options stored with the entry (e.g. PostgreSQL schema patterns)
+def db_knowledge(engine: Engine, options: dict = None) -> Database:
+    options = options or {}
     if engine.driver == "psycopg2":
-        return PostgreSQLDatabase(engine=engine)
+        return PostgreSQLDatabase(
+            engine=engine,
+            include_schemas=options.get("include_schemas"),
+            exclude_schemas=options.get("exclude_schemas"),
+        )
     if engine.driver == "pymysql":
         return MySQLDatabase(engine=engine)
     if engine.driver == "native":
         return ClickHouseDatabase(engine=engine)
     raise ValueError(f"Unsupported database driver: {engine.driver}")
 
-# Delete vectorized knowledge associated with an agent
+# Delete vectorized knowledge associated with an agent: its member knowledge and its team document
 def drop_member_knowledge(agent_name: str):
     vector = StoreDb().knowleged_base_db(collection=agent_name)
     knowledge_base = JSONKnowledgeBase(vector_db=vector)
     knowledge_base.delete()
+    team_vector = StoreDb().data_team_knowledge.vector_db
+    if team_vector.exists():
+        team_vector.delete_documents([f"{agent_name}:team"])
+
+# Introspect the database catalog and serialize it for the analyzers
+def get_schema_json(engine: Engine, options: dict = None) -> str:
+    with timed("catalog.introspect", dialect=engine.dialect.name) as span:
+        schema = json.dumps(db_knowledge(engine=engine, options=options).to_json())
+        span["bytes"] = len(schema)
+    return schema
+
+# Read the catalog watermark, which changes whenever the schema does; None if the driver has none
+def get_watermark(engine: Engine, options: dict = None) -> Optional[str]:
+    with timed("catalog.watermark", dialect=engine.dialect.name):
+        return db_knowledge(engine=engine, options=options).watermark()
+
+# Serialization of the schema for an analyzer stage: the configured default unless overridden for the stage
+def analyzer_schema_format(stage: str) -> str:
+    app_config = Config().app_config
+    return app_config.analyzer_schema_formats.get(stage, app_config.schema_format)
+
+# Run an analyzer agent on the schema and record its latency and token usage
+def run_analyzer(stage: str, agent, schema: str):
+    schema_format = analyzer_schema_format(stage)
+    message = render_schema(schema, schema_format)
+    with timed(stage, model=agent.model.id, bytes=len(message), format=schema_format) as span:
+        response = agent.run(message=message)
+        span.update(run_tokens(response))
+    return response
+
+# Render partitioning, primary keys, foreign keys, indexes and row estimates from the catalog snapshot
+# so agents join on declared relationships and filter on indexed columns
+def describe_keys(schema: str) -> str:
+    lines = []
+    for table in json.loads(schema).get("tables", []):
+        parts = []
+        if table.get("partition_key"):
+            parts.append(f"partitioned by {table['partition_key']} ({table.get('partitions', 0)} partitions)")
+        if table.get("primary_key"):
+            parts.append(f"primary key ({', '.join(table['primary_key'])})")
+        for fk in table.get("foreign_keys", []):
+            parts.append(f"({', '.join(fk['columns'])}) references {fk['ref_table']} ({', '.join(fk['ref_columns'])})")
+        indexes = [
+            f"{index['name']} ({', '.join(index['columns'])}){' unique' if index.get('unique') else ''}"
+            for index in table.get("indexes", [])
+        ]
+        if indexes:
+            parts.append(f"indexes: {', '.join(indexes)}")
+        if parts:
+            rows = f" (~{table['rows']:,.0f} rows)" if table.get("rows") is not None else ""
+            lines.append(f"- {table['name']}{rows}: " + "; ".join(parts))
+    if not lines:
+        return ""
+    return "<keys_and_indexes>\n" + "\n".join(lines) + "\n</keys_and_indexes>"
 
-# Generate semantic descriptions and use cases for all tables in the database
-def get_table_semantic(uri: str):
+# Generate semantic descriptions and use cases for all tables in the database,
+# followed by the keys and indexes read from the catalog
+def get_table_semantic(uri: str, schema: str = None):
     try:
-        engine = create_engine(url=uri)
-        db = db_knowledge(engine=engine)
-        response = get_table_use_case_extractor().run(json.dumps(db.to_json()))
-        return response.content
+        schema = schema or get_schema_json(engine=create_engine(url=uri))
+        response = run_analyzer("analyze.semantic", get_table_use_case_extractor(), schema)
+        keys = describe_keys(schema)
+        return f"{response.content}\n\n{keys}" if keys else response.content
     except Exception as e:
         raise ValueError(f"Failed to process database: {uri}: {e}")
 
-# Extract structure-level knowledge and store it in the vector database for one agent
-def process_member_knowledge(agent_name: str, knowledge: str):
+# Extract structure-level knowledge for one agent
+def analyze_member_knowledge(knowledge: str) -> str:
     explainer = get_structure_explainer_with_example()
-    response = explainer.run(message=knowledge)
+    return run_analyzer("analyze.member", explainer, knowledge).content
+
+# Store structure-level knowledge in the agent's vector database; the fixed document ID makes reloading replace it
+def store_member_knowledge(agent_name: str, content: str):
     document = Document(
         name=agent_name,
-        id=str(uuid4()),
+        id=f"{agent_name}:member",
         meta_data={"page": 0},
-        content=response.content,
+        content=content,
     )
-    
+
     vector = StoreDb().knowleged_base_db(collection=agent_name)
     knowledge_base = JSONKnowledgeBase(vector_db=vector)
     knowledge_base.load_documents(documents=[document], upsert=True)
 
-# Extract team-level understanding of database use case and store in team vector space
-def process_team_knowledge(agent_name: str, knowledge: str) -> Document: 
+# Extract structure-level knowledge and store it in the vector database for one agent
+def process_member_knowledge(agent_name: str, knowledge: str):
+    store_member_knowledge(agent_name=agent_name, content=analyze_member_knowledge(knowledge))
+
+# Extract team-level understanding of the database use case
+def analyze_team_knowledge(knowledge: str) -> str:
     explainer = get_structure_usage_explainer()
-    response = explainer.run(message=knowledge)
+    return run_analyzer("analyze.team", explainer, knowledge).content
 
+# Store team-level understanding in the team vector space; the fixed document ID makes reloading replace it
+def store_team_knowledge(agent_name: str, content: str):
     document = Document(
         name=agent_name,
-        id=str(uuid4()),
-        meta_data={"page": 0},
-        content=response.content,
+        id=f"{agent_name}:team",
+        meta_data={"page": 0, "agent": agent_name},
+        content=content,
     )
 
     StoreDb().data_team_knowledge.load_documents(documents=[document], upsert=True)
 
-# End-to-end processing: load DB schema, generate knowledge, and store both member & team representations
-def process_database(name: str, uri: str):
+# Extract team-level understanding of database use case and store in team vector space
+def process_team_knowledge(agent_name: str, knowledge: str):
+    store_team_knowledge(agent_name=agent_name, content=analyze_team_knowledge(knowledge))
+
+# Read column statistics (catalog first, sampled reads within a time budget otherwise)
+# and store one compact document per table in the agent's knowledge base
+def process_column_stats(agent_name: str, engine: Engine, time_budget: float = PROFILE_TIME_BUDGET_SECONDS, options: dict = None) -> int:
+    with timed("catalog.profile", dialect=engine.dialect.name) as span:
+        stats = db_knowledge(engine=engine, options=options).profile(time_budget=time_budget, sample_rows=PROFILE_SAMPLE_ROWS)
+        span["rows"] = len(stats)
+    documents = [
+        Document(
+            name=f"{agent_name}:{table.name}:stats",
+            id=f"{agent_name}:{table.name}:stats",
+            meta_data={"table": table.name, "kind": "column_stats"},
+            content=table.describe(),
+        )
+        for table in stats
+    ]
+    if documents:
+        vector = StoreDb().knowleged_base_db(collection=agent_name)
+        knowledge_base = JSONKnowledgeBase(vector_db=vector)
+        knowledge_base.load_documents(documents=documents, upsert=True)
+    return len(documents)
+
+# End-to-end processing: load DB schema, generate member & team knowledge and the semantic model.
+# The analyzer stages only depend on the schema, so up to `concurrency` of them run at once;
+# `on_stage` is called with the name of each stage as it starts or finishes.
+# Returns the serialized schema and the semantic model
+def analyze_database(
+    name: str,
+    uri: str,
+    profile: bool = False,
+    options: dict = None,
+    concurrency: int = 1,
+    on_stage: Callable[[str], None] = None,
+) -> Tuple[str, str]:
     agent_name = map_agent_name(name)
+    report = on_stage or (lambda stage: None)
+    # Open the stores on the calling thread: SQLite connections are bound to the thread that opened them
+    StoreDb()
     try:
         engine = create_engine(url=uri)
-        db = db_knowledge(engine=engine)
-        process_member_knowledge(
-            agent_name=agent_name, 
-            knowledge=json.dumps(db.to_json()),
-        )
-        process_team_knowledge(
-            agent_name=agent_name, 
-            knowledge=json.dumps(db.to_json()),
-        )
+        report("introspect")
+        schema = get_schema_json(engine=engine, options=options)
+        stages = {
+            "member knowledge": lambda: process_member_knowledge(agent_name=agent_name, knowledge=schema),
+            "team knowledge": lambda: process_team_knowledge(agent_name=agent_name, knowledge=schema),
+            "semantic model": lambda: get_table_semantic(uri=uri, schema=schema),
+        }
+        if profile:
+            stages["column stats"] = lambda: process_column_stats(agent_name=agent_name, engine=engine, options=options)
+        report(f"analyze 0/{len(stages)}")
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+            futures = {executor.submit(run): stage for stage, run in stages.items()}
+            results = {}
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+                report(f"analyze {len(results)}/{len(stages)}")
+        return schema, results["semantic model"]
     except Exception as e:
         raise ValueError(f"Failed to process database: {name}: {e}")
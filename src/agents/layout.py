@@ -0,0 +1,93 @@
+"""
+This module lays out member prompts so providers can reuse their prompt cache.
+
+OpenAI and Anthropic cache the longest prompt prefix shared with recent requests.
+agno writes the current time into the system message, ahead of the semantic model,
+so the large static part of a member's prompt changed on every call. In the stable
+layout the system message only holds content fixed for the agent (description,
+instructions, tool instructions, semantic model), the conversation history follows
+unchanged, and volatile content such as the current time is appended to the end of
+the new user message.
+
+Anthropic only caches up to explicit breakpoints, so `CachedClaude` marks one at the
+end of the system prompt, which also covers the tool definitions before it.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from agno.agent import Agent
+from agno.models.anthropic import Claude
+from agno.models.message import Message
+from agno.models.response import ModelResponse
+from agno.utils.log import log_warning
+
+def volatile_context(timezone_identifier: Optional[str] = None) -> str:
+    """
+    Content that changes between calls, appended after everything cacheable.
+    """
+    tz = None
+    if timezone_identifier:
+        try:
+            from zoneinfo import ZoneInfo
+            tz = ZoneInfo(timezone_identifier)
+        except Exception:
+            log_warning("Invalid timezone identifier")
+    return f"<volatile_context>\nThe current time is {datetime.now(tz)}.\n</volatile_context>"
+
+class StablePrefixAgent(Agent):
+    """
+    Agent whose system message stays byte-identical across runs.
+
+    Create it with `add_datetime_to_instructions=False`; the current time is
+    appended to each new user message instead.
+    """
+
+    def get_user_message(self, *, message: Any, **kwargs: Any) -> Optional[Message]:
+        user_message = super().get_user_message(message=message, **kwargs)
+        if user_message is not None and isinstance(user_message.content, str):
+            user_message.content += f"\n\n{volatile_context(self.timezone_identifier)}"
+        return user_message
+
+class CachedClaude(Claude):
+    """
+    Claude with a prompt-cache breakpoint after the system prompt.
+
+    Cache reads are reported as `cached_tokens`, and counted in the input tokens
+    as with OpenAI, where cached tokens are part of the prompt tokens.
+    """
+
+    def _prepare_request_kwargs(self, system_message: str) -> Dict[str, Any]:
+        request_kwargs = super()._prepare_request_kwargs(system_message)
+        if system_message:
+            request_kwargs["system"] = [
+                {"type": "text", "text": system_message, "cache_control": {"type": "ephemeral"}}
+            ]
+        return request_kwargs
+
+    def parse_provider_response(self, response: Any) -> ModelResponse:
+        model_response = super().parse_provider_response(response)
+        model_response.response_usage = _usage(model_response.response_usage)
+        return model_response
+
+    def parse_provider_response_delta(self, response: Any) -> ModelResponse:
+        model_response = super().parse_provider_response_delta(response)
+        model_response.response_usage = _usage(model_response.response_usage)
+        return model_response
+
+def _usage(usage: Any) -> Any:
+    """
+    Anthropic usage as agno token metrics, with cache reads and writes included in the input tokens.
+    """
+    if usage is None or isinstance(usage, dict):
+        return usage
+    cache_read = getattr(usage, "cache_read_input_tokens", None) or 0
+    cache_write = getattr(usage, "cache_creation_input_tokens", None) or 0
+    input_tokens = (getattr(usage, "input_tokens", None) or 0) + cache_read + cache_write
+    output_tokens = getattr(usage, "output_tokens", None) or 0
+    return {
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "total_tokens": input_tokens + output_tokens,
+        "cached_tokens": cache_read,
+    }
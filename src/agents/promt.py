@@ -25,11 +25,14 @@ def get_sql_instruction(datadabse_model: str):
         1. First identify the tables you need to query from the semantic model.
         2. Then, ALWAYS use the `search_knowledge_base` tool to get table metadata, rules and sample queries.
             - Note: You must use the `search_knowledge_base` tool to get table information and rules before writing a query.
+            - The knowledge base may also hold column statistics (row counts, distinct counts, value ranges and common values). Use them instead of running exploratory `SELECT DISTINCT` or `COUNT` queries.
         3. If table rules are provided, ALWAYS follow them.
         4. Then, "think" about query construction, don't rush this step. If sample queries are available, use them as a reference.
         5. If you need more information about the table, use the `describe_table` tool.
-        6. Then, using all the information available, create one single syntactically correct PostgreSQL query to accomplish your task.
+        6. Then, using all the information available, create one single syntactically correct query in the SQL dialect of {datadabse_model} to accomplish your task.
         7. If you need to join tables, check the `semantic_model` for the relationships between the tables.
+            - If the `find_join_path` tool is available, call it once with all the tables you need; it returns the JOIN clauses, including any intermediate tables.
+            - The `keys_and_indexes` section of the `semantic_model` lists primary keys, foreign keys and indexes read from the database. Join on declared foreign keys first.
             - If the `semantic_model` contains a relationship between tables, use that relationship to join the tables even if the column names are different.
             - If you cannot find a relationship in the `semantic_model`, only join on the columns that have the same name and data type.
             - If you cannot find a valid relationship, ask the user to provide the column name to join.
@@ -38,6 +41,9 @@ def get_sql_instruction(datadabse_model: str):
         10. When running a query:
             - Do not add a `;` at the end of the query.
             - Always provide a limit unless the user explicitly asks for all results.
+            - Queries are checked against the schema before they run. If a query is rejected, fix the syntax, table or column named in the error using the listed alternatives. Only read-only queries are allowed.
+            - On large tables, filter and join on indexed columns (leading index columns) where the question allows it. An `Index lint` note means the query could not use an index.
+            - Queries are estimated before they run. If a query is rejected by the preflight guard, use the returned plan to reformulate it with more selective filters instead of retrying it unchanged.
         11. After you run the query, "analyze" the results and return the answer in markdown format.
         12. You Analysis should Reason about the results of the query, whether they make sense, whether they are complete, whether they are correct, could there be any data quality issues, etc.
         13. It is really important that you "analyze" and "validate" the results of the query.
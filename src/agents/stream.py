@@ -0,0 +1,138 @@
+"""
+This module renders a streaming team run in the terminal.
+
+Leader tokens are printed as they arrive, tool calls are shown as events, and
+member output is attributed to the member that produced it. Member output is
+captured through tool hooks wrapped around the team's delegation tools, since
+agno consumes member streams internally in coordinate mode.
+"""
+
+import json
+import time
+from inspect import isgenerator
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from agno.agent import Agent
+from agno.run.response import RunEvent
+from agno.team.team import Team
+from rich.console import Console
+from rich.text import Text
+
+# Team tools that hand a task to a member; their output is the member's answer
+DELEGATION_TOOLS = {"transfer_task_to_member", "forward_task_to_member"}
+
+def _short_args(arguments: Optional[Dict[str, Any]], width: int = 120) -> str:
+    """
+    Render tool arguments on one line, truncated for display.
+    """
+    text = json.dumps(arguments or {}, default=str)
+    return text if len(text) <= width else text[: width - 3] + "..."
+
+class StreamPrinter:
+    """
+    Streams a team's answer to the console.
+
+    Attributes:
+        team (Team): The team to run.
+        show_member_response (bool): Print member tokens, attributed to each member.
+        console (Console): Console used for output.
+    """
+
+    def __init__(self, team: Team, show_member_response: bool = False, console: Optional[Console] = None):
+        self.team = team
+        self.show_member_response = show_member_response
+        self.console = console or Console()
+        # Who produced the last printed tokens, so a header is printed when the speaker changes
+        self._speaker: Optional[str] = None
+        self._first_token_at: Optional[float] = None
+
+        # Hooks are attached once; agno copies them onto each function when tools are registered
+        self.team.tool_hooks = (self.team.tool_hooks or []) + [self._team_tool_hook]
+        for member in self.team.members:
+            if isinstance(member, Agent):
+                member.tool_hooks = (member.tool_hooks or []) + [self._member_tool_hook(member.name)]
+
+    def print_response(self, message: str) -> None:
+        """
+        Run the team on a message and print the response as it streams.
+        """
+        self._speaker = None
+        self._first_token_at = None
+        started = time.perf_counter()
+
+        for response in self.team.run(message=message, stream=True, stream_intermediate_steps=True):
+            if response.event == RunEvent.tool_call_started.value:
+                for tool in response.tools or []:
+                    if tool.get("tool_name") not in DELEGATION_TOOLS:
+                        self._event(f"→ {tool.get('tool_name')}({_short_args(tool.get('tool_args'))})")
+            elif response.event == RunEvent.run_response.value and isinstance(response.content, str):
+                if self._speaker is None or self._speaker.startswith("tool:"):
+                    self._switch_speaker(self.team.name or "Team")
+                self._write(response.content)
+
+        elapsed = time.perf_counter() - started
+        first = f", first token after {self._first_token_at - started:.1f}s" if self._first_token_at else ""
+        self.console.print(f"\n[dim]Answered in {elapsed:.1f}s{first}[/dim]")
+
+    def _team_tool_hook(self, function_name: str, function_call: Callable, arguments: Dict[str, Any]):
+        """
+        Tool hook that attributes delegated member output to the member.
+        """
+        result = function_call(**arguments)
+        if function_name not in DELEGATION_TOOLS:
+            return result
+
+        member_id = arguments.get("member_id", "member")
+        if function_name == "forward_task_to_member":
+            # Forwarded output reaches the team stream as content; only label it
+            self._switch_speaker(member_id)
+            return result
+        if isgenerator(result):
+            return self._member_chunks(member_id, result)
+        return result
+
+    def _member_chunks(self, member_id: str, chunks: Iterator[str]) -> Iterator[str]:
+        """
+        Pass member output through to agno while echoing it to the console.
+        """
+        started = time.perf_counter()
+        if self.show_member_response:
+            self._switch_speaker(member_id)
+        for chunk in chunks:
+            if self.show_member_response:
+                self._write(str(chunk))
+            yield chunk
+        self._event(f"{member_id} finished in {time.perf_counter() - started:.1f}s")
+        self._speaker = "tool:" + member_id
+
+    def _member_tool_hook(self, member_name: str) -> Callable:
+        """
+        Build a tool hook that reports a member's tool calls as events.
+        """
+        def hook(function_name: str, function_call: Callable, arguments: Dict[str, Any]):
+            self._event(f"{member_name} → {function_name}({_short_args(arguments)})")
+            started = time.perf_counter()
+            result = function_call(**arguments)
+            if not isgenerator(result):
+                self._event(f"{member_name} ✓ {function_name} in {time.perf_counter() - started:.2f}s")
+            return result
+        return hook
+
+    def _switch_speaker(self, speaker: str) -> None:
+        """Print a header when output starts coming from a different speaker."""
+        if self._speaker != speaker:
+            self.console.print(Text(f"\n{speaker}", style="bold cyan"))
+            self._speaker = speaker
+
+    def _write(self, text: str) -> None:
+        """Print streamed tokens without a trailing newline."""
+        if self._first_token_at is None and text.strip():
+            self._first_token_at = time.perf_counter()
+        self.console.print(text, end="", markup=False, highlight=False, soft_wrap=True)
+
+    def _event(self, text: str) -> None:
+        """Print a dimmed event line such as a tool call."""
+        self.console.print(Text(f"\n{text}", style="dim"))
+        # Tokens printed after an event belong to a new block
+        if self._speaker and not self._speaker.startswith("tool:"):
+            self._speaker = "tool:" + self._speaker
@@ -1,7 +1,13 @@
 import typer
 from typing import List
 from agents.base import get_sql_agent
+from agents.drift import check_drift as detect_drift
+from agents.jobs import spawn_command
+from agents.history import BoundedMemory
+from cascade import low_confidence
 from store import StoreDb
+from tools import DatabaseSQLTools, FederationTools, MemberDispatchTools
+from instrument import tool_hook
 
 from agno.agent import Agent
 from agno.knowledge.json import JSONKnowledgeBase
@@ -15,25 +21,33 @@ from helper import (
 from config import Config
 from constants import (
     TEAM_LEADER_MODEL_NAME,
-    MEMBER_MODEL_NAME,
+    STATEMENT_TIMEOUT_SECONDS,
 )
+from db.engine import create_db_engine
 
 debug_mode = Config().app_config.is_debug()
 
-def get_agents() -> List[Agent]:
+def get_agents(check_drift: bool = True) -> List[Agent]:
     """
     Creates a list of SQL agents by loading vector knowledge bases and database metadata.
 
     Each agent represents one database and is capable of understanding and querying it
     based on its vectorized schema and content.
+
+    With `check_drift`, databases whose catalog changed since they were indexed are flagged
+    (see `DATA_AI_DRIFT_CHECK`).
     """
     list_agents: List[Agent] = []
     databases = StoreDb().app_store.get_all()
+    if check_drift:
+        report_drift(databases)
     for el in databases:
-        from sqlalchemy import create_engine
         try:
-            # Create SQLAlchemy engine for the URI
-            engine = create_engine(url=el.uri)
+            # Create SQLAlchemy engine for the URI, with the database's server-side statement timeout
+            engine = create_db_engine(
+                uri=el.uri,
+                statement_timeout=el.options.get("statement_timeout", STATEMENT_TIMEOUT_SECONDS),
+            )
             agent_name = map_agent_name(el.name)
 
             # Load vector knowledge base for this agent
@@ -47,6 +61,8 @@ def get_agents() -> List[Agent]:
                 db_engine=engine, 
                 knowledge_base=knowledge_base,
                 semantic_model=el.meta_data,
+                schema=el.schema,
+                join_graph=el.join_graph,
             )
             list_agents.append(agent)
         except Exception as e:
@@ -54,13 +70,29 @@ def get_agents() -> List[Agent]:
             exit(0)
     return list_agents
 
-def get_data_team(work_style: str = "route", show_member_response: bool = False):
+def report_drift(databases) -> None:
+    """
+    Warn about databases whose catalog changed since they were indexed, as their knowledge may
+    name dropped columns, and start re-indexing them in the background if configured.
+    """
+    drift_check = Config().app_config.drift_check
+    if drift_check == "off":
+        return
+    drifted = [drift.name for drift in detect_drift(databases)]
+    for name in drifted:
+        typer.echo(f"WARNING: The schema of {name} changed since it was indexed; refresh it with `data-ai reindex {name}`")
+    if drifted and drift_check == "reindex":
+        pid = spawn_command("reindex", "--background", *drifted)
+        typer.echo(f"Re-indexing {', '.join(drifted)} in the background (process {pid}); restart to use the refreshed knowledge.")
+
+def get_data_team(work_style: str = "route", show_member_response: bool = False, check_drift: bool = True):
     """
     Constructs a data analysis team composed of SQL agents + analytic helpers.
 
     Args:
         work_style: Determines team decision strategy ("route" or "collaborate")
         show_member_response: Whether to display each agent's individual response
+        check_drift: Whether to flag databases whose schema changed since they were indexed
 
     Returns:
         A Team object capable of answering user data-related questions in multiple stages:
@@ -68,13 +100,22 @@ def get_data_team(work_style: str = "route", show_member_response: bool = False)
         - Insight summarization
         - Natural language explanation
     """
-    agents = get_agents()
+    agents = get_agents(check_drift=check_drift)
+
+    # Shared local engine for cross-database joins, fed from each member's database
+    federation_tools = FederationTools(sources={
+        agent.name: tool
+        for agent in agents
+        for tool in agent.tools
+        if isinstance(tool, DatabaseSQLTools)
+    })
 
     # Agent that summarizes raw SQL results into insights
     analyst_agent = Agent(
-        model=get_model(MEMBER_MODEL_NAME),
+        model=get_model(Config().app_config.member_model, validator=low_confidence),
         name="Analyst Agent",
         role="Analyzes SQL result data",
+        tools=[federation_tools],
         instructions=[
             "Interpret the SQL output and summarize insights, trends, anomalies, and comparisons.",
             "Provide clear, concise analysis with bullet points if needed.",
@@ -85,7 +126,7 @@ def get_data_team(work_style: str = "route", show_member_response: bool = False)
 
     # Agent that transforms technical insights into human-readable explanations
     explainer_agent = Agent(
-        model=get_model(MEMBER_MODEL_NAME),
+        model=get_model(Config().app_config.member_model, validator=low_confidence),
         name="Explanation Agent",
         role="Turns technical output into natural language summary",
         instructions=[
@@ -96,6 +137,13 @@ def get_data_team(work_style: str = "route", show_member_response: bool = False)
     )
     agents.append(explainer_agent)
 
+    # In coordinate mode, let the leader fan independent tasks out to members concurrently
+    team_tools = [federation_tools]
+    dispatch_tools = None
+    if work_style == "coordinate":
+        dispatch_tools = MemberDispatchTools()
+        team_tools.append(dispatch_tools)
+
     # The full data team, led by a coordinator agent
     data_team = Team(
         name="Data Team",
@@ -115,7 +163,12 @@ def get_data_team(work_style: str = "route", show_member_response: bool = False)
         ],
         knowledge=StoreDb().data_team_knowledge,
         search_knowledge=True,
+        tools=team_tools,
+        # Times every leader tool call, including delegation to members
+        tool_hooks=[tool_hook],
         show_members_responses=show_member_response,
+        # Older turns are folded into a running summary once history exceeds its token budget
+        memory=BoundedMemory(summary_model=get_model(Config().app_config.member_model)),
         num_history_runs=50,
         enable_team_history=True,
         user_id=USER_ID,
@@ -124,4 +177,6 @@ def get_data_team(work_style: str = "route", show_member_response: bool = False)
         telemetry=True,
         monitoring=True,
     )
+    if dispatch_tools is not None:
+        dispatch_tools.team = data_team
     return data_team
\ No newline at end of file
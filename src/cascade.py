@@ -0,0 +1,258 @@
+"""
+This module runs a role's model as a cascade, e.g. 'groq:llama-3.1-8b-instant -> openai:gpt-4o':
+the first (fast) tier answers, and the request escalates to the next tier when
+its work fails local checks.
+
+Escalation happens in two places:
+- during a run, when a tool reports a failure (e.g. the SQL validator rejects the
+  generated query): the next model call goes to the next tier, which sees the
+  rejected attempt; across providers, whose tool-result formats differ, the run
+  restarts from the original messages instead. Streamed output cannot be taken
+  back, so streamed runs only escalate within one provider;
+- after a run, when the role's validator rejects the answer (e.g. the extractor
+  returned no valid JSON, or the answer is empty or hedged): the run is repeated
+  on the next tier.
+
+Every tier attempt is recorded under the `llm.cascade` stage with its latency and
+whether it escalated, so `stats` can report escalation rates per tier.
+"""
+
+import json
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional
+
+from agno.models.base import Model
+from agno.models.message import Message
+from agno.models.response import ModelResponse
+from agno.utils.log import log_debug
+
+from instrument import record
+
+# Separator between tiers in a cascade spec
+CASCADE_SEPARATOR = "->"
+
+# Opening phrases of answers that give up rather than answer
+_HEDGES = re.compile(
+    r"^\s*(i('m| am) not sure|i (do not|don't) know|i (cannot|can't|am unable to|was unable to)|unable to (determine|answer))",
+    re.IGNORECASE,
+)
+
+# Markdown code fence around a JSON answer
+_FENCE = re.compile(r"^\s*```(?:json)?\s*(.*?)\s*```\s*$", re.DOTALL)
+
+def parse_cascade(spec: str) -> List[str]:
+    """
+    Split a cascade spec into model IDs, fastest first.
+    """
+    return [tier.strip() for tier in spec.split(CASCADE_SEPARATOR) if tier.strip()]
+
+def low_confidence(content: Any) -> Optional[str]:
+    """
+    Validator escalating empty or hedged answers; returns the reason, or None to accept.
+    """
+    text = content if isinstance(content, str) else json.dumps(content, default=str) if content is not None else ""
+    if not text.strip():
+        return "empty answer"
+    if _HEDGES.match(text):
+        return "low confidence"
+    return None
+
+def invalid_json(content: Any) -> Optional[str]:
+    """
+    Validator escalating answers that are not a non-empty JSON document (code fences allowed).
+    """
+    if not isinstance(content, str):
+        return None if content else "empty answer"
+    match = _FENCE.match(content)
+    try:
+        document = json.loads(match.group(1) if match else content)
+    except ValueError:
+        return "invalid JSON"
+    return None if document else "empty JSON"
+
+class _Restart(Exception):
+    """Raised inside a run to restart it on the next tier."""
+
+@dataclass
+class CascadeModel(Model):
+    """
+    agno model that answers with the first tier and escalates to later tiers.
+
+    Attributes:
+        tiers (List[Model]): Models from fastest to strongest.
+        validator (Callable): Checks a finished answer; returns a reason to escalate, or None.
+    """
+    tiers: List[Model] = field(default_factory=list)
+    validator: Optional[Callable[[Any], Optional[str]]] = None
+
+    def __post_init__(self):
+        super().__post_init__()
+        self.name = "Cascade"
+        self.provider = "cascade"
+        self._tier = 0
+        self._pending: Optional[str] = None
+        self._streaming = False
+
+    @property
+    def active(self) -> Model:
+        """The tier answering the current model call."""
+        return self.tiers[self._tier]
+
+    def escalate(self, reason: str) -> None:
+        """
+        Ask for the next model call of the current run to go to the next tier.
+
+        Called by tools when the current tier's work fails a local check.
+        """
+        if self._tier + 1 < len(self.tiers):
+            self._pending = reason
+
+    def _sync(self, tier: Model) -> Model:
+        """
+        Copy the settings the agent applied to the cascade onto a tier.
+        """
+        tier.response_format = self.response_format
+        tier.structured_outputs = self.structured_outputs
+        tier.tool_choice = self.tool_choice
+        tier.show_tool_calls = self.show_tool_calls
+        tier.tool_call_limit = self.tool_call_limit
+        tier._tools = self._tools
+        tier._functions = self._functions
+        return tier
+
+    def _apply_pending(self) -> None:
+        """
+        Move to the next tier before a model call when a tool asked for escalation.
+        """
+        if self._pending is None:
+            return
+        reason, self._pending = self._pending, None
+        current, following = self.tiers[self._tier], self.tiers[self._tier + 1]
+        if self._streaming and type(current) is not type(following):
+            # Restarting would repeat output the caller has already received; stay on this tier
+            log_debug(f"Cascade {self.id}: not escalating to {following.id} during a streamed run ({reason})")
+            return
+        self._record_attempt(escalated=reason)
+        self._tier += 1
+        log_debug(f"Cascade {self.id}: escalating to {following.id} ({reason})")
+        if type(current) is not type(following):
+            raise _Restart(reason)
+
+    # Provider calls and provider-specific parsing go to the active tier
+
+    def invoke(self, *args, **kwargs) -> Any:
+        self._apply_pending()
+        return self._sync(self.active).invoke(*args, **kwargs)
+
+    async def ainvoke(self, *args, **kwargs) -> Any:
+        self._apply_pending()
+        return await self._sync(self.active).ainvoke(*args, **kwargs)
+
+    def invoke_stream(self, *args, **kwargs) -> Iterator[Any]:
+        self._apply_pending()
+        return self._sync(self.active).invoke_stream(*args, **kwargs)
+
+    def ainvoke_stream(self, *args, **kwargs) -> AsyncIterator[Any]:
+        self._apply_pending()
+        return self._sync(self.active).ainvoke_stream(*args, **kwargs)
+
+    def parse_provider_response(self, response: Any) -> ModelResponse:
+        return self.active.parse_provider_response(response)
+
+    def parse_provider_response_delta(self, response: Any) -> ModelResponse:
+        return self.active.parse_provider_response_delta(response)
+
+    def parse_tool_calls(self, tool_calls_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return self.active.parse_tool_calls(tool_calls_data)
+
+    def format_function_call_results(self, messages: List[Message], function_call_results: List[Message], **kwargs) -> None:
+        self.active.format_function_call_results(messages=messages, function_call_results=function_call_results, **kwargs)
+
+    def get_system_message_for_model(self) -> Optional[str]:
+        return self._sync(self.active).get_system_message_for_model()
+
+    def get_instructions_for_model(self) -> Optional[List[str]]:
+        return self.active.get_instructions_for_model()
+
+    # One agent run is one call to response(); each starts on the first tier
+
+    def _start(self, streaming: bool = False) -> None:
+        self._tier = 0
+        self._pending = None
+        self._streaming = streaming
+        self._started = time.perf_counter()
+
+    def _record_attempt(self, escalated: Optional[str] = None) -> None:
+        """
+        Record the active tier's attempt: its latency and the reason it escalated, if it did.
+        """
+        now = time.perf_counter()
+        record(
+            "llm.cascade",
+            now - self._started,
+            cascade=self.id,
+            tier=self._tier,
+            model=self.active.id,
+            escalated=1 if escalated else 0,
+            reason=escalated,
+        )
+        self._started = now
+
+    def _should_retry(self, content: Any) -> Optional[str]:
+        """
+        Reason to repeat a finished run on the next tier, if any tier is left.
+        """
+        if self.validator is None or self._tier + 1 >= len(self.tiers):
+            return None
+        return self.validator(content)
+
+    def response(self, messages: List[Message]) -> ModelResponse:
+        self._start()
+        start = len(messages)
+        while True:
+            try:
+                response = super().response(messages=messages)
+            except _Restart:
+                del messages[start:]
+                continue
+            reason = self._should_retry(response.content)
+            if reason is None:
+                self._record_attempt()
+                return response
+            self._record_attempt(escalated=reason)
+            self._tier += 1
+            log_debug(f"Cascade {self.id}: repeating the run on {self.active.id} ({reason})")
+            del messages[start:]
+
+    async def aresponse(self, messages: List[Message]) -> ModelResponse:
+        self._start()
+        start = len(messages)
+        while True:
+            try:
+                response = await super().aresponse(messages=messages)
+            except _Restart:
+                del messages[start:]
+                continue
+            reason = self._should_retry(response.content)
+            if reason is None:
+                self._record_attempt()
+                return response
+            self._record_attempt(escalated=reason)
+            self._tier += 1
+            del messages[start:]
+
+    def response_stream(self, messages: List[Message]) -> Iterator[ModelResponse]:
+        # Streamed output cannot be taken back, so only tool-triggered escalation applies,
+        # and only within one provider (see `_apply_pending`)
+        self._start(streaming=True)
+        for chunk in super().response_stream(messages=messages):
+            yield chunk
+        self._record_attempt()
+
+    async def aresponse_stream(self, messages: List[Message]) -> AsyncIterator[ModelResponse]:
+        self._start(streaming=True)
+        async for chunk in super().aresponse_stream(messages=messages):
+            yield chunk
+        self._record_attempt()
@@ -0,0 +1,98 @@
+"""
+This module is a thin client for `data-ai serve`. It only imports an HTTP client,
+so it starts instantly and asks the warm server instead of building agents.
+
+Command:
+    data-ai-client --session weekly-report
+    data-ai-client --message "How many orders were placed yesterday?"
+"""
+
+import json
+from typing import Optional
+from uuid import uuid4
+
+import httpx
+import typer
+from rich.console import Console
+
+from constants import SERVE_HOST, SERVE_PORT, USER_ID
+
+app = typer.Typer(add_completion=False)
+
+def _client(url: str, socket: Optional[str]) -> httpx.Client:
+    """
+    HTTP client for the server, over TCP or a Unix socket.
+    """
+    transport = httpx.HTTPTransport(uds=socket) if socket else None
+    return httpx.Client(base_url=url, transport=transport, timeout=None)
+
+def _ask(client: httpx.Client, console: Console, message: str, user: str, session: str, stream: bool) -> None:
+    """
+    Send one message and print the answer, as it streams when `stream` is set.
+    """
+    body = {"message": message, "user_id": user, "session_id": session, "stream": stream}
+    if not stream:
+        response = client.post("/chat", json=body)
+        response.raise_for_status()
+        answer = response.json()
+        console.print(answer.get("content", ""))
+        console.print(f"[dim]Answered in {answer.get('latency', 0):.1f}s[/dim]")
+        return
+
+    with client.stream("POST", "/chat", json=body) as response:
+        response.raise_for_status()
+        for line in response.iter_lines():
+            if not line:
+                continue
+            event = json.loads(line)
+            if event["event"] == "content":
+                console.print(event["content"], end="", markup=False, highlight=False)
+            elif event["event"] == "tool":
+                console.print(f"\n[dim]→ {event['name']}[/dim]")
+            elif event["event"] == "error":
+                console.print(f"\n[red]ERROR: {event['error']}[/red]")
+            elif event["event"] == "done":
+                console.print(
+                    f"\n[dim]Answered in {event['latency']:.1f}s "
+                    f"({event.get('prompt_tokens', 0)} prompt, {event.get('cached_tokens', 0)} cached, "
+                    f"{event.get('completion_tokens', 0)} completion tokens)[/dim]"
+                )
+
+@app.command()
+def connect(
+    message: str = typer.Option(None, help="Ask one question and exit instead of starting a prompt"),
+    url: str = typer.Option(f"http://{SERVE_HOST}:{SERVE_PORT}", help="Server address"),
+    socket: str = typer.Option(None, help="Unix socket of a server started with `serve --socket`"),
+    user: str = typer.Option(USER_ID, help="User the conversation belongs to"),
+    session: str = typer.Option(None, help="Session to continue; a new one is started when omitted"),
+    stream: bool = typer.Option(True, help="Print the answer as it is generated"),
+):
+    """
+    Chat with the data team held by `data-ai serve`.
+    """
+    console = Console()
+    session = session or str(uuid4())
+    if socket:
+        # The host is ignored over a Unix socket but still required in the URL
+        url = "http://localhost"
+    try:
+        with _client(url, socket) as client:
+            if message:
+                _ask(client, console, message, user, session, stream)
+                return
+            from rich.prompt import Prompt
+            console.print(f"[dim]Session {session}[/dim]")
+            while True:
+                message = Prompt.ask("[bold] :sunglasses: User [/bold]")
+                if message in ["exit", "quit", "bye"]:
+                    break
+                if message.strip():
+                    _ask(client, console, message, user, session, stream)
+    except httpx.HTTPError as e:
+        typer.echo(f"ERROR: {e}")
+
+def main():
+    app()
+
+if __name__ == "__main__":
+    main()
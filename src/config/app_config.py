@@ -1,5 +1,9 @@
 # Configuration loader for Data-AI application
 
+import json
+
+from constants import ANALYZE_MODEL_NAME, MEMBER_MODEL_NAME
+
 class AppConfig(object):
     """
     AppConfig manages application-level configuration flags such as log level.
@@ -9,6 +13,41 @@ class AppConfig(object):
         # Set log level from config, default to 'ERROR' if not provided
         self.log_level = data_config.get('DATA_AI_LOG_LEVEL', 'ERROR')
 
+        # Local validation: agent queries are parsed and checked against the schema snapshot before they run
+        self.validation_enabled = data_config.get('DATA_AI_VALIDATE', 'true').lower() != 'false'
+
+        # Preflight guard: agent queries estimated above these limits are rewritten or rejected
+        self.preflight_enabled = data_config.get('DATA_AI_PREFLIGHT', 'true').lower() != 'false'
+        self.preflight_max_rows = float(data_config.get('DATA_AI_PREFLIGHT_MAX_ROWS', 10_000_000))
+        self.preflight_max_cost = float(data_config.get('DATA_AI_PREFLIGHT_MAX_COST', 5_000_000))
+
+        # Models for database members and schema analysis; 'provider:model' or a cascade
+        # tried left to right, e.g. 'groq:llama-3.1-8b-instant -> openai:gpt-4o'
+        self.member_model = data_config.get('DATA_AI_MEMBER_MODEL') or MEMBER_MODEL_NAME
+        self.analyze_model = data_config.get('DATA_AI_ANALYZE_MODEL') or ANALYZE_MODEL_NAME
+
+        # Stable prompt layout: static prompt content first and volatile content (the current time) last,
+        # so providers can reuse their cached prompt prefix across turns
+        self.stable_prompt = data_config.get('DATA_AI_STABLE_PROMPT', 'true').lower() != 'false'
+
+        # Schema serialization sent to the analyzers, 'compact' or 'json', overridable per analyzer stage,
+        # e.g. {"analyze.semantic": "json"}
+        self.schema_format = data_config.get('DATA_AI_SCHEMA_FORMAT', 'compact')
+        self.analyzer_schema_formats = json.loads(data_config.get('DATA_AI_ANALYZER_SCHEMA_FORMATS') or '{}')
+
+        # Vector store of the knowledge bases: 'chroma', or 'numpy' for in-process memory-mapped collections
+        self.vector_backend = data_config.get('DATA_AI_VECTOR_BACKEND', 'chroma').lower()
+        # Knowledge layout: 'collections' (one collection per agent plus the team's) or 'shared'
+        # (one collection partitioned by agent and level metadata)
+        self.vector_layout = data_config.get('DATA_AI_VECTOR_LAYOUT', 'collections').lower()
+
+        # What agent loading does when a database's catalog watermark changed since it was indexed:
+        # 'warn', 'reindex' (also start `reindex` for it in the background) or 'off' (skip the check)
+        self.drift_check = data_config.get('DATA_AI_DRIFT_CHECK', 'warn').lower()
+
+        # LLM scheduler limits per 'provider:model' or 'provider', e.g. {"openai:gpt-4o": {"rpm": 500, "tpm": 30000, "concurrency": 4}}
+        self.rate_limits = json.loads(data_config.get('DATA_AI_RATE_LIMITS') or '{}')
+
     def is_debug(self) -> bool:
         # Returns True if log level is set to DEBUG
         return self.log_level == "DEBUG"
@@ -16,6 +16,15 @@ DB_STORE_FILE = join(ROOT_DIR, "db-store")
 # File path for storing vectorized knowledge base
 DB_VECTOR_FILE = join(ROOT_DIR, "db-vector")
 
+# Directory of the in-process (NumPy) vector collections
+DB_VECTOR_NUMPY_DIR = join(ROOT_DIR, "db-vector-numpy")
+
+# Vector collection of the team leader's knowledge (per-agent layout)
+TEAM_KNOWLEDGE_COLLECTION = "data-team-knowledge_base"
+
+# Vector collection holding all knowledge in the shared layout, partitioned by agent and level
+SHARED_KNOWLEDGE_COLLECTION = "data-ai-knowledge"
+
 # Path to store image outputs (e.g., for visualizations)
 IMAGES_PATH = join(ROOT_DIR, "images")
 
@@ -26,4 +35,88 @@ ANALYZE_MODEL_NAME = "openai:gpt-4o"
 MEMBER_MODEL_NAME = "openai:gpt-3.5-turbo"
 
 # Model used for the team leader agent to synthesize group responses
-TEAM_LEADER_MODEL_NAME = "openai:o4-mini"
\ No newline at end of file
+TEAM_LEADER_MODEL_NAME = "openai:o4-mini"
+
+# Maximum seconds a team member may spend on a delegated task in coordinate mode
+MEMBER_TIMEOUT_SECONDS = 120
+
+# Maximum number of team members running concurrently in coordinate mode
+MAX_PARALLEL_MEMBERS = 4
+
+# Maximum rows pulled from one database into the local federation engine
+FEDERATION_MAX_ROWS = 200000
+
+# Number of rows fetched per round trip when loading results into the federation engine
+FEDERATION_FETCH_SIZE = 5000
+
+# Token budget for conversation history added to team and member prompts
+HISTORY_TOKEN_BUDGET = 6000
+
+# Number of most recent runs kept verbatim in history; older runs are summarized
+HISTORY_VERBATIM_RUNS = 3
+
+# Maximum characters kept from a tool output when it is replayed from history
+HISTORY_TOOL_OUTPUT_CHARS = 300
+
+# JSONL log of per-stage timings, token counts and row counts
+STATS_FILE = join(ROOT_DIR, "stats.jsonl")
+
+# Prometheus textfile with per-stage totals, refreshed after each command
+METRICS_PROM_FILE = join(ROOT_DIR, "data_ai.prom")
+
+# Default server-side statement timeout (seconds) for agent queries; overridable per database
+STATEMENT_TIMEOUT_SECONDS = 60
+
+# Time budget (seconds) for the optional column statistics pass run by `add --profile`
+PROFILE_TIME_BUDGET_SECONDS = 60
+
+# Rows read per table when column statistics are missing from the catalog
+PROFILE_SAMPLE_ROWS = 10000
+
+# Tables with at least this many estimated rows are linted for predicates that match no index
+INDEX_LINT_MIN_ROWS = 1000000
+
+# Schemas with at most this many tables get shortest join paths precomputed for every table pair
+JOIN_GRAPH_ALL_PAIRS_MAX_TABLES = 200
+
+# Default number of questions answered at the same time by the `ask` command
+BATCH_CONCURRENCY = 4
+
+# Default number of databases registered at the same time by `add-many`, and of analyzer stages run at once per database
+ONBOARD_CONCURRENCY = 4
+ONBOARD_DB_CONCURRENCY = 3
+
+# Attempts of a background indexing job before it is left failed; each attempt resumes after the last completed stage
+JOB_MAX_ATTEMPTS = 3
+
+# Seconds a worker waits after a failed attempt, multiplied by the attempt number
+JOB_RETRY_DELAY_SECONDS = 10.0
+
+# Seconds between queue polls of a `worker` started with --wait
+JOB_POLL_SECONDS = 2.0
+
+# Output of background workers started by `add --background`
+WORKER_LOG_FILE = join(ROOT_DIR, "worker.log")
+
+# Address the `serve` command listens on, and the client's default
+SERVE_HOST = "127.0.0.1"
+SERVE_PORT = 8765
+
+# Number of warm data teams held by the `serve` command; sessions on different teams run concurrently
+SERVE_TEAMS = 4
+
+# Default limits per provider/model lane of the LLM scheduler; override with DATA_AI_RATE_LIMITS
+LLM_DEFAULT_RPM = 500
+LLM_DEFAULT_TPM = 200000
+LLM_DEFAULT_CONCURRENCY = 8
+
+# Retries of an LLM call rejected with 429 or 5xx, with jittered exponential backoff (seconds)
+LLM_MAX_RETRIES = 5
+LLM_BACKOFF_BASE_SECONDS = 1.0
+LLM_BACKOFF_MAX_SECONDS = 60.0
+
+# Server-side timeout in seconds of the catalog watermark query run for each database when agents load
+WATERMARK_TIMEOUT_SECONDS = 5.0
+
+# Databases whose watermark is read at the same time when agents load
+WATERMARK_CONCURRENCY = 8
@@ -1,12 +1,13 @@
 """
 This module defines abstract data structures and interfaces used to describe
 and extract metadata from relational databases. It includes representations
-for database columns, tables, and an abstract Database interface that other
-database implementations must inherit from.
+for database columns, tables with their keys and indexes, column statistics,
+and an abstract Database interface that other database implementations must
+inherit from.
 """
 
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Any, List, Optional, Tuple
 
 class Column:
     """
@@ -25,6 +26,40 @@ class Column:
     def __repr__(self):
         return f"Column(name={self.name}, type={self.type}, description={self.description})"
 
+class ForeignKey:
+    """
+    A class representing a foreign key from one table to another.
+
+    Attributes:
+        columns (List[str]): Referencing columns, in key order.
+        ref_table (str): The referenced table.
+        ref_columns (List[str]): Referenced columns, in key order.
+    """
+    def __init__(self, columns: List[str], ref_table: str, ref_columns: List[str]):
+        self.columns = columns
+        self.ref_table = ref_table
+        self.ref_columns = ref_columns
+
+    def __repr__(self):
+        return f"ForeignKey(columns={self.columns}, ref_table={self.ref_table}, ref_columns={self.ref_columns})"
+
+class Index:
+    """
+    A class representing an index (or sorting key) on a table.
+
+    Attributes:
+        name (str): The name of the index.
+        columns (List[str]): Indexed columns, leading column first.
+        unique (bool): Whether the index enforces uniqueness.
+    """
+    def __init__(self, name: str, columns: List[str], unique: bool = False):
+        self.name = name
+        self.columns = columns
+        self.unique = unique
+
+    def __repr__(self):
+        return f"Index(name={self.name}, columns={self.columns}, unique={self.unique})"
+
 class Table:
     """
     A class representing a table in a database.
@@ -33,14 +68,157 @@ class Table:
         name (str): The name of the table.
         description (str): An optional description of the table.
         columns (List[Column]): A list of columns belonging to the table.
+        primary_key (List[str]): Primary key columns, in key order.
+        foreign_keys (List[ForeignKey]): Foreign keys to other tables.
+        indexes (List[Index]): Indexes on the table.
+        rows (float): Estimated number of rows, when the catalog reports it.
+        kind (str): Relation kind, e.g. 'table', 'partitioned table', 'view' or 'materialized view'.
+        partition_key (str): Partitioning expression of a partitioned table.
+        partitions (int): Number of partitions or inheritance children folded into the table.
     """
-    def __init__(self, name: str, description: str = "", columns: List['Column'] = None):
+    def __init__(
+        self,
+        name: str,
+        description: str = "",
+        columns: List['Column'] = None,
+        primary_key: List[str] = None,
+        foreign_keys: List['ForeignKey'] = None,
+        indexes: List['Index'] = None,
+        rows: Optional[float] = None,
+        kind: str = "table",
+        partition_key: Optional[str] = None,
+        partitions: int = 0,
+    ):
         self.name = name  # Name of the table
         self.description = description  # Optional description of the table
         self.columns = columns or []  # List of Column objects
+        self.primary_key = primary_key or []  # Primary key column names
+        self.foreign_keys = foreign_keys or []  # List of ForeignKey objects
+        self.indexes = indexes or []  # List of Index objects
+        self.rows = rows  # Estimated row count
+        self.kind = kind  # Relation kind
+        self.partition_key = partition_key  # Partitioning expression
+        self.partitions = partitions  # Number of partitions or children
+
+    def to_json(self) -> dict:
+        """
+        Serialize the table, its columns, keys and indexes. Keys, indexes, row
+        estimates and partitioning are omitted when the catalog does not provide them.
+        """
+        data = {
+            "name": self.name,
+            "description": self.description,
+            "columns": [
+                {
+                    "name": col.name,
+                    "type": col.type,
+                    "description": col.description
+                } for col in self.columns
+            ],
+        }
+        if self.primary_key:
+            data["primary_key"] = self.primary_key
+        if self.foreign_keys:
+            data["foreign_keys"] = [
+                {"columns": fk.columns, "ref_table": fk.ref_table, "ref_columns": fk.ref_columns}
+                for fk in self.foreign_keys
+            ]
+        if self.indexes:
+            data["indexes"] = [
+                {"name": index.name, "columns": index.columns, "unique": index.unique}
+                for index in self.indexes
+            ]
+        if self.rows is not None:
+            data["rows"] = self.rows
+        if self.kind != "table":
+            data["kind"] = self.kind
+        if self.partition_key:
+            data["partition_key"] = self.partition_key
+        if self.partitions:
+            data["partitions"] = self.partitions
+        return data
 
     def __repr__(self):
-        return f"Table(name={self.name}, description={self.description}, columns={self.columns})"
+        return (
+            f"Table(name={self.name}, description={self.description}, columns={self.columns}, "
+            f"primary_key={self.primary_key}, foreign_keys={self.foreign_keys}, indexes={self.indexes}, kind={self.kind})"
+        )
+
+class ColumnStats:
+    """
+    Compact statistics for one column, read from catalog statistics or a sample.
+
+    Attributes:
+        name (str): The name of the column.
+        null_fraction (float): Fraction of rows where the column is NULL.
+        distinct (float): Estimated number of distinct values.
+        min_value (Any): Smallest value, for orderable types.
+        max_value (Any): Largest value, for orderable types.
+        top_values (List[Tuple[Any, float]]): Most common values with their frequency (0-1).
+    """
+    def __init__(
+        self,
+        name: str,
+        null_fraction: Optional[float] = None,
+        distinct: Optional[float] = None,
+        min_value: Any = None,
+        max_value: Any = None,
+        top_values: Optional[List[Tuple[Any, float]]] = None,
+    ):
+        self.name = name
+        self.null_fraction = null_fraction
+        self.distinct = distinct
+        self.min_value = min_value
+        self.max_value = max_value
+        self.top_values = top_values or []
+
+    def describe(self) -> str:
+        """Render the statistics as one line, omitting what is unknown."""
+        parts = []
+        if self.null_fraction:
+            parts.append(f"{self.null_fraction:.0%} null")
+        if self.distinct is not None:
+            parts.append(f"~{self.distinct:,.0f} distinct")
+        if self.min_value is not None or self.max_value is not None:
+            parts.append(f"range {_short(self.min_value)} .. {_short(self.max_value)}")
+        if self.top_values:
+            values = ", ".join(f"{_short(value)!r} {frequency:.0%}" for value, frequency in self.top_values)
+            parts.append(f"common values: {values}")
+        return f"{self.name}: " + ("; ".join(parts) or "no statistics")
+
+    def __repr__(self):
+        return f"ColumnStats(name={self.name}, null_fraction={self.null_fraction}, distinct={self.distinct})"
+
+class TableStats:
+    """
+    Row count and per-column statistics for one table.
+
+    Attributes:
+        name (str): The name of the table.
+        rows (float): Estimated number of rows.
+        source (str): Where the statistics came from, e.g. 'pg_stats' or 'sample'.
+        columns (List[ColumnStats]): Statistics per column.
+    """
+    def __init__(self, name: str, rows: Optional[float] = None, source: str = "", columns: List[ColumnStats] = None):
+        self.name = name
+        self.rows = rows
+        self.source = source
+        self.columns = columns or []
+
+    def describe(self) -> str:
+        """Render the statistics as a compact text block for the knowledge base."""
+        rows = f"~{self.rows:,.0f} rows, " if self.rows is not None else ""
+        lines = [f"Column statistics for table {self.name} ({rows}source: {self.source})"]
+        lines.extend(f"- {column.describe()}" for column in self.columns)
+        return "\n".join(lines)
+
+    def __repr__(self):
+        return f"TableStats(name={self.name}, rows={self.rows}, source={self.source}, columns={self.columns})"
+
+def _short(value: Any, width: int = 40) -> str:
+    """Shorten a value for display in statistics."""
+    value = str(value)
+    return value if len(value) <= width else value[: width - 3] + "..."
 
 class Database(ABC):
     """
@@ -63,3 +241,22 @@ class Database(ABC):
     def to_json(self) -> dict:
         """Return the database metadata in JSON-serializable format."""
         pass
+
+    def profile(self, time_budget: float = 60, sample_rows: int = 10000) -> List[TableStats]:
+        """
+        Return column statistics for all tables, read from the catalog where possible
+        and from reads of about `sample_rows` rows otherwise, within `time_budget` seconds.
+
+        Implementations without statistics support return an empty list.
+        """
+        return []
+
+    def watermark(self) -> Optional[str]:
+        """
+        Return a short token that changes whenever tables or columns are created, altered or
+        dropped, read with a single catalog query. Comparing it with the token stored when the
+        database was indexed detects schema drift without a full introspection.
+
+        Implementations without change detection return None.
+        """
+        return None
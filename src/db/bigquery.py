@@ -59,19 +59,6 @@ class BigQueryDatabase(Database):
         # Build a dictionary representing the dataset with all table and column metadata
         return {
             "database": self.dataset_id,
-            "tables": [
-                {
-                    "name": table.name,
-                    "description": table.description,
-                    "columns": [
-                        {
-                            "name": col.name,
-                            "type": col.type,
-                            "description": col.description
-                        } for col in table.columns
-                    ]
-                }
-                for table in self.tables()
-            ]
+            "tables": [table.to_json() for table in self.tables()]
         }
     
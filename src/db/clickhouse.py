@@ -1,12 +1,16 @@
-from typing import List
-from db import Database, Table, Column
+import re
+from typing import List, Optional
+from agno.utils.log import log_debug
+from db import Database, Table, Column, Index, TableStats
+from db.profile import Deadline, quote, sample_table
 from sqlalchemy import Engine, text
 
 class ClickHouseDatabase(Database):
     """
     ClickHouse-specific implementation of the abstract Database interface.
-    This class provides methods to retrieve metadata about tables and columns
-    from a ClickHouse database using SQLAlchemy.
+    This class provides methods to retrieve metadata about tables, columns,
+    primary and sorting keys, and data skipping indexes from a ClickHouse
+    database using SQLAlchemy.
     """
 
     def __init__(self, engine: Engine):
@@ -21,7 +25,9 @@ class ClickHouseDatabase(Database):
         with self.engine.connect() as conn:
             # Execute SHOW TABLES to get all table names
             result = conn.execute(text("SHOW TABLES")).fetchall()
-        return [Table(name=row[0], description="ClickHouse table") for row in result]
+            tables = [Table(name=row[0], description="ClickHouse table") for row in result]
+            self._attach_keys(conn, tables)
+        return tables
 
     def table(self, table_name: str) -> Table:
         """
@@ -31,28 +37,119 @@ class ClickHouseDatabase(Database):
         with self.engine.connect() as conn:
             # Use DESCRIBE TABLE to fetch column info
             result = conn.execute(text(f"DESCRIBE TABLE {table_name}")).fetchall()
-        columns = [Column(name=row[0], type=row[1], description="") for row in result]
-        return Table(name=table_name, description="ClickHouse table", columns=columns)
+            columns = [Column(name=row[0], type=row[1], description="") for row in result]
+            table = Table(name=table_name, description="ClickHouse table", columns=columns)
+            self._attach_keys(conn, [table])
+        return table
+
+    def _attach_keys(self, conn, tables: List[Table]) -> None:
+        """
+        Internal helper to load primary and sorting keys, data skipping indexes and row counts
+        for all tables in the current database, and attach them. ClickHouse has no foreign keys.
+        """
+        by_name = {table.name: table for table in tables}
+        for table_name, primary_key, sorting_key, rows in conn.execute(text("""
+            SELECT name, primary_key, sorting_key, total_rows
+            FROM system.tables
+            WHERE database = currentDatabase()
+        """)).fetchall():
+            table = by_name.get(table_name)
+            if table is None:
+                continue
+            table.primary_key = _key_columns(primary_key)
+            if _key_columns(sorting_key):
+                # The sorting key orders data parts, so filters on its prefix skip granules like an index
+                table.indexes.append(Index("sorting_key", _key_columns(sorting_key)))
+            if rows is not None:
+                table.rows = float(rows)
+
+        try:
+            indices = conn.execute(text("""
+                SELECT table, name, expr
+                FROM system.data_skipping_indices
+                WHERE database = currentDatabase()
+            """)).fetchall()
+        except Exception as e:
+            # system.data_skipping_indices is missing on older servers
+            log_debug(f"Data skipping indexes unavailable: {e}")
+            indices = []
+        for table_name, index_name, expression in indices:
+            if table_name in by_name and _key_columns(expression):
+                by_name[table_name].indexes.append(Index(index_name, _key_columns(expression)))
 
     def to_json(self) -> dict:
         """
         Serialize the entire database schema into a JSON-compatible dictionary.
-        Includes all tables and their column definitions.
+        Includes all tables with their column definitions, keys and indexes.
         """
         return {
             "database": "clickhouse",
-            "tables": [
-                {
-                    "name": table.name,
-                    "description": table.description,
-                    "columns": [
-                        {
-                            "name": col.name,
-                            "type": col.type,
-                            "description": col.description
-                        } for col in table.columns
-                    ]
-                }
-                for table in self.tables()
-            ]
-        }
\ No newline at end of file
+            "tables": [table.to_json() for table in self.tables()]
+        }
+
+    def watermark(self) -> Optional[str]:
+        """
+        Table count and latest metadata modification time, with a checksum of the column definitions.
+        """
+        with self.engine.connect() as conn:
+            tables, modified, checksum = conn.execute(text("""
+                SELECT
+                    count(),
+                    max(metadata_modification_time),
+                    (SELECT sum(cityHash64(table, name, type)) FROM system.columns WHERE database = currentDatabase())
+                FROM
+                    system.tables
+                WHERE
+                    database = currentDatabase()
+            """)).fetchone()
+        return f"{tables}:{modified}:{checksum}"
+
+    def profile(self, time_budget: float = 60, sample_rows: int = 10000) -> List[TableStats]:
+        """
+        Read row counts and column types from `system.parts_columns`, then profile
+        values from a SAMPLE read (tables with a sampling key) or the first `sample_rows` rows.
+        """
+        deadline = Deadline(time_budget)
+        with self.engine.connect() as conn:
+            sampling_keys = dict(conn.execute(text("""
+                SELECT name, sampling_key
+                FROM system.tables
+                WHERE database = currentDatabase()
+            """)).fetchall())
+
+            columns, rows = {}, {}
+            for table_name, column_name, type_, column_rows in conn.execute(text("""
+                SELECT table, column, any(type), sum(rows)
+                FROM system.parts_columns
+                WHERE database = currentDatabase() AND active
+                GROUP BY table, column
+                ORDER BY table, min(column_position)
+            """)).fetchall():
+                columns.setdefault(table_name, []).append(Column(name=column_name, type=type_))
+                rows[table_name] = max(rows.get(table_name, 0), column_rows or 0)
+
+            profiled = []
+            for table_name, table_columns in columns.items():
+                if deadline.expired():
+                    break
+                name = quote("clickhouse", table_name)
+                if sampling_keys.get(table_name):
+                    source = f"{name} SAMPLE {int(sample_rows)}"
+                else:
+                    source = f"(SELECT * FROM {name} LIMIT {int(sample_rows)}) AS sample"
+                stats = sample_table(conn, "clickhouse", table_name, table_columns, source=source, deadline=deadline, rows=rows[table_name])
+                if stats:
+                    stats.source = "system.parts_columns, sample"
+                    profiled.append(stats)
+        return profiled
+
+def _key_columns(expression: str) -> List[str]:
+    """
+    Split a key expression such as 'user_id, toDate(ts)' into its plain column names.
+    Function expressions are skipped, since the agent cannot filter on them directly.
+    """
+    expression = (expression or "").strip()
+    if expression.startswith("(") and expression.endswith(")"):
+        expression = expression[1:-1]
+    parts = [part.strip().strip("`") for part in expression.split(",")]
+    return [part for part in parts if re.fullmatch(r"\w+", part)]
@@ -0,0 +1,147 @@
+"""
+This module renders the catalog JSON produced by `Database.to_json()` in a compact,
+DDL-like text format for LLM input.
+
+The JSON form repeats "name", "type" and "description" keys for every column and
+carries empty descriptions, which dominates analyzer input tokens on wide schemas.
+The compact form writes one header line per table, its columns on one line, and
+keys on a third line only when there are any:
+
+    orders [partitioned table] ~1.2M rows: Customer orders
+      id bigint pk, customer_id int -> customers.id, status varchar(20) "open or closed", created_at timestamptz
+      index orders_created_at (created_at); partitioned by RANGE (created_at) (12 partitions)
+
+Empty fields are omitted and verbose type names are abbreviated.
+"""
+
+import json
+import re
+from typing import Any, Dict, List, Union
+
+# Serializations the analyzers accept
+SCHEMA_FORMATS = ("json", "compact")
+
+# Verbose catalog type names and their abbreviations, matched at the start of the type
+_TYPE_ABBREVIATIONS = [
+    (re.compile(r"^character varying", re.IGNORECASE), "varchar"),
+    (re.compile(r"^character\b", re.IGNORECASE), "char"),
+    (re.compile(r"^integer\b", re.IGNORECASE), "int"),
+    (re.compile(r"^double precision\b", re.IGNORECASE), "double"),
+    (re.compile(r"^boolean\b", re.IGNORECASE), "bool"),
+    (re.compile(r"^timestamp(\(\d+\))? with time zone", re.IGNORECASE), r"timestamptz\1"),
+    (re.compile(r"^timestamp(\(\d+\))? without time zone", re.IGNORECASE), r"timestamp\1"),
+    (re.compile(r"^time(\(\d+\))? with time zone", re.IGNORECASE), r"timetz\1"),
+    (re.compile(r"^time(\(\d+\))? without time zone", re.IGNORECASE), r"time\1"),
+    # MySQL display widths, e.g. int(11), carry no meaning for queries
+    (re.compile(r"^(tinyint|smallint|mediumint|int|bigint)\(\d+\)", re.IGNORECASE), r"\1"),
+]
+
+# ClickHouse wrappers: LowCardinality is a storage detail, Nullable is shown as a trailing '?'
+_LOW_CARDINALITY = re.compile(r"LowCardinality\((.*)\)$")
+_NULLABLE = re.compile(r"Nullable\((.*)\)$")
+
+def compact_type(type_name: str) -> str:
+    """
+    Abbreviate a catalog type name, e.g. 'character varying(20)' to 'varchar(20)'.
+    """
+    type_name = (type_name or "").strip()
+    match = _LOW_CARDINALITY.match(type_name)
+    if match:
+        type_name = match.group(1)
+    match = _NULLABLE.match(type_name)
+    if match:
+        return compact_type(match.group(1)) + "?"
+    for pattern, abbreviation in _TYPE_ABBREVIATIONS:
+        type_name, count = pattern.subn(abbreviation, type_name, count=1)
+        if count:
+            break
+    return type_name
+
+def _rows(rows: float) -> str:
+    """Render a row estimate with a k/M/B suffix."""
+    for suffix, scale in (("B", 1e9), ("M", 1e6), ("k", 1e3)):
+        if rows >= scale:
+            return f"{rows / scale:.1f}".rstrip("0").rstrip(".") + suffix
+    return f"{rows:.0f}"
+
+def _text(value: str) -> str:
+    """Collapse a description to one line."""
+    return " ".join(str(value).split())
+
+def compact_table(table: Dict[str, Any]) -> str:
+    """
+    Render one table of the catalog JSON in the compact format.
+    """
+    header = table["name"]
+    if table.get("kind", "table") != "table":
+        header += f" [{table['kind']}]"
+    if table.get("rows") is not None:
+        header += f" ~{_rows(table['rows'])} rows"
+    if table.get("description"):
+        header += f": {_text(table['description'])}"
+
+    primary_key = table.get("primary_key") or []
+    # Single-column keys are marked on the column; composite keys go to the keys line
+    references = {
+        fk["columns"][0]: f"{fk['ref_table']}.{fk['ref_columns'][0]}"
+        for fk in table.get("foreign_keys", [])
+        if len(fk["columns"]) == 1 and len(fk["ref_columns"]) == 1
+    }
+    columns = []
+    for column in table.get("columns", []):
+        text = f"{column['name']} {compact_type(column.get('type', ''))}"
+        if primary_key == [column["name"]]:
+            text += " pk"
+        if column["name"] in references:
+            text += f" -> {references[column['name']]}"
+        if column.get("description"):
+            text += f" {json.dumps(_text(column['description']))}"
+        columns.append(text)
+
+    keys = []
+    if len(primary_key) > 1:
+        keys.append(f"pk ({', '.join(primary_key)})")
+    for fk in table.get("foreign_keys", []):
+        if len(fk["columns"]) > 1 or len(fk["ref_columns"]) > 1:
+            keys.append(f"({', '.join(fk['columns'])}) -> {fk['ref_table']} ({', '.join(fk['ref_columns'])})")
+    for index in table.get("indexes", []):
+        keys.append(f"{'unique' if index.get('unique') else 'index'} {index['name']} ({', '.join(index['columns'])})")
+    if table.get("partition_key"):
+        keys.append(f"partitioned by {table['partition_key']} ({table.get('partitions', 0)} partitions)")
+
+    lines = [header, "  " + ", ".join(columns)]
+    if keys:
+        lines.append("  " + "; ".join(keys))
+    return "\n".join(lines)
+
+def compact_schema(schema: Dict[str, Any]) -> str:
+    """
+    Render the catalog JSON in the compact format, with a one-line legend.
+    """
+    lines: List[str] = []
+    if schema.get("database"):
+        lines.append(f"Database {schema['database']}")
+    lines.append("Tables: name [kind] ~rows: description, then columns as 'name type', "
+                 "'pk' for primary key, '-> table.column' for foreign keys, '?' for nullable, then keys and indexes.")
+    lines.extend(compact_table(table) for table in schema.get("tables", []))
+    return "\n".join(lines)
+
+def render_schema(schema: Union[str, Dict[str, Any]], schema_format: str = "compact") -> str:
+    """
+    Serialize catalog JSON (as stored, or as returned by `Database.to_json()`) for LLM input.
+
+    Args:
+        schema (str | dict): The catalog JSON.
+        schema_format (str): 'json' for the JSON as stored, or 'compact'.
+
+    Returns:
+        str: The serialized schema.
+
+    Raises:
+        ValueError: If the format is not supported.
+    """
+    if schema_format not in SCHEMA_FORMATS:
+        raise ValueError(f"Unsupported schema format: {schema_format} (expected one of {', '.join(SCHEMA_FORMATS)})")
+    if schema_format == "json":
+        return schema if isinstance(schema, str) else json.dumps(schema)
+    return compact_schema(json.loads(schema) if isinstance(schema, str) else schema)
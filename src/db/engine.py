@@ -0,0 +1,69 @@
+"""
+This module creates SQLAlchemy engines for registered databases with
+server-side statement timeouts, and cancels running queries on the server.
+"""
+
+from typing import Optional
+
+from sqlalchemy import Engine, create_engine, make_url, text
+from sqlalchemy.engine import Connection
+
+def create_db_engine(uri: str, statement_timeout: Optional[float] = None) -> Engine:
+    """
+    Create an engine whose sessions stop statements after `statement_timeout` seconds.
+
+    - PostgreSQL: `statement_timeout` set through the connection options
+    - MySQL: `max_execution_time` set by the connection's init command (SELECT only)
+    - ClickHouse: `max_execution_time` passed as a query setting in the URL
+
+    Args:
+        uri (str): SQLAlchemy database URI.
+        statement_timeout (float): Timeout in seconds; None or 0 disables it.
+
+    Returns:
+        Engine: The configured engine.
+    """
+    url = make_url(uri)
+    if not statement_timeout:
+        return create_engine(url=url)
+
+    milliseconds = int(statement_timeout * 1000)
+    backend = url.get_backend_name()
+    if backend == "postgresql":
+        return create_engine(url=url, connect_args={"options": f"-c statement_timeout={milliseconds}"})
+    if backend == "mysql":
+        return create_engine(url=url, connect_args={"init_command": f"SET SESSION max_execution_time={milliseconds}"})
+    if backend == "clickhouse":
+        return create_engine(url=url.update_query_dict({"max_execution_time": str(int(statement_timeout))}))
+    return create_engine(url=url)
+
+def session_id(conn: Connection) -> Optional[str]:
+    """
+    Return the server-side identifier of a connection's session, used to cancel its query.
+    """
+    dialect = conn.dialect.name
+    if dialect == "postgresql":
+        return str(conn.execute(text("SELECT pg_backend_pid()")).scalar())
+    if dialect == "mysql":
+        return str(conn.execute(text("SELECT CONNECTION_ID()")).scalar())
+    return None
+
+def cancel_query(engine: Engine, session: Optional[str] = None, marker: Optional[str] = None) -> None:
+    """
+    Cancel a running query on the server from a separate connection.
+
+    Args:
+        engine (Engine): Engine of the database running the query.
+        session (str): Session identifier returned by `session_id` (PostgreSQL, MySQL).
+        marker (str): Unique comment embedded in the query text (ClickHouse).
+    """
+    dialect = engine.dialect.name
+    with engine.connect() as conn:
+        if dialect == "postgresql" and session:
+            conn.execute(text("SELECT pg_cancel_backend(:pid)"), {"pid": int(session)})
+        elif dialect == "mysql" and session:
+            conn.execute(text(f"KILL QUERY {int(session)}"))
+        elif dialect == "clickhouse" and marker:
+            # Concatenate the pattern so the KILL statement does not match itself
+            conn.execute(text(f"KILL QUERY WHERE query LIKE concat('%', 'data-ai:', '{marker}', '%') ASYNC"))
+        conn.commit()
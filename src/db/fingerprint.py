@@ -0,0 +1,51 @@
+"""
+This module fingerprints the catalog JSON produced by `Database.to_json()`, so that
+two snapshots of a database can be compared without comparing their full text.
+
+A table's fingerprint covers its columns, keys, indexes, descriptions and
+partition key. Row estimates change with every write, and partition counts with
+every partition attached to a time-partitioned table; both are left out.
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, List, Union
+
+# Table fields that change without the structure changing
+_VOLATILE_KEYS = {"rows", "partitions"}
+
+def table_fingerprint(table: Dict[str, Any]) -> str:
+    """
+    Short hash of a table's structure.
+    """
+    stable = {key: value for key, value in table.items() if key not in _VOLATILE_KEYS}
+    return hashlib.sha256(json.dumps(stable, sort_keys=True, separators=(",", ":")).encode()).hexdigest()[:16]
+
+def schema_fingerprints(schema: Union[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Fingerprints of a catalog snapshot: one per table, and one for the whole schema.
+
+    Args:
+        schema (str | dict): The catalog JSON, as stored or as returned by `Database.to_json()`.
+
+    Returns:
+        dict: {"schema": <hash>, "tables": {<table name>: <hash>}}.
+    """
+    data = json.loads(schema) if isinstance(schema, str) else schema
+    tables = {table["name"]: table_fingerprint(table) for table in (data or {}).get("tables", [])}
+    combined = hashlib.sha256(json.dumps(tables, sort_keys=True).encode()).hexdigest()[:16]
+    return {"schema": combined, "tables": tables}
+
+def changed_tables(before: Dict[str, Any], after: Dict[str, Any]) -> Dict[str, List[str]]:
+    """
+    Compare two results of `schema_fingerprints`.
+
+    Returns:
+        dict: Sorted table names under "added", "removed" and "changed".
+    """
+    old, new = before.get("tables", {}), after.get("tables", {})
+    return {
+        "added": sorted(set(new) - set(old)),
+        "removed": sorted(set(old) - set(new)),
+        "changed": sorted(name for name in set(old) & set(new) if old[name] != new[name]),
+    }
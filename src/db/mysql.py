@@ -1,13 +1,17 @@
-from typing import List
+import base64
+import json
+from typing import Any, List, Optional
 from sqlalchemy import text
 from sqlalchemy.engine import Engine
-from db import Database, Table, Column
+from agno.utils.log import log_debug
+from db import Database, Table, Column, ColumnStats, ForeignKey, Index, TableStats
+from db.profile import Deadline, quote, sample_table, TOP_VALUES
 
 class MySQLDatabase(Database):
     """
     MySQL-specific implementation of the abstract Database interface.
-    This class provides methods to retrieve metadata about tables and columns
-    from a MySQL database using SQLAlchemy.
+    This class provides methods to retrieve metadata about tables, columns,
+    keys and indexes from a MySQL database using SQLAlchemy.
     """
 
     def __init__(self, engine: Engine):
@@ -35,6 +39,7 @@ class MySQLDatabase(Database):
             for table_name, table_comment in table_rows:
                 # Collect metadata for each table
                 tables.append(self._get_table(conn, table_name, table_comment))
+            self._attach_keys(conn, tables)
             return tables
 
     def table(self, table_name: str) -> Table:
@@ -55,7 +60,9 @@ class MySQLDatabase(Database):
             row = result.fetchone()
             if not row:
                 raise ValueError(f"Table '{table_name}' not found.")
-            return self._get_table(conn, table_name, row[0])
+            table = self._get_table(conn, table_name, row[0])
+            self._attach_keys(conn, [table])
+            return table
 
     def _get_table(self, conn, table_name: str, table_description: str) -> Table:
         """
@@ -81,10 +88,77 @@ class MySQLDatabase(Database):
         ]
         return Table(name=table_name, description=table_description or "", columns=columns)
 
+    def _attach_keys(self, conn, tables: List[Table]) -> None:
+        """
+        Internal helper to load primary keys, foreign keys, indexes and row estimates
+        for all tables in the current database with three catalog queries, and attach them.
+        """
+        by_name = {table.name: table for table in tables}
+
+        foreign_keys = {}
+        for table_name, constraint, column, ref_table, ref_column in conn.execute(text("""
+            SELECT
+                table_name,
+                constraint_name,
+                column_name,
+                referenced_table_name,
+                referenced_column_name
+            FROM
+                information_schema.key_column_usage
+            WHERE
+                table_schema = DATABASE()
+                AND (constraint_name = 'PRIMARY' OR referenced_table_name IS NOT NULL)
+            ORDER BY
+                table_name, constraint_name, ordinal_position
+        """)).fetchall():
+            table = by_name.get(table_name)
+            if table is None:
+                continue
+            if constraint == "PRIMARY":
+                table.primary_key.append(column)
+                continue
+            key = (table_name, constraint)
+            if key not in foreign_keys:
+                foreign_keys[key] = ForeignKey([], ref_table, [])
+                table.foreign_keys.append(foreign_keys[key])
+            foreign_keys[key].columns.append(column)
+            foreign_keys[key].ref_columns.append(ref_column)
+
+        indexes = {}
+        for table_name, index_name, non_unique, column in conn.execute(text("""
+            SELECT
+                table_name,
+                index_name,
+                non_unique,
+                column_name
+            FROM
+                information_schema.statistics
+            WHERE
+                table_schema = DATABASE()
+            ORDER BY
+                table_name, index_name, seq_in_index
+        """)).fetchall():
+            # Functional key parts have no column name
+            if table_name not in by_name or column is None:
+                continue
+            key = (table_name, index_name)
+            if key not in indexes:
+                indexes[key] = Index(index_name, [], unique=not non_unique)
+                by_name[table_name].indexes.append(indexes[key])
+            indexes[key].columns.append(column)
+
+        for table_name, rows in conn.execute(text("""
+            SELECT table_name, table_rows
+            FROM information_schema.tables
+            WHERE table_schema = DATABASE()
+        """)).fetchall():
+            if table_name in by_name and rows is not None:
+                by_name[table_name].rows = float(rows)
+
     def to_json(self) -> dict:
         """
         Return the entire database structure as a JSON-serializable dictionary,
-        including all tables and their column metadata.
+        including all tables with their columns, keys and indexes.
         """
         with self.engine.connect() as conn:
             result = conn.execute(text("SELECT DATABASE()"))
@@ -92,18 +166,119 @@ class MySQLDatabase(Database):
 
         return {
             "database": db_name,
-            "tables": [
-                {
-                    "name": table.name,
-                    "description": table.description,
-                    "columns": [
-                        {
-                            "name": col.name,
-                            "type": col.type,
-                            "description": col.description
-                        } for col in table.columns
-                    ]
-                }
-                for table in self.tables()
-            ]
-        }
\ No newline at end of file
+            "tables": [table.to_json() for table in self.tables()]
+        }
+
+    def watermark(self) -> Optional[str]:
+        """
+        Table count and latest creation time (ALTER TABLE rebuilds reset it), with a checksum of
+        the column definitions for in-place changes. UPDATE_TIME is left out: it moves with every write.
+        """
+        with self.engine.connect() as conn:
+            tables, created, columns, checksum = conn.execute(text("""
+                SELECT
+                    (SELECT COUNT(*) FROM information_schema.tables WHERE table_schema = DATABASE()),
+                    (SELECT MAX(create_time) FROM information_schema.tables WHERE table_schema = DATABASE()),
+                    COUNT(*),
+                    SUM(CRC32(CONCAT_WS(':', table_name, column_name, column_type, is_nullable, column_key)))
+                FROM
+                    information_schema.columns
+                WHERE
+                    table_schema = DATABASE()
+            """)).fetchone()
+        return f"{tables}:{created}:{columns}:{checksum}"
+
+    def profile(self, time_budget: float = 60, sample_rows: int = 10000) -> List[TableStats]:
+        """
+        Read column statistics from `information_schema`: index cardinality from STATISTICS
+        and histograms from COLUMN_STATISTICS (MySQL 8.0+). Columns with neither are
+        profiled from the first `sample_rows` rows of their table.
+        """
+        deadline = Deadline(time_budget)
+        with self.engine.connect() as conn:
+            estimates = dict(conn.execute(text("""
+                SELECT table_name, table_rows
+                FROM information_schema.tables
+                WHERE table_schema = DATABASE()
+            """)).fetchall())
+
+            catalog = {}
+            for table_name, column_name, cardinality in conn.execute(text("""
+                SELECT table_name, column_name, MAX(cardinality)
+                FROM information_schema.statistics
+                WHERE table_schema = DATABASE() AND seq_in_index = 1
+                GROUP BY table_name, column_name
+            """)).fetchall():
+                catalog[(table_name, column_name)] = ColumnStats(name=column_name, distinct=cardinality)
+
+            try:
+                histograms = conn.execute(text("""
+                    SELECT table_name, column_name, histogram
+                    FROM information_schema.column_statistics
+                    WHERE schema_name = DATABASE()
+                """)).fetchall()
+            except Exception as e:
+                # Histograms are only available from MySQL 8.0
+                log_debug(f"Column histograms unavailable: {e}")
+                conn.rollback()
+                histograms = []
+            for table_name, column_name, histogram in histograms:
+                stats = _histogram_stats(column_name, histogram)
+                if (table_name, column_name) in catalog and stats.distinct is None:
+                    stats.distinct = catalog[(table_name, column_name)].distinct
+                catalog[(table_name, column_name)] = stats
+
+            profiled = []
+            for table in self.tables():
+                rows = float(estimates.get(table.name) or 0)
+                known = [catalog[(table.name, c.name)] for c in table.columns if (table.name, c.name) in catalog]
+                missing = [c for c in table.columns if (table.name, c.name) not in catalog]
+                stats = TableStats(name=table.name, rows=rows, source="information_schema", columns=known)
+                if missing and not deadline.expired():
+                    source = f"(SELECT * FROM {quote('mysql', table.name)} LIMIT {int(sample_rows)}) AS sample"
+                    sampled = sample_table(conn, "mysql", table.name, missing, source=source, deadline=deadline, rows=rows)
+                    if sampled:
+                        stats.columns.extend(sampled.columns)
+                        stats.source = "information_schema, sample" if known else "sample"
+                if stats.columns:
+                    # Keep the table's column order
+                    order = {c.name: i for i, c in enumerate(table.columns)}
+                    stats.columns.sort(key=lambda c: order.get(c.name, len(order)))
+                    profiled.append(stats)
+        return profiled
+
+def _histogram_value(value: Any) -> Any:
+    """
+    Decode a histogram bucket value; strings are stored as 'base64:type<N>:<data>'.
+    """
+    if isinstance(value, str) and value.startswith("base64:"):
+        try:
+            return base64.b64decode(value.split(":", 2)[2]).decode("utf-8", errors="replace")
+        except (IndexError, ValueError):
+            return value
+    return value
+
+def _histogram_stats(column_name: str, histogram: Any) -> ColumnStats:
+    """
+    Reduce a MySQL singleton or equi-height histogram to column statistics.
+    """
+    document = json.loads(histogram) if isinstance(histogram, (str, bytes)) else histogram
+    buckets = document.get("buckets") or []
+    stats = ColumnStats(name=column_name, null_fraction=document.get("null-values"))
+    if not buckets:
+        return stats
+
+    if document.get("histogram-type") == "singleton":
+        # [value, cumulative frequency] per distinct value
+        frequencies, previous = [], 0.0
+        for value, cumulative in buckets:
+            frequencies.append((_histogram_value(value), cumulative - previous))
+            previous = cumulative
+        stats.distinct = len(buckets)
+        stats.min_value, stats.max_value = frequencies[0][0], frequencies[-1][0]
+        stats.top_values = sorted(frequencies, key=lambda item: item[1], reverse=True)[:TOP_VALUES]
+    else:
+        # [lower, upper, cumulative frequency, distinct values] per bucket
+        stats.distinct = sum(bucket[3] for bucket in buckets)
+        stats.min_value, stats.max_value = _histogram_value(buckets[0][0]), _histogram_value(buckets[-1][1])
+    return stats
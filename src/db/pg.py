@@ -1,98 +1,233 @@
-from typing import List
+from fnmatch import fnmatch
+from typing import Dict, List, Optional, Tuple
 from sqlalchemy import text
 from sqlalchemy.engine import Engine
-from db import Database, Table, Column
+from db import Database, Table, Column, ColumnStats, ForeignKey, Index, TableStats
+from db.profile import Deadline, quote, sample_table, TOP_VALUES
+
+# Relation kinds introspected, by pg_class.relkind
+_KINDS = {
+    "r": "table",
+    "p": "partitioned table",
+    "v": "view",
+    "m": "materialized view",
+}
 
 class PostgreSQLDatabase(Database):
     """
     PostgreSQL-specific implementation of the abstract Database interface.
-    This class provides methods to retrieve metadata about tables and columns
-    from a PostgreSQL database using SQLAlchemy.
+    This class provides methods to retrieve metadata about tables, views, columns,
+    keys and indexes from a PostgreSQL database using SQLAlchemy.
+
+    Partitions and inheritance children are collapsed into their parent, which is
+    reported once with its partition key and partition count. Tables outside the
+    `public` schema are named `schema.table`.
     """
 
-    def __init__(self, engine: Engine):
+    def __init__(self, engine: Engine, include_schemas: Optional[List[str]] = None, exclude_schemas: Optional[List[str]] = None):
         # Initialize with a SQLAlchemy engine to connect to the PostgreSQL database
         self.engine = engine
+        # Glob patterns selecting the schemas to introspect, e.g. ["public", "sales_*"]
+        self.include_schemas = include_schemas or ["public"]
+        self.exclude_schemas = exclude_schemas or []
 
     def tables(self) -> List[Table]:
         """
-        Retrieve all user-defined tables in the public schema of the database.
-        Returns a list of Table objects with basic metadata.
+        Retrieve all tables, partitioned tables, views and materialized views in the selected schemas.
+        Returns a list of Table objects with columns, keys, indexes and partition details.
         """
         with self.engine.connect() as conn:
-            result = conn.execute(text("""
-                SELECT
-                    c.relname AS table_name,
-                    obj_description(c.oid) AS table_description
-                FROM
-                    pg_class c
-                JOIN
-                    pg_namespace n ON n.oid = c.relnamespace
-                WHERE
-                    c.relkind = 'r'
-                    AND n.nspname = 'public'
-            """))
-            table_rows = result.fetchall()
-
-            tables = []
-            for table_name, table_desc in table_rows:
-                tables.append(self._get_table(conn, table_name, table_desc))
-            return tables
+            return self._get_tables(conn, self._relations(conn))
 
     def table(self, table_name: str) -> Table:
         """
-        Retrieve metadata for a specific table in the public schema.
+        Retrieve metadata for a specific table or view, named `table` or `schema.table`.
         Returns a Table object if found, otherwise raises an error.
         """
         with self.engine.connect() as conn:
-            result = conn.execute(text("""
-                SELECT
-                    obj_description(c.oid) AS table_description
-                FROM
-                    pg_class c
-                JOIN
-                    pg_namespace n ON n.oid = c.relnamespace
-                WHERE
-                    c.relname = :table_name
-                    AND n.nspname = 'public'
-                    AND c.relkind = 'r'
-            """), {"table_name": table_name})
-            row = result.fetchone()
-            if not row:
+            schema, relname = table_name.split(".", 1) if "." in table_name else (None, table_name)
+            relations = [
+                relation for relation in self._relations(conn)
+                if relation[2] == relname and (schema is None or relation[1] == schema)
+            ]
+            if not relations:
                 raise ValueError(f"Table '{table_name}' not found.")
-            return self._get_table(conn, table_name, row[0])
+            # Unqualified names resolve to public first, like the default search_path
+            relations.sort(key=lambda relation: relation[1] != "public")
+            return self._get_tables(conn, relations[:1])[0]
+
+    def _schemas(self, conn) -> List[str]:
+        """
+        Internal helper returning the schemas matched by the include patterns and not by the exclude patterns.
+        """
+        names = [row[0] for row in conn.execute(text("""
+            SELECT nspname
+            FROM pg_namespace
+            WHERE nspname NOT LIKE 'pg\\_%' AND nspname <> 'information_schema'
+        """)).fetchall()]
+        return [
+            name for name in names
+            if any(fnmatch(name, pattern) for pattern in self.include_schemas)
+            and not any(fnmatch(name, pattern) for pattern in self.exclude_schemas)
+        ]
+
+    def _relations(self, conn) -> List[Tuple]:
+        """
+        Internal helper listing top-level relations in the selected schemas: (oid, schema, name,
+        relkind, description, partition key). Partitions and inheritance children are skipped.
+        """
+        return conn.execute(text("""
+            SELECT
+                c.oid,
+                n.nspname,
+                c.relname,
+                c.relkind,
+                obj_description(c.oid, 'pg_class'),
+                CASE WHEN c.relkind = 'p' THEN pg_get_partkeydef(c.oid) END
+            FROM
+                pg_class c
+            JOIN
+                pg_namespace n ON n.oid = c.relnamespace
+            WHERE
+                c.relkind IN ('r', 'p', 'v', 'm')
+                AND n.nspname = ANY(:schemas)
+                AND NOT EXISTS (SELECT 1 FROM pg_inherits i WHERE i.inhrelid = c.oid)
+            ORDER BY
+                n.nspname, c.relname
+        """), {"schemas": self._schemas(conn)}).fetchall()
+
+    def _get_tables(self, conn, relations: List[Tuple]) -> List[Table]:
+        """
+        Internal helper building Table objects for relations, loading columns,
+        partition details, keys and indexes with one catalog query each.
+        """
+        by_oid: Dict[int, Table] = {}
+        for oid, schema, relname, relkind, description, partition_key in relations:
+            by_oid[oid] = Table(
+                name=_qualified(schema, relname),
+                description=description or "",
+                kind=_KINDS[relkind],
+                partition_key=partition_key,
+            )
+        if not by_oid:
+            return []
+        oids = list(by_oid)
+
+        for oid, name, type_, description in conn.execute(text("""
+            SELECT
+                a.attrelid,
+                a.attname,
+                format_type(a.atttypid, a.atttypmod),
+                col_description(a.attrelid, a.attnum)
+            FROM
+                pg_attribute a
+            WHERE
+                a.attrelid = ANY(:oids)
+                AND a.attnum > 0
+                AND NOT a.attisdropped
+            ORDER BY
+                a.attrelid, a.attnum
+        """), {"oids": oids}).fetchall():
+            by_oid[oid].columns.append(Column(name, type_, description or ""))
+
+        # Row estimates include every partition or child; reltuples is -1 until a relation is analyzed
+        for oid, rows, partitions in conn.execute(text("""
+            WITH RECURSIVE tree AS (
+                SELECT c.oid AS root, c.oid AS relid, 0 AS depth
+                FROM pg_class c
+                WHERE c.oid = ANY(:oids)
+                UNION ALL
+                SELECT tree.root, i.inhrelid, tree.depth + 1
+                FROM tree
+                JOIN pg_inherits i ON i.inhparent = tree.relid
+            )
+            SELECT
+                tree.root,
+                SUM(c.reltuples) FILTER (WHERE c.reltuples >= 0 AND c.relkind IN ('r', 'm')),
+                COUNT(*) FILTER (WHERE tree.depth > 0 AND c.relkind <> 'p')
+            FROM
+                tree
+            JOIN
+                pg_class c ON c.oid = tree.relid
+            GROUP BY
+                tree.root
+        """), {"oids": oids}).fetchall():
+            table = by_oid[oid]
+            if rows is not None and table.kind != "view":
+                table.rows = float(rows)
+            if partitions:
+                table.partitions = partitions
+
+        self._attach_keys(conn, by_oid)
+        return list(by_oid.values())
 
-    def _get_table(self, conn, table_name: str, table_description: str) -> Table:
+    def _attach_keys(self, conn, by_oid: Dict[int, Table]) -> None:
         """
-        Internal helper method to fetch column metadata for a given table name.
-        Returns a Table object with a list of associated Column objects.
+        Internal helper to load primary keys, foreign keys and indexes for the given
+        relations with two catalog queries, and attach them.
         """
-        result = conn.execute(text("""
+        oids = list(by_oid)
+        for oid, kind, columns, ref_schema, ref_table, ref_columns in conn.execute(text("""
             SELECT
-                cols.column_name,
-                cols.data_type,
-                pgd.description
+                con.conrelid,
+                con.contype,
+                ARRAY(
+                    SELECT a.attname::text
+                    FROM unnest(con.conkey) WITH ORDINALITY AS k(attnum, ord)
+                    JOIN pg_attribute a ON a.attrelid = con.conrelid AND a.attnum = k.attnum
+                    ORDER BY k.ord
+                ),
+                rn.nspname,
+                r.relname,
+                ARRAY(
+                    SELECT a.attname::text
+                    FROM unnest(con.confkey) WITH ORDINALITY AS k(attnum, ord)
+                    JOIN pg_attribute a ON a.attrelid = con.confrelid AND a.attnum = k.attnum
+                    ORDER BY k.ord
+                )
             FROM
-                information_schema.columns cols
+                pg_constraint con
             LEFT JOIN
-                pg_catalog.pg_statio_all_tables st ON cols.table_schema = st.schemaname AND cols.table_name = st.relname
+                pg_class r ON r.oid = con.confrelid
             LEFT JOIN
-                pg_catalog.pg_description pgd ON pgd.objoid = st.relid AND pgd.objsubid = cols.ordinal_position
+                pg_namespace rn ON rn.oid = r.relnamespace
             WHERE
-                cols.table_schema = 'public'
-                AND cols.table_name = :table_name
-            ORDER BY
-                cols.ordinal_position
-        """), {"table_name": table_name})
-        columns = [
-            Column(name, type_, desc or "")
-            for name, type_, desc in result.fetchall()
-        ]
-        return Table(name=table_name, description=table_description or "", columns=columns)
+                con.conrelid = ANY(:oids)
+                AND con.contype IN ('p', 'f')
+                -- Constraints cloned onto partitions point at their parent's constraint
+                AND con.conparentid = 0
+        """), {"oids": oids}).fetchall():
+            table = by_oid[oid]
+            if kind == "p":
+                table.primary_key = list(columns)
+            else:
+                table.foreign_keys.append(ForeignKey(list(columns), _qualified(ref_schema, ref_table), list(ref_columns)))
+
+        for oid, index_name, unique, columns in conn.execute(text("""
+            SELECT
+                ix.indrelid,
+                i.relname,
+                ix.indisunique,
+                ARRAY(
+                    SELECT a.attname::text
+                    FROM unnest(ix.indkey::int2[]) WITH ORDINALITY AS k(attnum, ord)
+                    JOIN pg_attribute a ON a.attrelid = ix.indrelid AND a.attnum = k.attnum
+                    ORDER BY k.ord
+                )
+            FROM
+                pg_index ix
+            JOIN
+                pg_class i ON i.oid = ix.indexrelid
+            WHERE
+                ix.indrelid = ANY(:oids)
+        """), {"oids": oids}).fetchall():
+            # Expression-only indexes have no plain columns
+            if columns:
+                by_oid[oid].indexes.append(Index(index_name, list(columns), unique))
 
     def to_json(self) -> dict:
         """
-        Convert the entire database schema (tables and columns) into a JSON-serializable dictionary.
+        Convert the entire database schema (tables, views, columns, keys and indexes) into a JSON-serializable dictionary.
         """
         with self.engine.connect() as conn:
             result = conn.execute(text("SELECT current_database()"))
@@ -100,18 +235,150 @@ class PostgreSQLDatabase(Database):
 
         return {
             "database": db_name,
-            "tables": [
-                {
-                    "name": table.name,
-                    "description": table.description,
-                    "columns": [
-                        {
-                            "name": col.name,
-                            "type": col.type,
-                            "description": col.description
-                        } for col in table.columns
-                    ]
-                }
-                for table in self.tables()
-            ]
-        }
\ No newline at end of file
+            "tables": [table.to_json() for table in self.tables()]
+        }
+
+    def watermark(self) -> Optional[str]:
+        """
+        Hash of the relations, columns and keys of the selected schemas, computed by the server.
+        Catalog contents are hashed rather than row versions (xmin), as ANALYZE and autovacuum
+        rewrite pg_class rows without changing the schema. Partitions and inheritance children are
+        left out, as introspection lists them under their parent: attaching a new partition is not drift.
+        """
+        with self.engine.connect() as conn:
+            return conn.execute(text("""
+                SELECT md5(coalesce(string_agg(
+                    c.oid::text || ':' || c.relname || ':' || c.relkind || ':' || coalesce(a.columns, '') || ':' || coalesce(k.keys, ''),
+                    ',' ORDER BY c.oid
+                ), ''))
+                FROM
+                    pg_class c
+                JOIN
+                    pg_namespace n ON n.oid = c.relnamespace
+                LEFT JOIN LATERAL (
+                    SELECT string_agg(attname || ' ' || atttypid::text || ' ' || atttypmod::text || ' ' || attnotnull::text, ',' ORDER BY attnum) AS columns
+                    FROM pg_attribute
+                    WHERE attrelid = c.oid AND attnum > 0 AND NOT attisdropped
+                ) a ON true
+                LEFT JOIN LATERAL (
+                    SELECT string_agg(conname || ' ' || contype || ' ' || confrelid::text, ',' ORDER BY conname) AS keys
+                    FROM pg_constraint
+                    WHERE conrelid = c.oid AND contype IN ('p', 'f', 'u')
+                ) k ON true
+                WHERE
+                    c.relkind IN ('r', 'p', 'v', 'm')
+                    AND n.nspname = ANY(:schemas)
+                    AND NOT c.relispartition
+                    AND NOT EXISTS (SELECT 1 FROM pg_inherits i WHERE i.inhrelid = c.oid)
+            """), {"schemas": self._schemas(conn)}).scalar()
+
+    def profile(self, time_budget: float = 60, sample_rows: int = 10000) -> List[TableStats]:
+        """
+        Read column statistics from `pg_stats` (whole-hierarchy statistics for partitioned
+        and inherited tables). Relations that were never analyzed are profiled from a
+        TABLESAMPLE read instead, or the first rows for views.
+        """
+        deadline = Deadline(time_budget)
+        tables = {table.name: table for table in self.tables()}
+        with self.engine.connect() as conn:
+            result = conn.execute(text("""
+                SELECT DISTINCT ON (schemaname, tablename, attname)
+                    schemaname,
+                    tablename,
+                    attname,
+                    null_frac,
+                    n_distinct,
+                    most_common_vals::text,
+                    most_common_freqs,
+                    histogram_bounds::text
+                FROM
+                    pg_stats
+                WHERE
+                    schemaname = ANY(:schemas)
+                ORDER BY
+                    schemaname, tablename, attname, inherited DESC
+            """), {"schemas": self._schemas(conn)})
+
+            profiled = {}
+            for schema, relname, column_name, null_frac, n_distinct, common_values, common_freqs, bounds in result.fetchall():
+                table = tables.get(_qualified(schema, relname))
+                if table is None:
+                    continue
+                rows = table.rows or 0
+                stats = profiled.setdefault(table.name, TableStats(name=table.name, rows=table.rows, source="pg_stats"))
+                values = _parse_array(common_values)
+                histogram = _parse_array(bounds)
+                stats.columns.append(ColumnStats(
+                    name=column_name,
+                    null_fraction=null_frac,
+                    # Negative n_distinct is a fraction of the row count
+                    distinct=n_distinct if n_distinct >= 0 else -n_distinct * rows,
+                    min_value=histogram[0] if histogram else None,
+                    max_value=histogram[-1] if histogram else None,
+                    top_values=list(zip(values, common_freqs or []))[:TOP_VALUES],
+                ))
+
+            for stats in profiled.values():
+                # Keep the table's column order
+                order = {c.name: i for i, c in enumerate(tables[stats.name].columns)}
+                stats.columns.sort(key=lambda c: order.get(c.name, len(order)))
+
+            for table in tables.values():
+                if table.name in profiled or deadline.expired():
+                    continue
+                stats = sample_table(
+                    conn, "postgresql", table.name, table.columns,
+                    source=self._sample_source(table, sample_rows),
+                    deadline=deadline,
+                    rows=table.rows,
+                )
+                if stats:
+                    profiled[table.name] = stats
+            conn.rollback()
+        return list(profiled.values())
+
+    def _sample_source(self, table: Table, sample_rows: int) -> str:
+        """
+        FROM clause reading about `sample_rows` rows of a table.
+        """
+        schema, relname = table.name.split(".", 1) if "." in table.name else ("public", table.name)
+        name = f"{quote('postgresql', schema)}.{quote('postgresql', relname)}"
+        rows = table.rows or 0
+        if rows > sample_rows and table.kind != "view":
+            return f"{name} TABLESAMPLE SYSTEM ({max(sample_rows / rows * 100, 0.0001):.4f})"
+        # Views, small tables and tables without estimates: read the first rows
+        return f"(SELECT * FROM {name} LIMIT {int(sample_rows)}) AS sample"
+
+def _qualified(schema: Optional[str], relname: Optional[str]) -> Optional[str]:
+    """
+    Name a relation as agents refer to it: bare in `public`, `schema.name` elsewhere.
+    """
+    if relname is None:
+        return None
+    return relname if schema in (None, "public") else f"{schema}.{relname}"
+
+def _parse_array(literal: Optional[str]) -> List[Optional[str]]:
+    """
+    Parse a one-dimensional PostgreSQL array literal such as '{a,"b c",NULL}'.
+    """
+    if not literal or len(literal) <= 2:
+        return []
+    items, current, quoted, escaped, was_quoted = [], [], False, False, False
+    for char in literal[1:-1]:
+        if escaped:
+            current.append(char)
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif char == '"':
+            quoted = not quoted
+            was_quoted = True
+        elif char == "," and not quoted:
+            value = "".join(current)
+            items.append(None if value == "NULL" and not was_quoted else value)
+            current, was_quoted = [], False
+        else:
+            current.append(char)
+    value = "".join(current)
+    items.append(None if value == "NULL" and not was_quoted else value)
+    return items
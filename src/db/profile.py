@@ -0,0 +1,145 @@
+"""
+This module profiles tables from sampled reads, for databases or tables whose
+catalog statistics are missing.
+
+One aggregate query per table collects null and distinct counts for every column
+and min/max for orderable types, then the most common values of low-cardinality
+columns are read. Every query is bounded by the remaining time budget.
+"""
+
+import re
+import time
+from typing import Any, List, Optional
+
+from sqlalchemy import text
+from agno.utils.log import logger
+
+from db import Column, ColumnStats, TableStats
+
+# Column types whose min/max are meaningful
+_ORDERABLE = re.compile(r"int|numeric|decimal|real|double|float|date|time", re.IGNORECASE)
+
+# Columns with at most this many distinct values in the sample get their common values listed
+LOW_CARDINALITY = 20
+
+# Number of common values kept per low-cardinality column
+TOP_VALUES = 5
+
+# Identifier quoting and distinct-count expression per dialect
+_DIALECTS = {
+    "postgresql": {"quote": '"', "distinct": "COUNT(DISTINCT CAST({c} AS TEXT))"},
+    "mysql": {"quote": "`", "distinct": "COUNT(DISTINCT {c})"},
+    "clickhouse": {"quote": "`", "distinct": "uniq({c})"},
+}
+
+class Deadline:
+    """
+    Tracks the time left in a profiling budget.
+    """
+    def __init__(self, seconds: float):
+        self.expires = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        """Seconds left before the budget is exhausted."""
+        return max(0.0, self.expires - time.monotonic())
+
+    def expired(self) -> bool:
+        """Whether the budget is exhausted."""
+        return self.remaining() <= 0
+
+def quote(dialect: str, name: str) -> str:
+    """
+    Quote an identifier for the dialect.
+    """
+    q = _DIALECTS[dialect]["quote"]
+    return f"{q}{name.replace(q, q + q)}{q}"
+
+def _bounded(conn, dialect: str, sql: str, deadline: Deadline) -> Any:
+    """
+    Execute a query so the server stops it when the budget runs out.
+    """
+    seconds = deadline.remaining()
+    if dialect == "postgresql":
+        conn.execute(text(f"SET LOCAL statement_timeout = {max(1, int(seconds * 1000))}"))
+    elif dialect == "mysql":
+        sql = sql.replace("SELECT", f"SELECT /*+ MAX_EXECUTION_TIME({max(1, int(seconds * 1000))}) */", 1)
+    elif dialect == "clickhouse":
+        sql = f"{sql} SETTINGS max_execution_time = {max(1, int(seconds))}"
+    return conn.execute(text(sql))
+
+def sample_table(
+    conn,
+    dialect: str,
+    table: str,
+    columns: List[Column],
+    source: str,
+    deadline: Deadline,
+    rows: Optional[float] = None,
+) -> Optional[TableStats]:
+    """
+    Profile a table from a sampled read.
+
+    Args:
+        conn: Open connection to the database.
+        dialect (str): SQLAlchemy dialect name.
+        table (str): Table name, used to label the statistics.
+        columns (List[Column]): Columns to profile.
+        source (str): FROM clause reading the sample, e.g. a TABLESAMPLE or a LIMIT subquery.
+        deadline (Deadline): Remaining profiling budget.
+        rows (float): Estimated table rows from the catalog, if known.
+
+    Returns:
+        TableStats: Statistics measured on the sample, or None when the budget ran out or the read failed.
+    """
+    if deadline.expired() or not columns:
+        return None
+
+    expressions = ["COUNT(*)"]
+    for column in columns:
+        c = quote(dialect, column.name)
+        expressions.append(f"COUNT({c})")
+        expressions.append(_DIALECTS[dialect]["distinct"].format(c=c))
+        if _ORDERABLE.search(column.type or ""):
+            expressions.extend([f"MIN({c})", f"MAX({c})"])
+
+    try:
+        row = _bounded(conn, dialect, f"SELECT {', '.join(expressions)} FROM {source}", deadline).fetchone()
+        sampled = row[0] or 0
+        stats = TableStats(name=table, rows=rows if rows is not None else sampled, source="sample")
+        position = 1
+        for column in columns:
+            non_null, distinct = row[position], row[position + 1]
+            position += 2
+            min_value = max_value = None
+            if _ORDERABLE.search(column.type or ""):
+                min_value, max_value = row[position], row[position + 1]
+                position += 2
+            stats.columns.append(ColumnStats(
+                name=column.name,
+                null_fraction=1 - non_null / sampled if sampled else None,
+                distinct=distinct,
+                min_value=min_value,
+                max_value=max_value,
+            ))
+    except Exception as e:
+        logger.warning(f"Skipping statistics for {table}: {e}")
+        # A failed statement aborts the transaction on PostgreSQL
+        conn.rollback()
+        return None
+
+    # Enum-like columns get their common values, while the budget allows
+    for column in stats.columns:
+        if deadline.expired() or not sampled or not column.distinct or column.distinct > LOW_CARDINALITY:
+            continue
+        c = quote(dialect, column.name)
+        try:
+            result = _bounded(
+                conn, dialect,
+                f"SELECT {c}, COUNT(*) AS n FROM {source} WHERE {c} IS NOT NULL GROUP BY {c} ORDER BY n DESC LIMIT {TOP_VALUES}",
+                deadline,
+            )
+            column.top_values = [(value, count / sampled) for value, count in result.fetchall()]
+        except Exception as e:
+            logger.warning(f"Skipping common values for {table}.{column.name}: {e}")
+            conn.rollback()
+    return stats
@@ -5,11 +5,13 @@ and progress spinners for UI feedback.
 """
 
 import uuid
-from agno.models.anthropic import Claude
+from functools import lru_cache
+from typing import Any, Callable, Optional
 from agno.models.google import Gemini
 from agno.models.groq import Groq
 from agno.models.openai import OpenAIChat
 from agno.models.base import Model
+from agno.utils.log import logger
 from config import Config
 
 def with_spinner(task_description: str, fn):
@@ -94,7 +96,7 @@ def agent_name(db_name: str) -> str:
     """
     return f"sql-agent-{db_name}"
 
-def get_model(model_id: str) -> Model:
+def get_model(model_id: str, validator: Optional[Callable[[Any], Optional[str]]] = None) -> Model:
     """
     Create and return a model instance based on model ID.
 
@@ -102,8 +104,14 @@ def get_model(model_id: str) -> Model:
 
     Supported providers: openai, google, anthropic, groq
 
+    Calls made by the model are scheduled per provider and model (see `scheduler`).
+    A cascade such as 'groq:llama-3.1-8b-instant -> openai:gpt-4o' returns a
+    `CascadeModel` trying the tiers from left to right (see `cascade`).
+
     Args:
-        model_id (str): Provider and model name separated by colon.
+        model_id (str): Provider and model name separated by colon, or a cascade of them.
+        validator (Callable): For a cascade, checks a finished answer and returns a reason
+            to repeat the run on the next tier, or None to accept it.
 
     Returns:
         Model: An instance of a Model subclass.
@@ -111,24 +119,72 @@ def get_model(model_id: str) -> Model:
     Raises:
         ValueError: If provider is not supported or API key not set.
     """
+    from cascade import CASCADE_SEPARATOR, CascadeModel, parse_cascade
+    from scheduler import scheduled
+    if CASCADE_SEPARATOR in model_id:
+        tiers = [get_model(tier) for tier in parse_cascade(model_id)]
+        return CascadeModel(id=" -> ".join(parse_cascade(model_id)), tiers=tiers, validator=validator)
     model: Model = None
     provider, model_name = model_id.split(":")
+    # Provider calls go through the shared rate-limit scheduler, which owns retries on 429 and 5xx
     if provider == "openai":
         if not Config().open_ai_key:
             raise ValueError("OPENAI_API_KEY not set. Please set the OPENAI_API_KEY environment variable.")
-        model = OpenAIChat(id=model_name)
+        model = scheduled(OpenAIChat, provider)(id=model_name, max_retries=0)
     elif provider == "google":
         if not Config().google_api_key:
             raise ValueError("GOOGLE_API_KEY not set. Please set the GOOGLE_API_KEY environment variable.")
-        model = Gemini(id=model_name)
+        # google-genai does not retry generate_content calls itself
+        model = scheduled(Gemini, provider)(id=model_name)
     elif provider == "anthropic":
         if not Config().anthropic_api_key:
             raise ValueError("ANTHROPIC_API_KEY not set. Please set the ANTHROPIC_API_KEY environment variable.")
-        model = Claude(id=model_name)
+        # Claude only reuses cached prompt prefixes up to an explicit breakpoint
+        from agents.layout import CachedClaude
+        model = scheduled(CachedClaude, provider)(id=model_name, client_params={"max_retries": 0})
     elif provider == "groq":
         if not Config().groq_api_key:
             raise ValueError("GROQ_API_KEY not set. Please set the GROQ_API_KEY environment variable.")
-        model = Groq(id=model_name)
+        model = scheduled(Groq, provider)(id=model_name, max_retries=0)
     else:
         raise ValueError(f"Unsupported model provider: {provider}")
     return model
+
+@lru_cache(maxsize=1)
+def _encoding() -> Any:
+    """
+    The cl100k_base tokenizer, or None when tiktoken is missing or its encoding cannot be
+    loaded (it is downloaded on first use).
+    """
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        logger.warning(f"Token counts are estimated at four characters per token: {e}")
+        return None
+
+def exact_token_counts() -> bool:
+    """
+    Whether `count_tokens` uses the tokenizer rather than the four-characters estimate.
+    """
+    return _encoding() is not None
+
+def count_tokens(text: str) -> int:
+    """
+    Count the number of LLM tokens in a piece of text.
+
+    Uses `tiktoken` (cl100k_base) when it is available, otherwise falls back to
+    roughly four characters per token.
+
+    Args:
+        text (str): The text to measure.
+
+    Returns:
+        int: Token count, estimated without the tokenizer.
+    """
+    if not text:
+        return 0
+    encoding = _encoding()
+    if encoding is None:
+        return (len(text) + 3) // 4
+    return len(encoding.encode(text))
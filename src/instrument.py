@@ -0,0 +1,287 @@
+"""
+This module provides lightweight instrumentation for the Data-AI platform's hot paths,
+including stage timers, token and row counters, a JSONL event log, and a
+Prometheus textfile export summarized by the `stats` command.
+"""
+
+import atexit
+import json
+import math
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from inspect import isgenerator
+from os.path import dirname
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from constants import (
+    METRICS_PROM_FILE,
+    STATS_FILE,
+)
+
+_lock = threading.Lock()
+_recorded = False
+
+def record(stage: str, wall: float, **fields: Any) -> Dict[str, Any]:
+    """
+    Append one measurement to the stats log.
+
+    Args:
+        stage (str): Name of the stage, e.g. 'analyze.member' or 'sql.execute'.
+        wall (float): Wall time in seconds.
+        **fields: Extra counters such as prompt_tokens, completion_tokens, rows, bytes.
+
+    Returns:
+        dict: The recorded event.
+    """
+    global _recorded
+    event = {"ts": time.time(), "stage": stage, "wall": round(wall, 6)}
+    event.update({k: v for k, v in fields.items() if v is not None})
+    line = json.dumps(event, default=str)
+    try:
+        with _lock:
+            os.makedirs(dirname(STATS_FILE), exist_ok=True)
+            with open(STATS_FILE, "a") as f:
+                f.write(line + "\n")
+            _recorded = True
+    except OSError:
+        # Instrumentation must never break the command being measured
+        pass
+    return event
+
+@contextmanager
+def timed(stage: str, **fields: Any) -> Iterator[Dict[str, Any]]:
+    """
+    Time a block and record it as a stage.
+
+    The yielded dict can be updated inside the block to add counters:
+
+        with timed("sql.execute", database=name) as span:
+            rows = run()
+            span["rows"] = len(rows)
+    """
+    span: Dict[str, Any] = dict(fields)
+    started = time.perf_counter()
+    try:
+        yield span
+    except Exception as e:
+        span["error"] = type(e).__name__
+        raise
+    finally:
+        record(stage, time.perf_counter() - started, **span)
+
+def run_tokens(run_response: Any) -> Dict[str, int]:
+    """
+    Sum prompt, completion and cached prompt tokens from an agno run response's metrics.
+    """
+    metrics = getattr(run_response, "metrics", None) or {}
+    return {
+        "prompt_tokens": sum(metrics.get("input_tokens", []) or []),
+        "completion_tokens": sum(metrics.get("output_tokens", []) or []),
+        "cached_tokens": sum(metrics.get("cached_tokens", []) or []),
+    }
+
+def record_team_run(run_response: Any, wall: float) -> None:
+    """
+    Record a finished team run: the leader's tokens and one event per member run.
+    """
+    if run_response is None:
+        return
+    record("team.run", wall, model=getattr(run_response, "model", None), **run_tokens(run_response))
+    for member_response in getattr(run_response, "member_responses", None) or []:
+        metrics = getattr(member_response, "metrics", None) or {}
+        record(
+            "member.llm",
+            sum(metrics.get("time", []) or []),
+            member=getattr(member_response, "agent_id", None),
+            model=getattr(member_response, "model", None),
+            **run_tokens(member_response),
+        )
+
+def tool_hook(function_name: str, function_call: Callable, arguments: Dict[str, Any]):
+    """
+    agno tool hook that records how long each tool call takes.
+
+    Generator results (member delegation) are timed until they are exhausted.
+    """
+    started = time.perf_counter()
+    result = function_call(**arguments)
+    if not isgenerator(result):
+        record(f"tool.{function_name}", time.perf_counter() - started)
+        return result
+
+    def timed_chunks():
+        try:
+            yield from result
+        finally:
+            record(f"tool.{function_name}", time.perf_counter() - started, member=arguments.get("member_id"))
+    return timed_chunks()
+
+def load_records(path: str = STATS_FILE) -> List[Dict[str, Any]]:
+    """
+    Read every event from the stats log, skipping malformed lines.
+    """
+    if not os.path.exists(path):
+        return []
+    records = []
+    with open(path) as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+    return records
+
+def _percentile(values: List[float], pct: float) -> float:
+    """
+    Nearest-rank percentile of a list of values.
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    # Multiply before dividing so exact ranks stay exact (7 / 100 * 100 is 7.000000000000001)
+    index = max(0, min(len(ordered) - 1, math.ceil(pct * len(ordered) / 100) - 1))
+    return ordered[index]
+
+def summarize(records: List[Dict[str, Any]], stage_prefix: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Summarize events per stage with p50/p95 wall time and counter totals.
+    """
+    by_stage: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for event in records:
+        if stage_prefix is None or event.get("stage", "").startswith(stage_prefix):
+            by_stage[event.get("stage", "unknown")].append(event)
+
+    summary = []
+    for stage, events in sorted(by_stage.items()):
+        walls = [e.get("wall", 0.0) for e in events]
+        summary.append({
+            "stage": stage,
+            "count": len(events),
+            "p50": _percentile(walls, 50),
+            "p95": _percentile(walls, 95),
+            "total": sum(walls),
+            "prompt_tokens": sum(e.get("prompt_tokens", 0) for e in events),
+            "completion_tokens": sum(e.get("completion_tokens", 0) for e in events),
+            "cached_tokens": sum(e.get("cached_tokens", 0) for e in events),
+            "rows": sum(e.get("rows", 0) for e in events),
+            "bytes": sum(e.get("bytes", 0) for e in events),
+            "errors": sum(1 for e in events if e.get("error")),
+            "rejected": sum(e.get("rejected", 0) for e in events),
+        })
+    return summary
+
+def validation_summary(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Compare queries rejected by local validation with queries that failed on the database.
+
+    `avoided` is the fraction of all failed queries that never reached the database.
+    """
+    checked = [e for e in records if e.get("stage") == "sql.validate"]
+    rejected = sum(e.get("rejected", 0) for e in checked)
+    failed = sum(1 for e in records if e.get("stage") == "sql.execute" and e.get("error"))
+    return {
+        "checked": len(checked),
+        "rejected": rejected,
+        "failed": failed,
+        "avoided": rejected / (rejected + failed) if rejected + failed else 0.0,
+    }
+
+def scheduler_summary(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Summarize scheduled LLM calls per provider/model lane: queue depth, queue wait and retries.
+    """
+    by_lane: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for event in records:
+        if event.get("stage") == "llm.call":
+            by_lane[f"{event.get('provider')}:{event.get('model')}"].append(event)
+
+    summary = []
+    for lane, events in sorted(by_lane.items()):
+        waits = [e.get("wait", 0.0) for e in events]
+        summary.append({
+            "lane": lane,
+            "calls": len(events),
+            "max_queued": max(e.get("queued", 0) for e in events),
+            "wait_p50": _percentile(waits, 50),
+            "wait_p95": _percentile(waits, 95),
+            "retries": sum(e.get("retries", 0) for e in events),
+            "failed": sum(1 for e in events if e.get("error")),
+        })
+    return summary
+
+def cascade_summary(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Summarize model cascades per tier: attempts, how often the tier escalated, and its latency.
+    """
+    by_tier: Dict[tuple, List[Dict[str, Any]]] = defaultdict(list)
+    for event in records:
+        if event.get("stage") == "llm.cascade":
+            by_tier[(event.get("cascade"), event.get("tier", 0), event.get("model"))].append(event)
+
+    summary = []
+    for (cascade, tier, model), events in sorted(by_tier.items()):
+        walls = [e.get("wall", 0.0) for e in events]
+        escalated = sum(e.get("escalated", 0) for e in events)
+        summary.append({
+            "cascade": cascade,
+            "tier": tier,
+            "model": model,
+            "attempts": len(events),
+            "escalated": escalated,
+            "escalation_rate": escalated / len(events),
+            "p50": _percentile(walls, 50),
+            "p95": _percentile(walls, 95),
+        })
+    return summary
+
+def export_prometheus(records: Optional[List[Dict[str, Any]]] = None, path: str = METRICS_PROM_FILE) -> None:
+    """
+    Write per-stage totals in Prometheus textfile format, for node_exporter's textfile collector.
+    """
+    summary = summarize(records if records is not None else load_records())
+    lines = [
+        "# HELP data_ai_stage_seconds Wall time spent per stage.",
+        "# TYPE data_ai_stage_seconds summary",
+    ]
+    for s in summary:
+        label = f'stage="{s["stage"]}"'
+        lines.append(f'data_ai_stage_seconds{{{label},quantile="0.5"}} {s["p50"]:.6f}')
+        lines.append(f'data_ai_stage_seconds{{{label},quantile="0.95"}} {s["p95"]:.6f}')
+        lines.append(f"data_ai_stage_seconds_sum{{{label}}} {s['total']:.6f}")
+        lines.append(f"data_ai_stage_seconds_count{{{label}}} {s['count']}")
+    for counter in ["prompt_tokens", "completion_tokens", "cached_tokens", "rows", "bytes", "errors", "rejected"]:
+        lines.append(f"# TYPE data_ai_{counter}_total counter")
+        for s in summary:
+            lines.append(f'data_ai_{counter}_total{{stage="{s["stage"]}"}} {s[counter]}')
+
+    lanes = scheduler_summary(records if records is not None else load_records())
+    if lanes:
+        lines.append("# TYPE data_ai_llm_queue_depth_max gauge")
+        lines.extend(f'data_ai_llm_queue_depth_max{{lane="{s["lane"]}"}} {s["max_queued"]}' for s in lanes)
+        lines.append("# TYPE data_ai_llm_queue_wait_seconds summary")
+        for s in lanes:
+            lines.append(f'data_ai_llm_queue_wait_seconds{{lane="{s["lane"]}",quantile="0.5"}} {s["wait_p50"]:.6f}')
+            lines.append(f'data_ai_llm_queue_wait_seconds{{lane="{s["lane"]}",quantile="0.95"}} {s["wait_p95"]:.6f}')
+        lines.append("# TYPE data_ai_llm_retries_total counter")
+        lines.extend(f'data_ai_llm_retries_total{{lane="{s["lane"]}"}} {s["retries"]}' for s in lanes)
+
+    os.makedirs(dirname(path), exist_ok=True)
+    # Write atomically so the collector never reads a partial file
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        f.write("\n".join(lines) + "\n")
+    os.replace(tmp_path, path)
+
+@atexit.register
+def _export_on_exit() -> None:
+    """
+    Refresh the Prometheus textfile when this process recorded anything.
+    """
+    if _recorded:
+        try:
+            export_prometheus()
+        except OSError:
+            pass
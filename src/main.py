@@ -1,4 +1,6 @@
 import os
+import time
+from typing import List
 from os.path import join, dirname
 from config import Config
 
@@ -17,11 +19,19 @@ from helper import (
     supported_driver,
 )
 from agno.utils.log import logger
-from agents.knowledge import (
-    process_database, 
-    drop_member_knowledge,
-    get_table_semantic,
+from instrument import (
+    load_records,
+    summarize,
+    validation_summary,
+    scheduler_summary,
+    cascade_summary,
+    export_prometheus,
+    record_team_run,
+    timed,
 )
+from tools.joins import JoinGraph
+from constants import BATCH_CONCURRENCY, ONBOARD_CONCURRENCY, ONBOARD_DB_CONCURRENCY, SERVE_HOST, SERVE_PORT, SERVE_TEAMS
+from agents.knowledge import drop_member_knowledge
 
 logger.setLevel(Config().app_config.log_level)
 
@@ -35,24 +45,52 @@ def delete(name: str):
     with_spinner(f"Delete agent: {name}", delete)
 
 @app.command()
-def add(uri: str, name: str = typer.Option(None)):
+def add(
+    uri: str,
+    name: str = typer.Option(None),
+    statement_timeout: float = typer.Option(None, help="Server-side timeout in seconds for agent queries on this database"),
+    profile: bool = typer.Option(False, help="Store column statistics (distinct counts, ranges, common values) in the knowledge base"),
+    schemas: str = typer.Option(None, help="PostgreSQL: comma-separated schema patterns to introspect, e.g. 'public,sales_*' (default: public)"),
+    exclude_schemas: str = typer.Option(None, help="PostgreSQL: comma-separated schema patterns to skip"),
+    background: bool = typer.Option(False, help="Queue the database for a background worker and return immediately"),
+):
+    """
+    Register a database: introspect it, analyze it and load its knowledge.
+
+    The work runs as a job whose stages are checkpointed; if a stage fails, the completed
+    ones are kept and `jobs --retry` resumes from the failed stage.
+    """
     from sqlalchemy import create_engine
+    from agents.jobs import process_job, spawn_worker
     try:
         engine = create_engine(url=uri)
         if supported_driver(driver=engine.driver) == True:
             name = name or gen_hash_name()
-            meta_data = None
-            def analyze_db():
-                nonlocal meta_data
-                process_database(name=name, uri=uri)
-                meta_data = get_table_semantic(uri=uri)
-            with_spinner("Analyze & load database knowledge", analyze_db)
-            StoreDb().app_store.create({
-                "name": name,
-                "uri": uri,
-                "driver": engine.driver,
-                "meta_data": meta_data,
-            })
+            options = {}
+            if statement_timeout is not None:
+                options["statement_timeout"] = statement_timeout
+            if schemas:
+                options["include_schemas"] = [p.strip() for p in schemas.split(",") if p.strip()]
+            if exclude_schemas:
+                options["exclude_schemas"] = [p.strip() for p in exclude_schemas.split(",") if p.strip()]
+            job_store = StoreDb().job_store
+            job_id = job_store.enqueue(name=name, uri=uri, profile=profile, options=options)
+            if background:
+                pid = spawn_worker()
+                typer.echo(f"Queued job {job_id} for {name}; worker {pid} is processing it. Follow it with `data-ai jobs`.")
+                return
+            job = job_store.claim(job_id)
+            with timed("add", driver=engine.driver):
+                completed = with_spinner(
+                    "Analyze & load database knowledge",
+                    lambda: process_job(job, job_store, retry=False),
+                )
+            if not completed:
+                typer.echo(
+                    f"ERROR: {job_store.get(job_id).error}\n"
+                    f"Completed stages are kept; resume with `data-ai jobs --retry {job_id}`."
+                )
+                return
             console = Console()
             table = Table(show_lines=True)
             table.add_column("Name", style="cyan")
@@ -65,6 +103,267 @@ def add(uri: str, name: str = typer.Option(None)):
     except Exception as e:
         typer.echo(f"ERROR: {e}")
 
+@app.command()
+def worker(
+    wait: bool = typer.Option(False, help="Keep polling for new jobs instead of exiting when the queue is empty"),
+):
+    """
+    Process queued indexing jobs, e.g. those queued by `add --background`.
+
+    Failed jobs are queued again and resume after their last completed stage,
+    up to `JOB_MAX_ATTEMPTS` attempts.
+    """
+    from agents.jobs import work
+
+    def report(job, completed):
+        status = "done" if completed else f"failed: {StoreDb().job_store.get(job.id).error}"
+        typer.echo(f"Job {job.id} ({job.name}) {status}")
+
+    processed = work(exit_when_idle=not wait, on_job=report)
+    typer.echo(f"Processed {processed} job(s).")
+
+@app.command()
+def jobs(
+    retry: int = typer.Option(None, help="Queue a failed job again in a background worker; it resumes after its last completed stage"),
+):
+    """
+    Show background indexing jobs: status, stage reached, attempts and errors.
+    """
+    from agents.jobs import JOB_STAGES, spawn_worker
+    job_store = StoreDb().job_store
+    if retry is not None:
+        if not job_store.retry(retry):
+            typer.echo(f"Job {retry} is not a failed job.")
+            return
+        pid = spawn_worker()
+        typer.echo(f"Queued job {retry} again; worker {pid} is processing it.")
+        return
+
+    job_store.requeue_orphans()
+    console = Console()
+    table = Table()
+    table.add_column("ID", style="cyan")
+    table.add_column("Name", style="magenta")
+    table.add_column("Status")
+    table.add_column("Stage")
+    table.add_column("Attempts", justify="right")
+    table.add_column("Updated")
+    table.add_column("Error", style="red")
+    colors = {"done": "green", "failed": "red", "running": "yellow", "queued": "blue"}
+    for job in job_store.get_all():
+        completed = JOB_STAGES.index(job.stage) + 1 if job.stage in JOB_STAGES else 0
+        stage = job.current if job.status == "running" else job.stage or "-"
+        table.add_row(
+            str(job.id),
+            job.name,
+            f"[{colors.get(job.status, 'white')}]{job.status}[/]",
+            f"{stage} ({completed}/{len(JOB_STAGES)})",
+            str(job.attempts),
+            time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(job.updated_at)),
+            job.error,
+        )
+    console.print(table)
+
+@app.command()
+def reindex(
+    names: List[str] = typer.Argument(None, help="Databases to re-index (default: those whose schema changed since they were indexed)"),
+    profile: bool = typer.Option(False, help="Also recompute column statistics of re-analyzed databases"),
+    background: bool = typer.Option(False, help="Re-analyze changed databases in a background worker and return immediately"),
+):
+    """
+    Refresh the knowledge of databases whose schema changed since they were indexed.
+
+    Each database's catalog is compared with its stored snapshot, table by table. If no table's
+    structure changed, the snapshot is refreshed without LLM calls; otherwise the snapshot is
+    refreshed and the database is re-analyzed by an indexing job.
+    """
+    from agents.drift import check_drift, reindex as reindex_database
+    from agents.jobs import process_job, spawn_worker
+    store = StoreDb()
+    entries = store.app_store.get_all()
+    if names:
+        unknown = set(names) - {entry.name for entry in entries}
+        if unknown:
+            typer.echo(f"Unknown database(s): {', '.join(sorted(unknown))}")
+            return
+        entries = [entry for entry in entries if entry.name in names]
+    else:
+        drifted = {drift.name for drift in check_drift(entries)}
+        entries = [entry for entry in entries if entry.name in drifted]
+        if not entries:
+            typer.echo("No database schema changed since it was indexed.")
+            return
+
+    queued = []
+    for entry in entries:
+        try:
+            result = with_spinner(f"Compare {entry.name} with its snapshot", lambda: reindex_database(entry, profile=profile))
+        except Exception as e:
+            typer.echo(f"ERROR: {entry.name}: {e}")
+            continue
+        if result.job_id is None:
+            typer.echo(f"{entry.name}: no table structure changed; snapshot refreshed.")
+            continue
+        for change, tables in result.changes.items():
+            if tables:
+                typer.echo(f"{entry.name}: tables {change}: {', '.join(tables)}")
+        queued.append(result.job_id)
+
+    if queued and background:
+        pid = spawn_worker()
+        typer.echo(f"Queued job(s) {', '.join(map(str, queued))}; worker {pid} is processing them. Follow them with `data-ai jobs`.")
+        return
+    job_store = store.job_store
+    for job_id in queued:
+        job = job_store.claim(job_id)
+        completed = with_spinner(f"Re-analyze {job.name}", lambda: process_job(job, job_store, retry=False))
+        if not completed:
+            typer.echo(
+                f"ERROR: {job.name}: {job_store.get(job_id).error}\n"
+                f"Completed stages are kept; resume with `data-ai jobs --retry {job_id}`."
+            )
+
+@app.command("add-many")
+def add_many(
+    manifest: str,
+    concurrency: int = typer.Option(ONBOARD_CONCURRENCY, help="Number of databases introspected and analyzed at the same time"),
+    db_concurrency: int = typer.Option(ONBOARD_DB_CONCURRENCY, help="Number of analyzer stages run at the same time for one database"),
+    report: str = typer.Option(None, help="Write the failed databases and their errors to this JSON file"),
+):
+    """
+    Register every database of a YAML manifest, concurrently.
+
+    Each database is stored as soon as it is analyzed; failures are reported at the
+    end instead of aborting the others. Databases whose URI is already registered are skipped.
+
+    Command:
+        python src/main.py add-many fleet.yaml --concurrency 8 --report failures.json
+    """
+    import json
+    import threading
+    from rich.live import Live
+    from agents.manifest import load_manifest, register_many
+    try:
+        entries = load_manifest(manifest)
+        store = StoreDb().app_store
+        registered = {db.uri for db in store.get_all()}
+        skipped = [entry.name for entry in entries if entry.uri in registered]
+        entries = [entry for entry in entries if entry.uri not in registered]
+        if skipped:
+            typer.echo(f"Skipping {len(skipped)} database(s) already registered: {', '.join(skipped)}")
+        if not entries:
+            typer.echo("No databases to add.")
+            return
+
+        states = {}
+        lock = threading.Lock()
+
+        def render() -> Table:
+            table = Table()
+            table.add_column("Name", style="cyan")
+            table.add_column("Stage")
+            table.add_column("Elapsed (s)", justify="right")
+            now = time.perf_counter()
+            with lock:
+                rows = [states[entry.name] for entry in entries if entry.name in states]
+            for state in rows:
+                stage = {"done": "[green]done[/green]", "failed": "[red]failed[/red]"}.get(state.stage, state.stage)
+                elapsed = state.wall if state.wall is not None else (now - state.started if state.started else 0.0)
+                table.add_row(state.name, stage, f"{elapsed:.1f}")
+            return table
+
+        def on_progress(state):
+            with lock:
+                states[state.name] = state
+
+        started = time.perf_counter()
+        with Live(render(), get_renderable=render, refresh_per_second=4, transient=False):
+            results = register_many(
+                entries,
+                concurrency=concurrency,
+                db_concurrency=db_concurrency,
+                on_progress=on_progress,
+                # Runs on this thread: the store's SQLite connection belongs to it
+                on_registered=store.create,
+            )
+
+        failed = [state for state in results if state.error]
+        typer.echo(
+            f"Added {len(results) - len(failed)} of {len(results)} database(s) in {time.perf_counter() - started:.1f}s"
+            + (f"; {len(failed)} failed" if failed else "")
+        )
+        if failed:
+            console = Console()
+            table = Table(title="Failed databases", show_lines=True)
+            table.add_column("Name", style="cyan")
+            table.add_column("Error", style="red")
+            for state in failed:
+                table.add_row(state.name, state.error)
+            console.print(table)
+        if report:
+            with open(report, "w") as f:
+                json.dump([{"name": state.name, "error": state.error, "wall": state.wall} for state in failed], f, indent=2)
+    except Exception as e:
+        typer.echo(f"ERROR: {e}")
+
+@app.command()
+def export(
+    name: str,
+    output: str = typer.Option(None, help="Bundle file to write (default: <name>.bundle.zip)"),
+):
+    """
+    Export a registered database with its semantic model, schema snapshot and knowledge
+    vectors as a bundle that `import` loads on another machine without LLM calls.
+    Credentials are left out of the bundle.
+    """
+    from agents.bundle import export_bundle
+    output = output or f"{name}.bundle.zip"
+    try:
+        bundle = with_spinner(f"Export {name}", lambda: export_bundle(name=name, path=output))
+    except Exception as e:
+        typer.echo(f"ERROR: {e}")
+        return
+    typer.echo(f"Exported {name} ({len(bundle.documents)} document(s), {os.path.getsize(output) / 2**10:.0f} KiB) to {output}")
+
+@app.command("import")
+def import_(
+    bundle: str,
+    uri: str = typer.Option(None, help="Connection URI with credentials (default: the bundle's URI)"),
+    username: str = typer.Option(None, help="User name to add to the bundle's URI"),
+    password: str = typer.Option(None, help="Password to add to the bundle's URI"),
+    name: str = typer.Option(None, help="Register the database under another name"),
+    verify: bool = typer.Option(False, help="Introspect the database and report tables changed since the export"),
+):
+    """
+    Register a database from a bundle written by `export`, loading its semantic model
+    and knowledge vectors as they are: no LLM or embedding calls are made.
+    """
+    from agents.bundle import import_bundle, read_bundle, schema_drift, with_credentials
+    from agents.knowledge import get_schema_json
+    from sqlalchemy import create_engine
+    try:
+        loaded = read_bundle(bundle)
+        uri = uri or with_credentials(loaded.database["uri"], username=username, password=password)
+        count = import_bundle(loaded, uri=uri, name=name)
+    except Exception as e:
+        typer.echo(f"ERROR: {e}")
+        return
+    exported = time.strftime("%Y-%m-%d %H:%M", time.localtime(loaded.created_at))
+    typer.echo(f"Imported {name or loaded.database['name']} ({count} document(s)) from a bundle exported on {exported}")
+
+    if verify and loaded.fingerprints:
+        try:
+            schema = get_schema_json(engine=create_engine(url=uri), options=loaded.database.get("options"))
+        except Exception as e:
+            typer.echo(f"Could not verify the schema: {e}")
+            return
+        drift = schema_drift(loaded, schema)
+        if not any(drift.values()):
+            typer.echo("The schema matches the bundle's snapshot.")
+        for change, tables in drift.items():
+            if tables:
+                typer.echo(f"Tables {change} since the export: {', '.join(tables)}")
+
 @app.command()
 def list():
     console = Console()
@@ -83,7 +382,7 @@ def list():
     console.print(table)
 
 @app.command()
-def chat(work_mode: str = "route", show_member_response: bool = False):
+def chat(work_mode: str = "route", show_member_response: bool = False, stream: bool = False):
     """
     Start a team-based conversation with AI agents that represent different databases.
 
@@ -91,9 +390,13 @@ def chat(work_mode: str = "route", show_member_response: bool = False):
     - work_mode (str): Select team behavior mode. Options:
         - "route": Only one best-matched agent will respond to the user's question.
         - "coordinate": Multiple agents will contribute to the final answer by reasoning together. This mode allows collaborative problem solving when information is distributed across agents.
+          Independent member tasks are dispatched concurrently (see `MEMBER_TIMEOUT_SECONDS` and `MAX_PARALLEL_MEMBERS`), and per-member timings are reported.
 
     - show_member_response (bool): If True, shows each agent's individual response before the final synthesized output.
 
+    - stream (bool): If True, prints leader tokens and tool-call events as they arrive instead of waiting
+      for the full answer. Combined with `--show-member-response`, member tokens are streamed with attribution.
+
     Example:
         To answer a question like "Get recent transactions for user ID 5" where:
         - MySQL agent holds user and order tables
@@ -103,18 +406,271 @@ def chat(work_mode: str = "route", show_member_response: bool = False):
         - MySQL agent to return order_ids for user_id=5
         - Postgres agent to use those order_ids to find relevant transactions
 
+        For larger result sets, the leader or Analyst Agent loads both results into a local
+        in-memory engine (`load_query_result`) and joins them there (`run_local_query`),
+        so only the final aggregate goes through the model.
+
     Command:
-        python src/main.py chat --work-mode coordinate --show-member-response
+        python src/main.py chat --work-mode coordinate --show-member-response --stream
     """
     from agents.team import get_data_team
+    from agents.stream import StreamPrinter
+    from rich.prompt import Prompt
     try:
-        get_data_team(
+        team = get_data_team(
             work_style=work_mode,
             show_member_response=show_member_response,
-        ).cli_app()
+        )
+        console = Console()
+        printer = StreamPrinter(team, show_member_response=show_member_response, console=console) if stream else None
+        while True:
+            message = Prompt.ask("[bold] :sunglasses: User [/bold]")
+            if message in ["exit", "quit", "bye"]:
+                break
+            started = time.perf_counter()
+            try:
+                if printer is not None:
+                    printer.print_response(message=message)
+                else:
+                    team.print_response(message=message)
+            except KeyboardInterrupt:
+                # Running queries were already cancelled on the server; go back to the prompt
+                console.print("\n[yellow]Cancelled.[/yellow]")
+                continue
+            record_team_run(team.run_response, time.perf_counter() - started)
+
+            # Report prompt size for the turn so history growth stays visible
+            reports = team.memory.get_turn_reports(team.session_id)
+            if reports:
+                report = reports[-1]
+                console.print(
+                    f"[dim]Turn {report['run']}: {report['prompt_tokens']} prompt tokens "
+                    f"({report['history_tokens']} from history), {report['completion_tokens']} completion tokens[/dim]"
+                )
+    except Exception as e:
+        typer.echo(f"ERROR: {e}")
+
+@app.command()
+def ask(
+    input: str = typer.Option(..., help="JSONL file of questions: strings, or objects with 'question' and optional 'id'"),
+    output: str = typer.Option(..., help="JSONL file answers are appended to as they finish"),
+    concurrency: int = typer.Option(BATCH_CONCURRENCY, help="Number of questions answered at the same time"),
+    work_mode: str = "route",
+):
+    """
+    Answer a file of questions without the interactive chat, e.g. for nightly question suites.
+
+    Each question runs in its own session. Answers are written with their latency and
+    token usage, and per-question timings are recorded under the `batch.question` stage.
+
+    Command:
+        python src/main.py ask --input questions.jsonl --output answers.jsonl --concurrency 8
+    """
+    from agents.team import get_data_team
+    from agents.batch import load_questions, run_batch
+    try:
+        questions = load_questions(input)
+        if not questions:
+            typer.echo("No questions to answer.")
+            return
+        console = Console()
+        done = 0
+
+        def progress(result):
+            nonlocal done
+            done += 1
+            status = "[red]failed[/red]" if result.get("error") else "[green]ok[/green]"
+            console.print(f"[{done}/{len(questions)}] {result['id']} {status} in {result['latency']:.1f}s")
+
+        started = time.perf_counter()
+        # agno teams keep per-run state, so each concurrent question gets its own team
+        workers = max(1, min(concurrency, len(questions)))
+        teams = with_spinner(
+            f"Build {workers} data team(s)",
+            # Schema drift is checked once, not for every team
+            lambda: [get_data_team(work_style=work_mode, check_drift=index == 0) for index in range(workers)],
+        )
+        results = run_batch(questions, output=output, teams=teams, on_result=progress)
+        failed = sum(1 for result in results if result.get("error"))
+        console.print(
+            f"Answered {len(results) - failed} of {len(questions)} questions ({failed} failed) in "
+            f"{time.perf_counter() - started:.1f}s; {sum(r.get('prompt_tokens', 0) for r in results)} prompt and "
+            f"{sum(r.get('completion_tokens', 0) for r in results)} completion tokens. Answers: {output}"
+        )
+    except Exception as e:
+        typer.echo(f"ERROR: {e}")
+
+@app.command()
+def serve(
+    host: str = typer.Option(SERVE_HOST, help="Address to listen on"),
+    port: int = typer.Option(SERVE_PORT, help="Port to listen on"),
+    socket: str = typer.Option(None, help="Listen on this Unix socket instead of host and port"),
+    teams: int = typer.Option(SERVE_TEAMS, help="Number of warm data teams; sessions on different teams run concurrently"),
+    work_mode: str = "route",
+):
+    """
+    Serve the data team over local HTTP so agents, engines and knowledge bases stay warm between questions.
+
+    Conversations are keyed by user and session ID. Connect with the thin client:
+
+    Command:
+        python src/main.py serve --teams 4
+        python src/client.py --user alice --session weekly-report
+    """
+    import uvicorn
+    from agents.team import get_data_team
+    from server import TeamPool, create_app
+    try:
+        pool = TeamPool(with_spinner(
+            f"Build {max(1, teams)} data team(s)",
+            lambda: [get_data_team(work_style=work_mode, check_drift=index == 0) for index in range(max(1, teams))],
+        ))
+        typer.echo(f"Serving {len(pool.teams)} data team(s) on {socket or f'http://{host}:{port}'}")
+        uvicorn.run(create_app(pool), host=host, port=port, uds=socket, log_level="warning")
     except Exception as e:
         typer.echo(f"ERROR: {e}")
 
+@app.command()
+def gc(
+    dry_run: bool = typer.Option(False, help="Only report what would be deleted"),
+):
+    """
+    Garbage-collect the knowledge store: drop the knowledge of deleted databases and
+    superseded documents, compact the vector indexes, and report the disk space
+    reclaimed and search latency before and after.
+
+    Chroma collections are rebuilt, so stop `serve` and running workers first.
+    """
+    from store.gc import collect_garbage
+    store = StoreDb()
+    # Knowledge of databases still being indexed is kept too
+    agents = {agent_name(entry.name) for entry in store.app_store.get_all()}
+    agents |= {agent_name(job.name) for job in store.job_store.get_all() if job.status != "done"}
+    report = with_spinner("Collecting garbage", lambda: collect_garbage(agents=agents, dry_run=dry_run))
+
+    console = Console()
+    table = Table(title="Knowledge store garbage collection" + (" (dry run)" if dry_run else ""))
+    table.add_column("", style="cyan")
+    table.add_column("Before", justify="right")
+    table.add_column("After", justify="right")
+    table.add_column("Change", justify="right", style="green")
+    table.add_row(
+        "Disk usage",
+        f"{report.bytes_before / 2**20:.1f} MiB",
+        f"{report.bytes_after / 2**20:.1f} MiB",
+        f"{(report.bytes_after - report.bytes_before) / 2**20:+.1f} MiB",
+    )
+    table.add_row(
+        f"Search p50 ({report.searches} searches)",
+        f"{report.search_before * 1000:.2f} ms",
+        f"{report.search_after * 1000:.2f} ms",
+        f"{(report.search_after - report.search_before) * 1000:+.2f} ms",
+    )
+    console.print(table)
+    action = "Would delete" if dry_run else "Deleted"
+    console.print(
+        f"{action} {len(report.dropped_collections)} collection(s) of deleted databases, "
+        f"{report.orphans} orphaned and {report.duplicates} superseded document(s)."
+    )
+    for collection in report.dropped_collections:
+        console.print(f"  - {collection}")
+    if report.unattributed:
+        console.print(
+            f"Kept {report.unattributed} team document(s) stored before team documents named their agent, since "
+            f"{', '.join(report.without_team_document)} have no current team document; they are deleted once "
+            "these databases are analyzed again."
+        )
+
+@app.command()
+def stats(stage: str = typer.Option(None, help="Only show stages starting with this prefix")):
+    """
+    Summarize recorded latency, token and row counts per stage (p50/p95 wall time),
+    and refresh the Prometheus textfile export.
+    """
+    records = load_records()
+    if not records:
+        typer.echo("No stats recorded yet.")
+        return
+    export_prometheus(records)
+
+    console = Console()
+    table = Table()
+    table.add_column("Stage", style="cyan")
+    table.add_column("Count", justify="right")
+    table.add_column("p50 (s)", justify="right", style="green")
+    table.add_column("p95 (s)", justify="right", style="yellow")
+    table.add_column("Prompt tok", justify="right")
+    table.add_column("Completion tok", justify="right")
+    table.add_column("Cached tok", justify="right")
+    table.add_column("Rows", justify="right")
+    table.add_column("Bytes", justify="right")
+    table.add_column("Errors", justify="right", style="red")
+    for row in summarize(records, stage_prefix=stage):
+        table.add_row(
+            row["stage"],
+            str(row["count"]),
+            f"{row['p50']:.3f}",
+            f"{row['p95']:.3f}",
+            str(row["prompt_tokens"]),
+            str(row["completion_tokens"]),
+            str(row["cached_tokens"]),
+            str(row["rows"]),
+            str(row["bytes"]),
+            str(row["errors"]),
+        )
+    console.print(table)
+
+    validation = validation_summary(records)
+    if validation["checked"]:
+        console.print(
+            f"Validation rejected {validation['rejected']} of {validation['checked']} queries before execution; "
+            f"{validation['failed']} failed on the database ({validation['avoided']:.0%} of failed executions avoided)."
+        )
+
+    lanes = scheduler_summary(records)
+    if lanes:
+        table = Table(title="LLM scheduler")
+        table.add_column("Lane", style="cyan")
+        table.add_column("Calls", justify="right")
+        table.add_column("Max queued", justify="right")
+        table.add_column("Wait p50 (s)", justify="right", style="green")
+        table.add_column("Wait p95 (s)", justify="right", style="yellow")
+        table.add_column("Retries", justify="right")
+        table.add_column("Failed", justify="right", style="red")
+        for row in lanes:
+            table.add_row(
+                row["lane"],
+                str(row["calls"]),
+                str(row["max_queued"]),
+                f"{row['wait_p50']:.3f}",
+                f"{row['wait_p95']:.3f}",
+                str(row["retries"]),
+                str(row["failed"]),
+            )
+        console.print(table)
+
+    tiers = cascade_summary(records)
+    if tiers:
+        table = Table(title="Model cascades")
+        table.add_column("Cascade", style="cyan")
+        table.add_column("Tier", justify="right")
+        table.add_column("Model")
+        table.add_column("Attempts", justify="right")
+        table.add_column("Escalated", justify="right", style="red")
+        table.add_column("p50 (s)", justify="right", style="green")
+        table.add_column("p95 (s)", justify="right", style="yellow")
+        for row in tiers:
+            table.add_row(
+                row["cascade"],
+                str(row["tier"]),
+                row["model"],
+                str(row["attempts"]),
+                f"{row['escalated']} ({row['escalation_rate']:.0%})",
+                f"{row['p50']:.3f}",
+                f"{row['p95']:.3f}",
+            )
+        console.print(table)
+
 def main():
     app()
 
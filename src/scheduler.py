@@ -0,0 +1,392 @@
+"""
+This module schedules LLM calls across providers so parallel `add` runs, batch
+questions and server sessions stay within provider rate limits.
+
+Calls are grouped into lanes keyed by 'provider:model'. Each lane has token
+buckets for requests and tokens per minute and a bounded concurrency pool;
+calls rejected with 429 or 5xx are retried with jittered exponential backoff.
+Every call records its queue depth, queue wait and retries under the `llm.call`
+stage. Models returned by `get_model()` are routed through the shared scheduler.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Type
+
+from agno.models.base import Model
+from agno.utils.log import logger
+
+from config import Config
+from constants import (
+    LLM_BACKOFF_BASE_SECONDS,
+    LLM_BACKOFF_MAX_SECONDS,
+    LLM_DEFAULT_CONCURRENCY,
+    LLM_DEFAULT_RPM,
+    LLM_DEFAULT_TPM,
+    LLM_MAX_RETRIES,
+)
+from helper import count_tokens
+from instrument import record
+
+@dataclass
+class Limits:
+    """
+    Rate limits of one provider/model lane.
+
+    Attributes:
+        rpm (float): Requests per minute; 0 disables the limit.
+        tpm (float): Tokens per minute (estimated prompt tokens); 0 disables the limit.
+        concurrency (int): Maximum calls in flight.
+    """
+    rpm: float = LLM_DEFAULT_RPM
+    tpm: float = LLM_DEFAULT_TPM
+    concurrency: int = LLM_DEFAULT_CONCURRENCY
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously, holding at most one second's allowance.
+
+    Providers enforce per-minute limits over shorter windows, so bursts are capped
+    at a second's worth. Reservations larger than the available tokens drive the
+    bucket negative, so callers wait in arrival order and a single large request
+    is never starved.
+    """
+
+    def __init__(self, per_minute: float, clock: Callable[[], float] = time.monotonic):
+        self.rate = per_minute / 60.0
+        self.capacity = max(1.0, self.rate) if per_minute > 0 else 0.0
+        self.tokens = self.capacity
+        self.clock = clock
+        self.updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        """
+        Take `amount` tokens and return the seconds to wait before using them.
+        """
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = self.clock()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= amount
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+class Lane:
+    """
+    Limits and counters of one provider/model.
+
+    Attributes:
+        key (str): 'provider:model'.
+        limits (Limits): The lane's limits.
+        queued (int): Calls waiting for a concurrency slot.
+        in_flight (int): Calls currently running.
+    """
+
+    def __init__(self, key: str, limits: Limits, clock: Callable[[], float] = time.monotonic):
+        self.key = key
+        self.limits = limits
+        self.requests = TokenBucket(limits.rpm, clock)
+        self.tokens = TokenBucket(limits.tpm, clock)
+        self.slots = threading.BoundedSemaphore(max(1, limits.concurrency))
+        self.queued = 0
+        self.in_flight = 0
+        self._lock = threading.Lock()
+
+    def enter(self) -> int:
+        """Count a call joining the queue; returns the queue depth it found."""
+        with self._lock:
+            self.queued += 1
+            return self.queued - 1
+
+    def start(self) -> None:
+        """Move a call from the queue to in flight."""
+        with self._lock:
+            self.queued -= 1
+            self.in_flight += 1
+
+    def finish(self) -> None:
+        """Count a call leaving the lane."""
+        with self._lock:
+            self.in_flight -= 1
+
+def is_retryable(error: Exception) -> bool:
+    """
+    Whether a provider error is a rate limit (429) or a server error (5xx).
+    """
+    status = getattr(error, "status_code", None)
+    return isinstance(status, int) and (status == 429 or status >= 500)
+
+class Scheduler:
+    """
+    Routes LLM calls through per-lane rate limits, concurrency slots and retries.
+
+    Attributes:
+        limits (Dict[str, Limits]): Limits per 'provider:model' or per 'provider'; other lanes use the defaults.
+        max_retries (int): Retries after a 429 or 5xx before the error is raised.
+        backoff_base (float): First backoff in seconds, doubled on every retry.
+        backoff_max (float): Upper bound of a single backoff.
+    """
+
+    def __init__(
+        self,
+        limits: Optional[Dict[str, Limits]] = None,
+        max_retries: int = LLM_MAX_RETRIES,
+        backoff_base: float = LLM_BACKOFF_BASE_SECONDS,
+        backoff_max: float = LLM_BACKOFF_MAX_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.limits = limits or {}
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.clock = clock
+        self.sleep = sleep
+        self.lanes: Dict[str, Lane] = {}
+        self._lock = threading.Lock()
+
+    def lane(self, key: str) -> Lane:
+        """
+        Return the lane for 'provider:model', created with its configured limits on first use.
+        """
+        with self._lock:
+            if key not in self.lanes:
+                limits = self.limits.get(key) or self.limits.get(key.split(":", 1)[0]) or Limits()
+                self.lanes[key] = Lane(key, limits, self.clock)
+            return self.lanes[key]
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Jittered exponential backoff before retry `attempt` (0-based).
+        """
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def _admit(self, lane: Lane, tokens: float) -> float:
+        """
+        Wait for a concurrency slot and the lane's rate limits; returns the seconds waited.
+        """
+        started = self.clock()
+        lane.slots.acquire()
+        lane.start()
+        wait = max(lane.requests.reserve(1), lane.tokens.reserve(tokens))
+        if wait > 0:
+            self.sleep(wait)
+        return self.clock() - started
+
+    def call(self, key: str, fn: Callable[[], Any], tokens: float = 0) -> Any:
+        """
+        Run one provider call within the lane's limits, retrying 429 and 5xx errors.
+
+        Args:
+            key (str): Lane key, 'provider:model'.
+            fn (Callable): The provider call.
+            tokens (float): Estimated tokens the call consumes.
+        """
+        lane = self.lane(key)
+        depth = lane.enter()
+        waited, attempt, started = 0.0, 0, self.clock()
+        while True:
+            waited += self._admit(lane, tokens)
+            try:
+                result = fn()
+            except Exception as e:
+                lane.finish()
+                lane.slots.release()
+                if not is_retryable(e) or attempt >= self.max_retries:
+                    self._record(key, started, depth, waited, attempt, error=type(e).__name__, status=getattr(e, "status_code", None))
+                    raise
+                delay = self.backoff(attempt)
+                logger.warning(f"{key}: provider returned {getattr(e, 'status_code', '?')}, retrying in {delay:.1f}s")
+                attempt += 1
+                lane.enter()
+                self.sleep(delay)
+                continue
+            lane.finish()
+            lane.slots.release()
+            self._record(key, started, depth, waited, attempt)
+            return result
+
+    def stream(self, key: str, fn: Callable[[], Iterator[Any]], tokens: float = 0) -> Iterator[Any]:
+        """
+        Run a streaming provider call within the lane's limits.
+
+        The call is retried only when it fails before the first chunk; the
+        concurrency slot is held until the stream is exhausted or closed.
+        """
+        lane = self.lane(key)
+        depth = lane.enter()
+        waited, attempt, started = 0.0, 0, self.clock()
+        while True:
+            waited += self._admit(lane, tokens)
+            chunks = 0
+            try:
+                for chunk in fn():
+                    chunks += 1
+                    yield chunk
+            except Exception as e:
+                lane.finish()
+                lane.slots.release()
+                if chunks or not is_retryable(e) or attempt >= self.max_retries:
+                    self._record(key, started, depth, waited, attempt, error=type(e).__name__, status=getattr(e, "status_code", None))
+                    raise
+                delay = self.backoff(attempt)
+                logger.warning(f"{key}: provider returned {getattr(e, 'status_code', '?')}, retrying in {delay:.1f}s")
+                attempt += 1
+                lane.enter()
+                self.sleep(delay)
+                continue
+            except GeneratorExit:
+                lane.finish()
+                lane.slots.release()
+                raise
+            lane.finish()
+            lane.slots.release()
+            self._record(key, started, depth, waited, attempt)
+            return
+
+    async def acall(self, key: str, fn: Callable[[], Any], tokens: float = 0) -> Any:
+        """
+        Async variant of `call`: waits without blocking the event loop.
+        """
+        lane = self.lane(key)
+        depth = lane.enter()
+        waited, attempt, started = 0.0, 0, self.clock()
+        while True:
+            waited += await asyncio.to_thread(self._admit, lane, tokens)
+            try:
+                result = await fn()
+            except Exception as e:
+                lane.finish()
+                lane.slots.release()
+                if not is_retryable(e) or attempt >= self.max_retries:
+                    self._record(key, started, depth, waited, attempt, error=type(e).__name__, status=getattr(e, "status_code", None))
+                    raise
+                delay = self.backoff(attempt)
+                attempt += 1
+                lane.enter()
+                await asyncio.sleep(delay)
+                continue
+            lane.finish()
+            lane.slots.release()
+            self._record(key, started, depth, waited, attempt)
+            return result
+
+    async def astream(self, key: str, fn: Callable[[], AsyncIterator[Any]], tokens: float = 0) -> AsyncIterator[Any]:
+        """
+        Async variant of `stream`.
+        """
+        lane = self.lane(key)
+        depth = lane.enter()
+        waited, attempt, started = 0.0, 0, self.clock()
+        while True:
+            waited += await asyncio.to_thread(self._admit, lane, tokens)
+            chunks = 0
+            try:
+                async for chunk in fn():
+                    chunks += 1
+                    yield chunk
+            except Exception as e:
+                lane.finish()
+                lane.slots.release()
+                if chunks or not is_retryable(e) or attempt >= self.max_retries:
+                    self._record(key, started, depth, waited, attempt, error=type(e).__name__, status=getattr(e, "status_code", None))
+                    raise
+                delay = self.backoff(attempt)
+                attempt += 1
+                lane.enter()
+                await asyncio.sleep(delay)
+                continue
+            except GeneratorExit:
+                lane.finish()
+                lane.slots.release()
+                raise
+            lane.finish()
+            lane.slots.release()
+            self._record(key, started, depth, waited, attempt)
+            return
+
+    def _record(self, key: str, started: float, depth: int, waited: float, retries: int, **fields: Any) -> None:
+        """
+        Record one scheduled call: queue depth found on arrival, seconds waited for slots and limits, retries.
+        """
+        provider, _, model = key.partition(":")
+        record(
+            "llm.call",
+            self.clock() - started,
+            provider=provider,
+            model=model,
+            queued=depth,
+            wait=round(waited, 6),
+            retries=retries,
+            **fields,
+        )
+
+_scheduler: Optional[Scheduler] = None
+_scheduler_lock = threading.Lock()
+
+def get_scheduler() -> Scheduler:
+    """
+    Return the process-wide scheduler, configured from `DATA_AI_RATE_LIMITS` on first use.
+    """
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            limits = {
+                key: Limits(
+                    rpm=float(value.get("rpm", LLM_DEFAULT_RPM)),
+                    tpm=float(value.get("tpm", LLM_DEFAULT_TPM)),
+                    concurrency=int(value.get("concurrency", LLM_DEFAULT_CONCURRENCY)),
+                )
+                for key, value in Config().app_config.rate_limits.items()
+            }
+            _scheduler = Scheduler(limits=limits)
+        return _scheduler
+
+def _message_tokens(kwargs: Dict[str, Any]) -> int:
+    """
+    Estimate the prompt tokens of a provider call from its messages.
+    """
+    messages: List[Any] = kwargs.get("messages") or []
+    return sum(count_tokens(m.get_content_string() if m.content is not None else "") for m in messages)
+
+class ScheduledModel:
+    """
+    Mixin routing an agno model's provider calls through the shared scheduler.
+
+    `scheduler_provider` is set on the concrete class created by `scheduled()`.
+    """
+    scheduler_provider: str = ""
+
+    def _lane_key(self) -> str:
+        return f"{self.scheduler_provider}:{self.id}"
+
+    def invoke(self, *args, **kwargs) -> Any:
+        return get_scheduler().call(self._lane_key(), lambda: super(ScheduledModel, self).invoke(*args, **kwargs), _message_tokens(kwargs))
+
+    async def ainvoke(self, *args, **kwargs) -> Any:
+        return await get_scheduler().acall(self._lane_key(), lambda: super(ScheduledModel, self).ainvoke(*args, **kwargs), _message_tokens(kwargs))
+
+    def invoke_stream(self, *args, **kwargs) -> Iterator[Any]:
+        return get_scheduler().stream(self._lane_key(), lambda: super(ScheduledModel, self).invoke_stream(*args, **kwargs), _message_tokens(kwargs))
+
+    def ainvoke_stream(self, *args, **kwargs) -> AsyncIterator[Any]:
+        return get_scheduler().astream(self._lane_key(), lambda: super(ScheduledModel, self).ainvoke_stream(*args, **kwargs), _message_tokens(kwargs))
+
+_scheduled_classes: Dict[Type[Model], Type[Model]] = {}
+
+def scheduled(model_class: Type[Model], provider: str) -> Type[Model]:
+    """
+    Return a subclass of an agno model class whose provider calls go through the scheduler.
+    """
+    if model_class not in _scheduled_classes:
+        _scheduled_classes[model_class] = type(
+            f"Scheduled{model_class.__name__}",
+            (ScheduledModel, model_class),
+            {"scheduler_provider": provider},
+        )
+    return _scheduled_classes[model_class]
@@ -0,0 +1,181 @@
+"""
+This module serves the data team over a local HTTP server, so agents, engines and
+knowledge bases stay warm between questions instead of being rebuilt by every
+`chat` invocation.
+
+Conversations are keyed by user and session ID. A session is pinned to one team
+of a pool built at startup, because agno teams keep per-run state and each
+team's memory holds the history of the sessions it serves; different sessions
+run concurrently on different teams. Answers can be streamed as NDJSON events:
+
+    {"event": "session", "session_id": "..."}
+    {"event": "tool", "name": "run_sql_query", "args": {...}}
+    {"event": "content", "content": "..."}
+    {"event": "done", "latency": 1.2, "prompt_tokens": 812, "completion_tokens": 95, "cached_tokens": 640}
+    {"event": "error", "error": "..."}
+"""
+
+import asyncio
+import json
+import threading
+import time
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+from uuid import uuid4
+
+from agno.run.response import RunEvent
+from agno.team.team import Team
+from agno.utils.log import logger
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from agents.batch import team_tokens
+from agents.stream import DELEGATION_TOOLS
+from constants import USER_ID
+from instrument import record_team_run, timed
+
+class ChatRequest(BaseModel):
+    """
+    Body of a chat request.
+
+    Attributes:
+        message (str): The user's question.
+        user_id (str): Who is asking; defaults to the CLI's user.
+        session_id (str): Conversation to continue; a new session is started when omitted.
+        stream (bool): Stream NDJSON events instead of returning one JSON answer.
+    """
+    message: str
+    user_id: str = USER_ID
+    session_id: Optional[str] = None
+    stream: bool = True
+
+class TeamPool:
+    """
+    Data teams built once at startup, with sessions pinned to teams.
+
+    Attributes:
+        teams (List[Team]): The warm teams.
+        sessions (Dict[Tuple[str, str], int]): Team index serving each (user, session).
+    """
+
+    def __init__(self, teams: List[Team]):
+        self.teams = teams
+        self.sessions: Dict[Tuple[str, str], int] = {}
+        self._locks = [threading.Lock() for _ in teams]
+        self._lock = threading.Lock()
+
+    def assign(self, user_id: str, session_id: str) -> int:
+        """
+        Return the team serving a session, pinning new sessions to the team with the fewest sessions.
+        """
+        key = (user_id, session_id)
+        with self._lock:
+            if key not in self.sessions:
+                load = [0] * len(self.teams)
+                for index in self.sessions.values():
+                    load[index] += 1
+                self.sessions[key] = load.index(min(load))
+            return self.sessions[key]
+
+    def run(self, request: ChatRequest, session_id: str, emit: Callable[[Dict[str, Any]], None]) -> None:
+        """
+        Answer one message on the session's team, reporting events through `emit`.
+
+        Blocks while another message runs on the same team.
+        """
+        index = self.assign(request.user_id, session_id)
+        team = self.teams[index]
+        with self._locks[index]:
+            started = time.perf_counter()
+            with timed("serve.request", user=request.user_id, stream=request.stream) as span:
+                if request.stream:
+                    for response in team.run(
+                        message=request.message,
+                        session_id=session_id,
+                        user_id=request.user_id,
+                        stream=True,
+                        stream_intermediate_steps=True,
+                    ):
+                        if response.event == RunEvent.tool_call_started.value:
+                            for tool in response.tools or []:
+                                if tool.get("tool_name") not in DELEGATION_TOOLS:
+                                    emit({"event": "tool", "name": tool.get("tool_name"), "args": tool.get("tool_args")})
+                        elif response.event == RunEvent.run_response.value and isinstance(response.content, str):
+                            emit({"event": "content", "content": response.content})
+                    run_response = team.run_response
+                else:
+                    run_response = team.run(message=request.message, session_id=session_id, user_id=request.user_id)
+                    content = run_response.content
+                    emit({"event": "content", "content": content if isinstance(content, str) else json.dumps(content, default=str)})
+                tokens = team_tokens(run_response)
+                span.update(tokens)
+            latency = time.perf_counter() - started
+            record_team_run(run_response, latency)
+            emit({"event": "done", "latency": round(latency, 3), **tokens})
+
+def create_app(pool: TeamPool) -> FastAPI:
+    """
+    Build the HTTP application serving a team pool.
+
+    Endpoints:
+        GET /health: Pool size, member names and open sessions.
+        POST /chat: Answer a `ChatRequest`, streamed as NDJSON events or as one JSON object.
+    """
+    app = FastAPI(title="data-ai")
+
+    @app.get("/health")
+    def health() -> Dict[str, Any]:
+        members = [member.name for member in pool.teams[0].members] if pool.teams else []
+        return {"status": "ok", "teams": len(pool.teams), "members": members, "sessions": len(pool.sessions)}
+
+    @app.post("/chat")
+    async def chat(request: ChatRequest):
+        if not request.message.strip():
+            raise HTTPException(status_code=400, detail="Empty message.")
+        session_id = request.session_id or str(uuid4())
+        events = _run_events(pool, request, session_id)
+        if request.stream:
+            return StreamingResponse(
+                (json.dumps(event, default=str) + "\n" async for event in events),
+                media_type="application/x-ndjson",
+            )
+
+        answer: Dict[str, Any] = {"session_id": session_id}
+        async for event in events:
+            if event["event"] == "content":
+                answer["content"] = event["content"]
+            elif event["event"] == "done":
+                answer.update({k: v for k, v in event.items() if k != "event"})
+            elif event["event"] == "error":
+                raise HTTPException(status_code=500, detail=event["error"])
+        return answer
+
+    return app
+
+async def _run_events(pool: TeamPool, request: ChatRequest, session_id: str) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Run a request on a worker thread and yield its events as they are emitted.
+    """
+    loop = asyncio.get_running_loop()
+    queue: "asyncio.Queue[Optional[Dict[str, Any]]]" = asyncio.Queue()
+
+    def emit(event: Optional[Dict[str, Any]]) -> None:
+        loop.call_soon_threadsafe(queue.put_nowait, event)
+
+    def work() -> None:
+        try:
+            pool.run(request, session_id, emit)
+        except Exception as e:
+            logger.warning(f"Request for session {session_id} failed: {e}")
+            emit({"event": "error", "error": f"{type(e).__name__}: {e}"})
+        finally:
+            emit(None)
+
+    yield {"event": "session", "session_id": session_id}
+    task = loop.run_in_executor(None, work)
+    while True:
+        event = await queue.get()
+        if event is None:
+            break
+        yield event
+    await task
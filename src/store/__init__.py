@@ -6,15 +6,21 @@ database storage, and vectorized knowledge bases used by the Data-AI platform.
 from agno.memory.v2.db.sqlite import SqliteMemoryDb
 from agno.memory.v2.memory import Memory
 from agno.models.openai import OpenAIChat
+from agno.vectordb.base import VectorDb
+from config import Config
 from constants import (
     DB_MEM_FILE,
     DB_STORE_FILE,
-    DB_VECTOR_FILE
+    DB_VECTOR_FILE,
+    DB_VECTOR_NUMPY_DIR,
+    SHARED_KNOWLEDGE_COLLECTION,
+    TEAM_KNOWLEDGE_COLLECTION
 )
-from agno.vectordb.chroma import ChromaDb
-from agno.agent import AgentKnowledge
 from agno.knowledge.text import TextKnowledgeBase
 from .app import DatabaseStore
+from .jobs import JobStore
+from .partition import MEMBER_LEVEL, TEAM_LEVEL, PartitionedVectorDb, migrate_collections
+from .vector import VECTOR_BACKENDS, NumpyVectorDb, TimedOpenAIEmbedder
 
 # Singleton metaclass to ensure only one instance of StoreDb exists
 class SingletonMem(type):
@@ -48,22 +54,56 @@ class StoreDb(metaclass=SingletonMem):
 
         # Initialize database metadata store (SQLite)
         self.app_store = DatabaseStore(db_path=DB_STORE_FILE)
+
+        # Persistent queue of background indexing jobs, in the same SQLite file
+        self.job_store = JobStore(db_path=DB_STORE_FILE)
         
-        # Persistent vector DB for team-level shared knowledge base
-        vector = ChromaDb(
-            path=DB_VECTOR_FILE, 
-            collection="data-team-knowledge_base", 
-            persistent_client=True,
-        )
+        layout = Config().app_config.vector_layout
+        if layout == "shared":
+            # One collection for all knowledge; collections of the per-agent layout are moved into it
+            self.shared_knowledge = self.vector_db(collection=SHARED_KNOWLEDGE_COLLECTION)
+            migrate_collections(self.shared_knowledge, TEAM_KNOWLEDGE_COLLECTION, lambda collection: self.vector_db(collection=collection))
+            # The team leader searches the knowledge of every agent and level
+            vector = PartitionedVectorDb(self.shared_knowledge, partition={"level": TEAM_LEVEL}, search_partition={})
+        elif layout == "collections":
+            self.shared_knowledge = None
+            # Persistent vector DB for team-level shared knowledge base
+            vector = self.vector_db(collection=TEAM_KNOWLEDGE_COLLECTION)
+        else:
+            raise ValueError(f"Unsupported vector layout: {layout} (expected 'collections' or 'shared')")
         self.data_team_knowledge = TextKnowledgeBase(vector_db=vector)
 
-    def knowleged_base_db(self, collection: str) -> AgentKnowledge:
+    def knowleged_base_db(self, collection: str) -> VectorDb:
         """
-        Create or retrieve a knowledge base for a specific agent or collection.
-        Uses Chroma vector DB for persistence.
+        Create or retrieve a knowledge base for a specific agent or collection:
+        its own collection, or its partition of the shared collection.
         """
-        return ChromaDb(
-            path=DB_VECTOR_FILE, 
-            collection=collection,
-            persistent_client=True,
-        )
+        if self.shared_knowledge is not None:
+            return PartitionedVectorDb(self.shared_knowledge, partition={"agent": collection, "level": MEMBER_LEVEL})
+        return self.vector_db(collection=collection)
+
+    def vector_db(self, collection: str) -> VectorDb:
+        """
+        Open a vector collection with the backend selected by DATA_AI_VECTOR_BACKEND:
+        a persistent Chroma DB, or in-process NumPy collections.
+
+        Raises:
+            ValueError: If the configured backend is not supported.
+        """
+        backend = Config().app_config.vector_backend
+        if backend == "numpy":
+            return NumpyVectorDb(
+                path=DB_VECTOR_NUMPY_DIR,
+                collection=collection,
+                embedder=TimedOpenAIEmbedder(),
+            )
+        if backend == "chroma":
+            # Imported here so the Chroma client is only loaded when it is used
+            from .chroma import TimedChromaDb
+            return TimedChromaDb(
+                path=DB_VECTOR_FILE, 
+                collection=collection,
+                embedder=TimedOpenAIEmbedder(),
+                persistent_client=True,
+            )
+        raise ValueError(f"Unsupported vector backend: {backend} (expected one of {', '.join(VECTOR_BACKENDS)})")
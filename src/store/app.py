@@ -3,9 +3,10 @@ This module provides a simple SQLite-based persistence layer for storing and man
 database connection metadata used by the Data-AI platform.
 """
 
+import json
 import sqlite3
 from typing import List, Dict
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 # Represents a structured object holding metadata about a registered database
 @dataclass
@@ -15,6 +16,14 @@ class DatabaseObject:
     uri: str
     driver: str
     meta_data: str
+    # Per-database settings, e.g. {"statement_timeout": 30}
+    options: Dict = field(default_factory=dict)
+    # Catalog snapshot (tables and columns) taken when the database was added
+    schema: str = ""
+    # Join-path graph over foreign keys and inferred relationships, precomputed at add time
+    join_graph: str = ""
+    # Catalog watermark (`Database.watermark()`) read when the schema snapshot was taken; empty if unknown
+    watermark: str = ""
 
 # Class for managing storage of database connection metadata using SQLite
 class DatabaseStore:
@@ -28,7 +37,9 @@ class DatabaseStore:
     def _create_table(self):
         """
         Create the 'databases' table if it doesn't exist.
-        The table stores: ID, name, driver, URI, and associated metadata.
+        The table stores: ID, name, driver, URI, associated metadata, per-database options,
+        the catalog snapshot used to validate queries, the precomputed join-path graph and
+        the catalog watermark used to detect schema changes since the snapshot.
         """
         self.conn.execute("""
             CREATE TABLE IF NOT EXISTS databases (
@@ -36,9 +47,23 @@ class DatabaseStore:
                 name TEXT NOT NULL,
                 driver TEXT NOT NULL,
                 uri TEXT NOT NULL,
-                meta_data TEXT NOT NULL
+                meta_data TEXT NOT NULL,
+                options TEXT NOT NULL DEFAULT '{}',
+                schema TEXT NOT NULL DEFAULT '',
+                join_graph TEXT NOT NULL DEFAULT '',
+                watermark TEXT NOT NULL DEFAULT ''
             )
         """)
+        # Stores created by earlier versions lack the newer columns
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(databases)")]
+        for column, definition in [
+            ("options", "TEXT NOT NULL DEFAULT '{}'"),
+            ("schema", "TEXT NOT NULL DEFAULT ''"),
+            ("join_graph", "TEXT NOT NULL DEFAULT ''"),
+            ("watermark", "TEXT NOT NULL DEFAULT ''"),
+        ]:
+            if column not in columns:
+                self.conn.execute(f"ALTER TABLE databases ADD COLUMN {column} {definition}")
         self.conn.commit()
 
     def create(self, db_entry: Dict):
@@ -56,8 +81,27 @@ class DatabaseStore:
 
         # Insert the new database entry
         self.conn.execute(
-            "INSERT INTO databases (name, driver, uri, meta_data) VALUES (?, ?, ?, ?)",
-            (db_entry["name"], db_entry["driver"], db_entry["uri"], db_entry["meta_data"])
+            "INSERT INTO databases (name, driver, uri, meta_data, options, schema, join_graph, watermark) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (db_entry["name"], db_entry["driver"], db_entry["uri"], db_entry["meta_data"],
+             json.dumps(db_entry.get("options") or {}), db_entry.get("schema") or "", db_entry.get("join_graph") or "",
+             db_entry.get("watermark") or "")
+        )
+        self.conn.commit()
+
+    def update(self, name: str, fields: Dict):
+        """
+        Update fields of the database entry with the given name, e.g. after it was re-indexed.
+        """
+        columns = ["meta_data", "options", "schema", "join_graph", "watermark"]
+        unknown = set(fields) - set(columns)
+        if unknown:
+            raise ValueError(f"Unknown database fields: {', '.join(sorted(unknown))}")
+        values = {column: json.dumps(value or {}) if column == "options" else (value or "") for column, value in fields.items()}
+        if not values:
+            return
+        self.conn.execute(
+            f"UPDATE databases SET {', '.join(f'{column} = ?' for column in values)} WHERE name = ?",
+            (*values.values(), name)
         )
         self.conn.commit()
 
@@ -66,9 +110,11 @@ class DatabaseStore:
         Retrieve all database records as a list of DatabaseObject instances.
         """
         # Query all database entries
-        cursor = self.conn.execute("SELECT id, name, uri, driver, meta_data FROM databases")
+        cursor = self.conn.execute("SELECT id, name, uri, driver, meta_data, options, schema, join_graph, watermark FROM databases")
         return [
-            DatabaseObject(id=row[0], name=row[1], uri=row[2], driver=row[3], meta_data=row[4])
+            DatabaseObject(id=row[0], name=row[1], uri=row[2], driver=row[3], meta_data=row[4],
+                           options=json.loads(row[5] or "{}"), schema=row[6] or "", join_graph=row[7] or "",
+                           watermark=row[8] or "")
             for row in cursor.fetchall()
         ]
 
@@ -0,0 +1,236 @@
+"""
+This module provides the Chroma vector store used by the knowledge bases, with
+timings for upserts and searches. It is imported only when Chroma is the selected
+vector backend, as loading the Chroma client is slow.
+"""
+
+import os
+import shutil
+import sqlite3
+from hashlib import md5
+from typing import Any, Dict, List, Optional
+
+from agno.document import Document
+from agno.utils.log import log_debug, logger
+from agno.vectordb.chroma import ChromaDb
+
+from instrument import timed
+
+# Suffix of the collection a compaction rebuilds into before it replaces the original
+_COMPACTING_SUFFIX = ".compacting"
+
+def _where(filters: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Chroma `where` clause matching every filter value; a list value matches any of its items.
+    """
+    conditions = [
+        {key: {"$in": list(value)}} if isinstance(value, (list, tuple, set)) else {key: value}
+        for key, value in filters.items()
+    ]
+    return conditions[0] if len(conditions) == 1 else {"$and": conditions}
+
+class TimedChromaDb(ChromaDb):
+    """
+    ChromaDb that records upserts and searches as stages, applies metadata filters to searches
+    (agno's ChromaDb ignores them), and keeps document IDs: agno keys documents by content hash,
+    so reloading a document with new content would add it next to the old one.
+    """
+
+    def _get_collection(self):
+        if not self._collection:
+            self._collection = self.client.get_collection(name=self.collection_name)
+        return self._collection
+
+    def _payload(self, documents: List[Document]) -> Dict[str, List]:
+        """
+        Embed documents and return them as Chroma columns, keyed by their ID or else their content hash.
+        """
+        payload = {"ids": [], "embeddings": [], "documents": [], "metadatas": []}
+        for document in documents:
+            document.embed(embedder=self.embedder)
+            content = document.content.replace("\x00", "\ufffd")
+            payload["ids"].append(document.id or md5(content.encode()).hexdigest())
+            payload["embeddings"].append(document.embedding)
+            payload["documents"].append(content)
+            payload["metadatas"].append(document.meta_data)
+            log_debug(f"Stored document: {document.id} | {document.name} | {document.meta_data}")
+        return payload
+
+    def upsert(self, documents: List[Document], filters: Optional[Dict[str, Any]] = None) -> None:
+        with timed("knowledge.upsert", collection=self.collection_name, rows=len(documents)):
+            if documents:
+                payload = self._payload(documents)
+                self._get_collection().upsert(**payload)
+
+    def insert(self, documents: List[Document], filters: Optional[Dict[str, Any]] = None) -> None:
+        with timed("knowledge.insert", collection=self.collection_name, rows=len(documents)):
+            if documents:
+                payload = self._payload(documents)
+                self._get_collection().add(**payload)
+
+    def search(self, query: str, limit: int = 5, filters: Optional[Dict[str, Any]] = None) -> List[Document]:
+        with timed("knowledge.search", collection=self.collection_name) as span:
+            if filters:
+                results = self._filtered_search(query=query, limit=limit, filters=filters)
+            else:
+                results = super().search(query=query, limit=limit, filters=filters)
+            span["rows"] = len(results)
+        return results
+
+    def _filtered_search(self, query: str, limit: int, filters: Dict[str, Any]) -> List[Document]:
+        """
+        Search the documents whose metadata matches `filters`.
+        Each result's metadata carries its distance as 'distances', as with unfiltered searches.
+        """
+        query_embedding = self.embedder.get_embedding(query)
+        if query_embedding is None:
+            logger.error(f"Error getting embedding for Query: {query}")
+            return []
+        result = self._get_collection().query(
+            query_embeddings=query_embedding,
+            n_results=limit,
+            where=_where(filters),
+            include=["metadatas", "documents", "embeddings", "distances"],
+        )
+        results = []
+        for id_, meta_data, content, embedding, distance in zip(
+            result["ids"][0], result["metadatas"][0], result["documents"][0], result["embeddings"][0], result["distances"][0]
+        ):
+            results.append(Document(
+                id=id_,
+                meta_data={**(meta_data or {}), "distances": distance},
+                content=content,
+                embedding=embedding.tolist() if hasattr(embedding, "tolist") else embedding,
+            ))
+        if self.reranker:
+            results = self.reranker.rerank(query=query, documents=results)
+        return results
+
+    def delete_where(self, filters: Dict[str, Any]) -> None:
+        """
+        Delete the documents whose metadata matches `filters`.
+        """
+        if self.exists():
+            self._get_collection().delete(where=_where(filters))
+
+    def delete_documents(self, ids: List[str]) -> None:
+        """
+        Delete documents by ID.
+        """
+        if ids:
+            self._get_collection().delete(ids=ids)
+
+    def export_documents(self) -> List[Document]:
+        """
+        Return every document of the collection with its embedding and metadata.
+        """
+        if not self.exists():
+            return []
+        result = self._get_collection().get(include=["metadatas", "documents", "embeddings"])
+        return [
+            Document(
+                id=id_,
+                meta_data=dict(meta_data or {}),
+                content=content,
+                embedding=embedding.tolist() if hasattr(embedding, "tolist") else list(embedding),
+            )
+            for id_, meta_data, content, embedding in zip(
+                result["ids"], result["metadatas"], result["documents"], result["embeddings"]
+            )
+        ]
+
+    def import_documents(self, documents: List[Document]) -> None:
+        """
+        Upsert documents that already carry their embeddings, keeping their IDs; nothing is re-embedded.
+        """
+        if not documents:
+            return
+        self.create()
+        with timed("knowledge.upsert", collection=self.collection_name, rows=len(documents)):
+            self._collection.upsert(
+                ids=[document.id for document in documents],
+                embeddings=[document.embedding for document in documents],
+                documents=[document.content for document in documents],
+                metadatas=[document.meta_data for document in documents],
+            )
+
+    def collections(self) -> List[str]:
+        """
+        Names of all collections in this Chroma database. Compactions that were interrupted are
+        finished or rolled back first, so no collection is missing from the list.
+        """
+        names = [collection.name for collection in self.client.list_collections()]
+        for name in names:
+            if name.endswith(_COMPACTING_SUFFIX):
+                self._recover(name[: -len(_COMPACTING_SUFFIX)], names)
+        return [collection.name for collection in self.client.list_collections() if not collection.name.endswith(_COMPACTING_SUFFIX)]
+
+    def _recover(self, name: str, names: List[str]) -> None:
+        """
+        Resolve an interrupted compaction of a collection: the complete copy replaces the original
+        if the original was already dropped, otherwise the partial copy is discarded.
+        """
+        staging = f"{name}{_COMPACTING_SUFFIX}"
+        if name in names:
+            logger.warning(f"Discarding the partial copy of an interrupted compaction of {name}")
+            self.client.delete_collection(name=staging)
+        else:
+            logger.warning(f"Restoring {name} from its compacted copy")
+            self.client.get_collection(name=staging).modify(name=name)
+        if name == self.collection_name:
+            self._collection = None
+
+    def compact(self) -> None:
+        """
+        Rebuild the collection's index from its documents, dropping the entries of deleted documents.
+
+        The documents are copied into a new collection, which replaces the original only once the
+        copy is complete; if the rebuild is interrupted, the original is kept or restored from the copy.
+        """
+        names = [collection.name for collection in self.client.list_collections()]
+        staging = f"{self.collection_name}{_COMPACTING_SUFFIX}"
+        if staging in names:
+            self._recover(self.collection_name, names)
+        if not self.exists():
+            return
+        documents = self.export_documents()
+        copy = self.client.create_collection(name=staging, metadata=self._get_collection().metadata)
+        try:
+            batch_size = self.client.get_max_batch_size()
+            for start in range(0, len(documents), batch_size):
+                batch = documents[start:start + batch_size]
+                copy.upsert(
+                    ids=[document.id for document in batch],
+                    embeddings=[document.embedding for document in batch],
+                    documents=[document.content for document in batch],
+                    metadatas=[document.meta_data or None for document in batch],
+                )
+            if copy.count() != len(documents):
+                raise RuntimeError(f"compacted copy of {self.collection_name} holds {copy.count()} of {len(documents)} documents")
+        except Exception:
+            self.client.delete_collection(name=staging)
+            raise
+        # From here on, an interruption leaves the complete copy, which `_recover` renames
+        self.client.delete_collection(name=self.collection_name)
+        copy.modify(name=self.collection_name)
+        self._collection = None
+
+    def vacuum(self) -> None:
+        """
+        Remove the index files of dropped collections, which Chroma leaves on disk, and vacuum its SQLite file.
+        """
+        database = os.path.join(self.path, "chroma.sqlite3")
+        if not os.path.exists(database):
+            return
+        connection = sqlite3.connect(database, timeout=30)
+        try:
+            segments = {row[0] for row in connection.execute("SELECT id FROM segments")}
+            for name in os.listdir(self.path):
+                directory = os.path.join(self.path, name)
+                # Segment directories are named by the segment's UUID
+                if os.path.isdir(directory) and name.count("-") == 4 and name not in segments:
+                    log_debug(f"Removing index files of a dropped collection: {directory}")
+                    shutil.rmtree(directory, ignore_errors=True)
+            connection.execute("VACUUM")
+        finally:
+            connection.close()
@@ -0,0 +1,232 @@
+"""
+This module garbage-collects the knowledge store, for `data-ai gc`.
+
+Knowledge outlives the databases it describes: deleting an agent drops its member
+collection but keeps its team document, and documents stored before they had fixed
+IDs were added next to their previous versions instead of replacing them. Collection
+checks documents against the registered databases and:
+
+- drops the collections of agents that are no longer registered
+- deletes documents of unregistered agents from the team and shared collections
+- deletes superseded documents, keeping one per agent, level and kind (and table,
+  for column statistics): the one with the fixed ID, else the most recently written
+- deletes legacy team documents, which were stored without their agent (Chroma does
+  not keep document names) and without a fixed ID, once every registered agent has a
+  current team document; until then they are kept and reported
+- compacts every collection (Chroma indexes are rebuilt and dropped collections'
+  files removed) and reports disk usage and search latency before and after
+"""
+
+import os
+import statistics
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+from agno.document import Document
+from agno.embedder import Embedder
+
+from config import Config
+from constants import DB_VECTOR_FILE, DB_VECTOR_NUMPY_DIR, SHARED_KNOWLEDGE_COLLECTION, TEAM_KNOWLEDGE_COLLECTION
+from . import StoreDb
+from .partition import MEMBER_LEVEL, TEAM_LEVEL
+
+# Stored embeddings used as queries when measuring search latency, per collection
+LATENCY_PROBES = 20
+
+@dataclass
+class GcReport:
+    """
+    Outcome of a garbage collection.
+
+    Attributes:
+        dropped_collections (List[str]): Collections of unregistered agents.
+        orphans (int): Documents of unregistered agents deleted from shared collections.
+        duplicates (int): Superseded documents deleted, including legacy team documents.
+        unattributed (int): Legacy team documents kept because some agents have no current team document.
+        without_team_document (List[str]): Agents with no current team document.
+        bytes_before (int): Disk usage of the vector store before collection.
+        bytes_after (int): Disk usage after collection.
+        search_before (float): Median search latency in seconds before collection.
+        search_after (float): Median search latency in seconds after collection.
+        searches (int): Searches measured on each side.
+    """
+    dropped_collections: List[str] = field(default_factory=list)
+    orphans: int = 0
+    duplicates: int = 0
+    unattributed: int = 0
+    without_team_document: List[str] = field(default_factory=list)
+    bytes_before: int = 0
+    bytes_after: int = 0
+    search_before: float = 0.0
+    search_after: float = 0.0
+    searches: int = 0
+
+@dataclass
+class _ReplayEmbedder(Embedder):
+    """
+    Embedder returning stored embeddings, so latency probes do not call the embedding API.
+    The query text is the index of the embedding to return.
+    """
+    vectors: List[List[float]] = field(default_factory=list)
+
+    def get_embedding(self, text: str) -> List[float]:
+        return self.vectors[int(text)]
+
+    def get_embedding_and_usage(self, text: str):
+        return self.get_embedding(text), None
+
+def _disk_usage(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+def _owner(collection: str, document: Document) -> Optional[str]:
+    """
+    Agent a document belongs to; None for team documents stored before they named their agent.
+    """
+    if collection in (TEAM_KNOWLEDGE_COLLECTION, SHARED_KNOWLEDGE_COLLECTION):
+        return document.meta_data.get("agent") or (document.name if collection == TEAM_KNOWLEDGE_COLLECTION else None)
+    return collection
+
+def _team_id(agent: str) -> str:
+    """Fixed ID of an agent's team document."""
+    return f"{agent}:team"
+
+def _legacy(collection: str, document: Document) -> bool:
+    """
+    Whether a document is a team document stored before team documents had a fixed ID
+    and named their agent, so it cannot be attributed.
+    """
+    if collection == SHARED_KNOWLEDGE_COLLECTION:
+        team = document.meta_data.get("level") == TEAM_LEVEL
+    else:
+        team = collection == TEAM_KNOWLEDGE_COLLECTION
+    return team and _owner(collection, document) is None and not document.id.endswith(":team")
+
+def _slot(collection: str, document: Document, agent: Optional[str]) -> Tuple[Tuple, Optional[str]]:
+    """
+    What a document describes, and the fixed ID of the current document for it.
+    Documents with the same slot supersede each other.
+    """
+    if not agent:
+        return ("content", document.content), None
+    level = document.meta_data.get("level") or (TEAM_LEVEL if collection == TEAM_KNOWLEDGE_COLLECTION else MEMBER_LEVEL)
+    kind = document.meta_data.get("kind", "knowledge")
+    table = document.meta_data.get("table", "")
+    if kind == "column_stats":
+        fixed_id = f"{agent}:{table}:stats"
+    else:
+        fixed_id = f"{agent}:{level}"
+    return (agent, level, kind, table), fixed_id
+
+def _superseded(collection: str, documents: List[Document]) -> List[str]:
+    """
+    IDs of documents replaced by a newer document for the same slot.
+    """
+    winners: Dict[Tuple, int] = {}
+    for position, document in enumerate(documents):
+        slot, fixed_id = _slot(collection, document, _owner(collection, document))
+        current = winners.get(slot)
+        # Documents are listed in write order: a later one wins unless the current one has the fixed ID
+        if current is None or documents[current].id != fixed_id:
+            winners[slot] = position
+    kept = set(winners.values())
+    return [document.id for position, document in enumerate(documents) if position not in kept]
+
+def _sample(documents: List[Document]) -> List[List[float]]:
+    """
+    Embeddings of up to `LATENCY_PROBES` documents spread over a collection.
+    """
+    step = max(1, len(documents) // LATENCY_PROBES)
+    return [document.embedding for document in documents[::step][:LATENCY_PROBES]]
+
+def _probe(vector_db, vectors: List[List[float]]) -> List[float]:
+    """
+    Search latencies of a collection, using stored embeddings as queries.
+    """
+    embedder = vector_db.embedder
+    vector_db.embedder = _ReplayEmbedder(vectors=vectors)
+    try:
+        latencies = []
+        for index in range(len(vectors)):
+            start = time.perf_counter()
+            vector_db.search(query=str(index), limit=5)
+            latencies.append(time.perf_counter() - start)
+        return latencies
+    finally:
+        vector_db.embedder = embedder
+
+def collect_garbage(agents: Set[str], dry_run: bool = False) -> GcReport:
+    """
+    Delete orphaned and superseded knowledge and compact the vector store.
+
+    Args:
+        agents (Set[str]): Agent names whose knowledge is kept: registered databases and
+            databases with an unfinished indexing job.
+        dry_run (bool): Only count what would be deleted; nothing is changed.
+
+    Returns:
+        GcReport: What was deleted, disk usage and search latency before and after.
+    """
+    store = StoreDb()
+    path = DB_VECTOR_NUMPY_DIR if Config().app_config.vector_backend == "numpy" else DB_VECTOR_FILE
+    report = GcReport(bytes_before=_disk_usage(path))
+    owners = agents | {None}
+
+    collections = store.vector_db(collection=TEAM_KNOWLEDGE_COLLECTION).collections()
+    documents = {collection: store.vector_db(collection=collection).export_documents() for collection in collections}
+    kept = [
+        collection for collection in collections
+        if collection in (TEAM_KNOWLEDGE_COLLECTION, SHARED_KNOWLEDGE_COLLECTION) or collection in agents
+    ]
+    # Legacy team documents are only superseded once every agent has its current team document
+    current = {
+        document.id for collection in (TEAM_KNOWLEDGE_COLLECTION, SHARED_KNOWLEDGE_COLLECTION)
+        for document in documents.get(collection, [])
+    }
+    report.without_team_document = sorted(agent for agent in agents if _team_id(agent) not in current)
+    attributed = not report.without_team_document
+    # Latency is compared on the collections that are kept, with the same queries before and after
+    probes = {collection: _sample(documents[collection]) for collection in kept if documents[collection]}
+    before = [latency for collection, vectors in probes.items() for latency in _probe(store.vector_db(collection=collection), vectors)]
+
+    for collection, docs in documents.items():
+        vector_db = store.vector_db(collection=collection)
+        if collection not in kept:
+            report.dropped_collections.append(collection)
+            if not dry_run:
+                vector_db.drop()
+            continue
+        orphans = [document.id for document in docs if _owner(collection, document) not in owners]
+        live = [document for document in docs if _owner(collection, document) in owners]
+        legacy = [document.id for document in live if _legacy(collection, document)]
+        if attributed:
+            live = [document for document in live if not _legacy(collection, document)]
+            duplicates = legacy + _superseded(collection, live)
+        else:
+            duplicates = _superseded(collection, live)
+            report.unattributed += len(set(legacy) - set(duplicates))
+        report.orphans += len(orphans)
+        report.duplicates += len(duplicates)
+        if not dry_run:
+            vector_db.delete_documents(orphans + duplicates)
+            vector_db.compact()
+
+    if not dry_run:
+        # Chroma keeps the files of dropped collections until they are vacuumed
+        vacuum = getattr(store.vector_db(collection=TEAM_KNOWLEDGE_COLLECTION), "vacuum", None)
+        if vacuum is not None:
+            vacuum()
+    after = [latency for collection, vectors in probes.items() for latency in _probe(store.vector_db(collection=collection), vectors)]
+
+    report.bytes_after = _disk_usage(path)
+    report.search_before = statistics.median(before) if before else 0.0
+    report.search_after = statistics.median(after) if after else 0.0
+    report.searches = len(after)
+    return report
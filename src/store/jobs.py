@@ -0,0 +1,205 @@
+"""
+This module provides a persistent queue of indexing jobs, kept in the app SQLite store
+next to the registered databases.
+
+A job registers one database through the stages of `agents.jobs.JOB_STAGES`. The
+output of every completed stage is checkpointed with the job, so a failed job resumes
+from the stage that failed instead of starting over. Several worker processes can
+share the queue: jobs are claimed atomically.
+"""
+
+import json
+import os
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+# Job statuses
+QUEUED = "queued"
+RUNNING = "running"
+FAILED = "failed"
+DONE = "done"
+
+# Represents one indexing job and its checkpoints
+@dataclass
+class Job:
+    id: int
+    name: str
+    uri: str
+    profile: bool
+    # Per-database options stored with the database once registered
+    options: Dict = field(default_factory=dict)
+    status: str = QUEUED
+    # Last completed stage, and the stage currently or last run
+    stage: str = ""
+    current: str = ""
+    # Output of every completed stage, by stage name
+    outputs: Dict[str, Any] = field(default_factory=dict)
+    error: str = ""
+    attempts: int = 0
+    # Process ID of the worker running the job
+    worker: Optional[int] = None
+    created_at: float = 0.0
+    updated_at: float = 0.0
+
+_COLUMNS = "id, name, uri, profile, options, status, stage, current, outputs, error, attempts, worker, created_at, updated_at"
+
+def _job(row) -> Job:
+    return Job(
+        id=row[0], name=row[1], uri=row[2], profile=bool(row[3]), options=json.loads(row[4] or "{}"),
+        status=row[5], stage=row[6], current=row[7], outputs=json.loads(row[8] or "{}"), error=row[9],
+        attempts=row[10], worker=row[11], created_at=row[12], updated_at=row[13],
+    )
+
+def _alive(pid: Optional[int]) -> bool:
+    """Whether a process with this ID is running."""
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+# Class for managing the job queue in SQLite
+class JobStore:
+    def __init__(self, db_path: str):
+        """
+        Initialize the SQLite connection and ensure the table exists.
+        Workers and the CLI write concurrently, so writers wait for each other's locks.
+        """
+        self.conn = sqlite3.connect(db_path, timeout=30)
+        self._create_table()
+
+    def _create_table(self):
+        """
+        Create the 'jobs' table if it doesn't exist.
+        """
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY,
+                name TEXT NOT NULL,
+                uri TEXT NOT NULL,
+                profile INTEGER NOT NULL DEFAULT 0,
+                options TEXT NOT NULL DEFAULT '{}',
+                status TEXT NOT NULL DEFAULT 'queued',
+                stage TEXT NOT NULL DEFAULT '',
+                current TEXT NOT NULL DEFAULT '',
+                outputs TEXT NOT NULL DEFAULT '{}',
+                error TEXT NOT NULL DEFAULT '',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                worker INTEGER,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        self.conn.commit()
+
+    def enqueue(self, name: str, uri: str, profile: bool = False, options: Dict = None) -> int:
+        """
+        Queue a job registering a database and return its ID.
+
+        Raises:
+            ValueError: If a job for the same name is already queued or running.
+        """
+        cursor = self.conn.execute(
+            "SELECT id FROM jobs WHERE name = ? AND status IN (?, ?)", (name, QUEUED, RUNNING)
+        )
+        row = cursor.fetchone()
+        if row is not None:
+            raise ValueError(f"Job {row[0]} for '{name}' is already queued or running")
+        now = time.time()
+        cursor = self.conn.execute(
+            "INSERT INTO jobs (name, uri, profile, options, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (name, uri, int(profile), json.dumps(options or {}), now, now),
+        )
+        self.conn.commit()
+        return cursor.lastrowid
+
+    def get(self, job_id: int) -> Optional[Job]:
+        """
+        Retrieve one job, or None.
+        """
+        row = self.conn.execute(f"SELECT {_COLUMNS} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return _job(row) if row else None
+
+    def get_all(self) -> List[Job]:
+        """
+        Retrieve all jobs, newest first.
+        """
+        cursor = self.conn.execute(f"SELECT {_COLUMNS} FROM jobs ORDER BY id DESC")
+        return [_job(row) for row in cursor.fetchall()]
+
+    def claim(self, job_id: Optional[int] = None) -> Optional[Job]:
+        """
+        Mark the oldest queued job (or the given one) as running by this process and return it.
+        Returns None when there is nothing to claim or another worker claimed it first.
+        """
+        self.requeue_orphans()
+        if job_id is None:
+            row = self.conn.execute("SELECT id FROM jobs WHERE status = ? ORDER BY id LIMIT 1", (QUEUED,)).fetchone()
+            if row is None:
+                return None
+            job_id = row[0]
+        cursor = self.conn.execute(
+            "UPDATE jobs SET status = ?, worker = ?, attempts = attempts + 1, error = '', updated_at = ? WHERE id = ? AND status = ?",
+            (RUNNING, os.getpid(), time.time(), job_id, QUEUED),
+        )
+        self.conn.commit()
+        return self.get(job_id) if cursor.rowcount else None
+
+    def start_stage(self, job_id: int, stage: str):
+        """
+        Record the stage a running job is in.
+        """
+        self.conn.execute("UPDATE jobs SET current = ?, updated_at = ? WHERE id = ?", (stage, time.time(), job_id))
+        self.conn.commit()
+
+    def checkpoint(self, job_id: int, stage: str, outputs: Dict[str, Any]):
+        """
+        Record a completed stage and the outputs so far.
+        """
+        self.conn.execute(
+            "UPDATE jobs SET stage = ?, outputs = ?, updated_at = ? WHERE id = ?",
+            (stage, json.dumps(outputs), time.time(), job_id),
+        )
+        self.conn.commit()
+
+    def finish(self, job_id: int, error: str = "", retry: bool = False):
+        """
+        Mark a job done, or failed with its error. A failed job that may be retried goes back to the queue,
+        keeping its checkpoints.
+        """
+        status = DONE if not error else QUEUED if retry else FAILED
+        self.conn.execute(
+            "UPDATE jobs SET status = ?, error = ?, worker = NULL, updated_at = ? WHERE id = ?",
+            (status, error, time.time(), job_id),
+        )
+        self.conn.commit()
+
+    def retry(self, job_id: int) -> bool:
+        """
+        Queue a failed job again; it resumes after its last completed stage.
+        """
+        cursor = self.conn.execute(
+            "UPDATE jobs SET status = ?, attempts = 0, updated_at = ? WHERE id = ? AND status = ?",
+            (QUEUED, time.time(), job_id, FAILED),
+        )
+        self.conn.commit()
+        return cursor.rowcount > 0
+
+    def requeue_orphans(self):
+        """
+        Queue again the running jobs whose worker process is gone, e.g. after a crash or reboot.
+        """
+        rows = self.conn.execute("SELECT id, worker FROM jobs WHERE status = ?", (RUNNING,)).fetchall()
+        for job_id, worker in rows:
+            if not _alive(worker):
+                self.conn.execute(
+                    "UPDATE jobs SET status = ?, worker = NULL, error = ?, updated_at = ? WHERE id = ? AND status = ?",
+                    (QUEUED, "worker stopped", time.time(), job_id, RUNNING),
+                )
+        self.conn.commit()
@@ -0,0 +1,160 @@
+"""
+This module provides the shared knowledge layout: all knowledge lives in one vector
+collection, partitioned by `agent` and `level` metadata, instead of one collection
+per agent plus the team collection.
+
+- member knowledge (structure explanation, column statistics) is stored with
+  `{"agent": <agent>, "level": "member"}` and members only search their partition
+- team knowledge is stored with `{"level": "team"}` and the agent's name; the team
+  leader searches the whole collection at once
+
+`migrate_collections` moves the documents of the per-agent layout into the shared
+collection, with their embeddings, and drops the old collections.
+"""
+
+import asyncio
+from typing import Any, Callable, Dict, List, Optional
+
+from agno.document import Document
+from agno.utils.log import logger
+from agno.vectordb.base import VectorDb
+
+from instrument import timed
+
+# Partition levels of the shared collection
+MEMBER_LEVEL = "member"
+TEAM_LEVEL = "team"
+
+class PartitionedVectorDb(VectorDb):
+    """
+    View of one partition of a shared vector collection.
+
+    Documents written through the view are tagged with the partition's metadata. Searches
+    are restricted to `search_partition`, which defaults to the partition itself; an empty
+    `search_partition` searches the whole collection.
+    """
+
+    def __init__(self, vector_db: VectorDb, partition: Dict[str, Any], search_partition: Optional[Dict[str, Any]] = None):
+        self.vector_db = vector_db
+        self.partition = partition
+        self.search_partition = partition if search_partition is None else search_partition
+
+    def _tagged(self, documents: List[Document]) -> List[Document]:
+        for document in documents:
+            document.meta_data = {**document.meta_data, **self.partition}
+        return documents
+
+    def create(self) -> None:
+        self.vector_db.create()
+
+    async def async_create(self) -> None:
+        await asyncio.to_thread(self.create)
+
+    def doc_exists(self, document: Document) -> bool:
+        return self.vector_db.doc_exists(document)
+
+    async def async_doc_exists(self, document: Document) -> bool:
+        return await asyncio.to_thread(self.doc_exists, document)
+
+    def name_exists(self, name: str) -> bool:
+        return self.vector_db.name_exists(name)
+
+    async def async_name_exists(self, name: str) -> bool:
+        return await asyncio.to_thread(self.name_exists, name)
+
+    def id_exists(self, id: str) -> bool:
+        return self.vector_db.id_exists(id)
+
+    def insert(self, documents: List[Document], filters: Optional[Dict[str, Any]] = None) -> None:
+        self.vector_db.insert(documents=self._tagged(documents), filters=filters)
+
+    async def async_insert(self, documents: List[Document], filters: Optional[Dict[str, Any]] = None) -> None:
+        await asyncio.to_thread(self.insert, documents, filters)
+
+    def upsert_available(self) -> bool:
+        return self.vector_db.upsert_available()
+
+    def upsert(self, documents: List[Document], filters: Optional[Dict[str, Any]] = None) -> None:
+        self.vector_db.upsert(documents=self._tagged(documents), filters=filters)
+
+    async def async_upsert(self, documents: List[Document], filters: Optional[Dict[str, Any]] = None) -> None:
+        await asyncio.to_thread(self.upsert, documents, filters)
+
+    def search(self, query: str, limit: int = 5, filters: Optional[Dict[str, Any]] = None) -> List[Document]:
+        return self.vector_db.search(query=query, limit=limit, filters={**self.search_partition, **(filters or {})})
+
+    async def async_search(self, query: str, limit: int = 5, filters: Optional[Dict[str, Any]] = None) -> List[Document]:
+        return await asyncio.to_thread(self.search, query, limit, filters)
+
+    def delete_documents(self, ids: List[str]) -> None:
+        self.vector_db.delete_documents(ids)
+
+    def export_documents(self) -> List[Document]:
+        """
+        Return the partition's documents with their embeddings.
+        """
+        return [
+            document for document in self.vector_db.export_documents()
+            if all(document.meta_data.get(key) == value for key, value in self.partition.items())
+        ]
+
+    def import_documents(self, documents: List[Document]) -> None:
+        self.vector_db.import_documents(self._tagged(documents))
+
+    def drop(self) -> None:
+        """
+        Delete the partition's documents; the shared collection is kept.
+        """
+        self.vector_db.delete_where(self.partition)
+
+    async def async_drop(self) -> None:
+        await asyncio.to_thread(self.drop)
+
+    def exists(self) -> bool:
+        return self.vector_db.exists()
+
+    async def async_exists(self) -> bool:
+        return await asyncio.to_thread(self.exists)
+
+    def delete(self) -> bool:
+        self.drop()
+        return True
+
+def migrate_collections(
+    shared: VectorDb,
+    team_collection: str,
+    open_collection: Callable[[str], VectorDb],
+) -> int:
+    """
+    Move the documents of every other collection of the store into the shared one, tagged
+    with their partition, and drop the old collections. A collection is named after its
+    agent, except the team collection, whose documents name their agent.
+
+    Returns:
+        int: Number of documents moved.
+    """
+    moved = 0
+    for collection in shared.collections():
+        if collection == shared.collection_name:
+            continue
+        legacy = open_collection(collection)
+        with timed("knowledge.migrate", collection=collection) as span:
+            documents = legacy.export_documents()
+            for document in documents:
+                if collection == team_collection:
+                    agent = document.meta_data.get("agent") or document.name
+                    document.meta_data = {**document.meta_data, "level": TEAM_LEVEL}
+                    if agent:
+                        document.meta_data["agent"] = agent
+                else:
+                    document.meta_data = {**document.meta_data, "agent": collection, "level": MEMBER_LEVEL}
+            shared.import_documents(documents)
+            span["rows"] = len(documents)
+        try:
+            legacy.drop()
+        except Exception as e:
+            # Another process migrating at the same time may have dropped it first
+            logger.warning(f"Could not drop migrated collection {collection}: {e}")
+        logger.info(f"Moved {len(documents)} documents of collection {collection} to {shared.collection_name}")
+        moved += len(documents)
+    return moved
@@ -0,0 +1,404 @@
+"""
+This module provides the embedder used by the knowledge bases and an in-process
+vector store, with timings for embedding calls and vector searches.
+
+`NumpyVectorDb` keeps each collection in a directory holding a float32 matrix of
+normalized embeddings, memory-mapped on search, and a JSON index with the
+documents' ids, contents and metadata. Collections of a few thousand vectors are
+searched with one matrix-vector product, without a database client to start.
+The Chroma store lives in `store.chroma`.
+"""
+
+import asyncio
+import fcntl
+import json
+import os
+import shutil
+import threading
+import uuid
+from dataclasses import dataclass
+from hashlib import md5
+from os.path import join
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+from agno.document import Document
+from agno.embedder import Embedder
+from agno.embedder.openai import OpenAIEmbedder
+from agno.reranker.base import Reranker
+from agno.utils.log import log_debug, logger
+from agno.vectordb.base import VectorDb
+
+from instrument import timed
+
+# Vector backends selectable with DATA_AI_VECTOR_BACKEND
+VECTOR_BACKENDS = ("chroma", "numpy")
+
+# OpenAI embedder that records each embedding request as a stage
+@dataclass
+class TimedOpenAIEmbedder(OpenAIEmbedder):
+    def response(self, text: str):
+        with timed("knowledge.embed", model=self.id, bytes=len(text)) as span:
+            response = super().response(text=text)
+            if response.usage is not None:
+                span["prompt_tokens"] = response.usage.prompt_tokens
+        return response
+
+def _matches(meta_data: Dict[str, Any], filters: Optional[Dict[str, Any]]) -> bool:
+    """
+    Whether a document's metadata has every filter value; a list value matches any of its items.
+    """
+    for key, value in (filters or {}).items():
+        if isinstance(value, (list, tuple, set)):
+            if meta_data.get(key) not in value:
+                return False
+        elif meta_data.get(key) != value:
+            return False
+    return True
+
+class NumpyVectorDb(VectorDb):
+    """
+    Vector store keeping a collection as a memory-mapped NumPy matrix, searched by cosine similarity.
+
+    Writers rewrite the matrix to a new file and then atomically replace the JSON index that
+    names it, under a file lock, so concurrent processes (the chat and a background worker)
+    never see a half-written collection. Readers reload the collection when the index changes,
+    under a shared lock so the previous matrix file is not removed before it is mapped.
+    """
+
+    def __init__(
+        self,
+        collection: str,
+        path: str,
+        embedder: Optional[Embedder] = None,
+        reranker: Optional[Reranker] = None,
+    ):
+        self.collection_name = collection
+        self.path = join(path, collection)
+        self.embedder: Embedder = embedder or OpenAIEmbedder()
+        self.reranker = reranker
+
+        self._lock = threading.Lock()
+        # Index entries and the normalized matrix, as of the loaded index version
+        self._entries: List[Dict[str, Any]] = []
+        self._matrix = np.empty((0, 0), dtype=np.float32)
+        self._version: Optional[tuple] = None
+
+    @property
+    def _index_file(self) -> str:
+        return join(self.path, "index.json")
+
+    def _load(self, locked: bool = False):
+        """
+        Load the index and map the matrix if the index changed since the last load.
+
+        Readers load under a shared lock, so a writer cannot remove the vectors file the index
+        names before it is mapped; writers call this with the exclusive lock held (`locked`).
+        """
+        try:
+            stat = os.stat(self._index_file)
+        except FileNotFoundError:
+            self._entries, self._matrix, self._version = [], np.empty((0, 0), dtype=np.float32), None
+            return
+        # The index is replaced on every write, so a new inode or mtime means a new version
+        if (stat.st_ino, stat.st_mtime_ns) == self._version:
+            return
+        if locked:
+            self._map()
+            return
+        try:
+            lock = open(join(self.path, ".lock"), "a")
+        except FileNotFoundError:
+            # Dropped since the index was found
+            self._entries, self._matrix, self._version = [], np.empty((0, 0), dtype=np.float32), None
+            return
+        with lock:
+            fcntl.flock(lock, fcntl.LOCK_SH)
+            self._map()
+
+    def _map(self):
+        """
+        Read the index and map the matrix it names.
+        """
+        try:
+            stat = os.stat(self._index_file)
+            with open(self._index_file) as f:
+                index = json.load(f)
+            entries = index["documents"]
+            if entries:
+                matrix = np.memmap(join(self.path, index["vectors"]), dtype=np.float32, mode="r",
+                                   shape=(len(entries), index["dimensions"]))
+            else:
+                matrix = np.empty((0, index["dimensions"]), dtype=np.float32)
+        except FileNotFoundError:
+            # The collection was dropped while loading
+            self._entries, self._matrix, self._version = [], np.empty((0, 0), dtype=np.float32), None
+            return
+        self._entries, self._matrix, self._version = entries, matrix, (stat.st_ino, stat.st_mtime_ns)
+
+    def _write(self, entries: List[Dict[str, Any]], matrix: np.ndarray):
+        """
+        Write a new matrix file, point the index at it and remove the previous one.
+        """
+        previous = None
+        if os.path.exists(self._index_file):
+            with open(self._index_file) as f:
+                previous = json.load(f).get("vectors")
+        vectors = f"vectors-{uuid.uuid4().hex[:12]}.f32"
+        np.ascontiguousarray(matrix, dtype=np.float32).tofile(join(self.path, vectors))
+        temp = self._index_file + ".tmp"
+        with open(temp, "w") as f:
+            json.dump({"vectors": vectors, "dimensions": int(matrix.shape[1]), "documents": entries}, f)
+        os.replace(temp, self._index_file)
+        # Processes that mapped the previous file keep reading it until they reload
+        if previous and previous != vectors and os.path.exists(join(self.path, previous)):
+            os.remove(join(self.path, previous))
+
+    def _store(self, documents: List[Document], filters: Optional[Dict[str, Any]], replace: bool):
+        """
+        Embed documents and add them to the collection; with `replace`, documents whose id
+        (or content, for documents without id) is already stored are replaced.
+        """
+        for document in documents:
+            document.embed(embedder=self.embedder)
+        self._put(documents, filters, replace)
+
+    def _put(self, documents: List[Document], filters: Optional[Dict[str, Any]], replace: bool):
+        """
+        Add embedded documents to the collection.
+        """
+        rows: Dict[str, Any] = {}
+        for document in documents:
+            content = document.content.replace("\x00", "\ufffd")
+            doc_id = document.id or md5(content.encode()).hexdigest()
+            vector = np.asarray(document.embedding, dtype=np.float32)
+            norm = np.linalg.norm(vector)
+            rows[doc_id] = (
+                {"id": doc_id, "name": document.name, "content": content, "meta_data": {**(filters or {}), **document.meta_data}},
+                vector / norm if norm else vector,
+            )
+            log_debug(f"Stored document: {doc_id} | {document.name} | {document.meta_data}")
+        if not rows:
+            return
+
+        self.create()
+        with self._lock, open(join(self.path, ".lock"), "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            self._load(locked=True)
+            if replace:
+                kept = [i for i, entry in enumerate(self._entries) if entry["id"] not in rows]
+            else:
+                stored = {entry["id"] for entry in self._entries}
+                rows = {doc_id: row for doc_id, row in rows.items() if doc_id not in stored}
+                kept = list(range(len(self._entries)))
+            if not rows:
+                return
+            new_vectors = [vector for _, vector in rows.values()]
+            dimensions = len(new_vectors[0])
+            if self._entries and self._matrix.shape[1] != dimensions:
+                raise ValueError(
+                    f"Collection {self.collection_name} holds {self._matrix.shape[1]}-dimensional vectors, got {dimensions}"
+                )
+            entries = [self._entries[i] for i in kept] + [entry for entry, _ in rows.values()]
+            matrix = np.vstack([np.asarray(self._matrix[kept]).reshape(len(kept), dimensions)] + [v[None, :] for v in new_vectors])
+            self._write(entries, matrix)
+            self._load(locked=True)
+
+    def _remove(self, removed: Callable[[Dict[str, Any]], bool]):
+        """
+        Rewrite the collection without the index entries for which `removed` is true.
+        """
+        if not self.exists():
+            return
+        with self._lock, open(join(self.path, ".lock"), "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            self._load(locked=True)
+            kept = [i for i, entry in enumerate(self._entries) if not removed(entry)]
+            if len(kept) == len(self._entries):
+                return
+            dimensions = self._matrix.shape[1]
+            self._write([self._entries[i] for i in kept], np.asarray(self._matrix[kept]).reshape(len(kept), dimensions))
+            self._load(locked=True)
+
+    def delete_where(self, filters: Dict[str, Any]) -> None:
+        """
+        Delete the documents whose metadata matches `filters`.
+        """
+        self._remove(lambda entry: _matches(entry["meta_data"], filters))
+
+    def delete_documents(self, ids: List[str]) -> None:
+        """
+        Delete documents by ID.
+        """
+        ids = set(ids)
+        self._remove(lambda entry: entry["id"] in ids)
+
+    def compact(self) -> None:
+        """
+        Remove files left in the collection directory by interrupted writes.
+        """
+        if not self.exists():
+            return
+        with self._lock, open(join(self.path, ".lock"), "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            self._load(locked=True)
+            keep = {"index.json", ".lock"}
+            if os.path.exists(self._index_file):
+                with open(self._index_file) as f:
+                    keep.add(json.load(f)["vectors"])
+            for name in os.listdir(self.path):
+                if name not in keep:
+                    log_debug(f"Removing stale file: {join(self.path, name)}")
+                    os.remove(join(self.path, name))
+
+    def export_documents(self) -> List[Document]:
+        """
+        Return every document of the collection with its (normalized) embedding and metadata.
+        """
+        with self._lock:
+            self._load()
+            entries, matrix = self._entries, self._matrix
+        return [
+            Document(id=entry["id"], name=entry["name"], content=entry["content"], meta_data=dict(entry["meta_data"]),
+                     embedding=matrix[i].tolist())
+            for i, entry in enumerate(entries)
+        ]
+
+    def import_documents(self, documents: List[Document]) -> None:
+        """
+        Upsert documents that already carry their embeddings, keeping their IDs; nothing is re-embedded.
+        """
+        with timed("knowledge.upsert", collection=self.collection_name, rows=len(documents)):
+            self._put(documents, None, replace=True)
+
+    def collections(self) -> List[str]:
+        """
+        Names of all collections stored next to this one.
+        """
+        root = os.path.dirname(self.path)
+        if not os.path.isdir(root):
+            return []
+        return sorted(name for name in os.listdir(root) if os.path.isfile(join(root, name, "index.json")))
+
+    def create(self) -> None:
+        os.makedirs(self.path, exist_ok=True)
+
+    async def async_create(self) -> None:
+        await asyncio.to_thread(self.create)
+
+    def doc_exists(self, document: Document) -> bool:
+        with self._lock:
+            self._load()
+            content = document.content.replace("\x00", "\ufffd")
+            return any(entry["content"] == content for entry in self._entries)
+
+    async def async_doc_exists(self, document: Document) -> bool:
+        return await asyncio.to_thread(self.doc_exists, document)
+
+    def name_exists(self, name: str) -> bool:
+        with self._lock:
+            self._load()
+            return any(entry["name"] == name for entry in self._entries)
+
+    async def async_name_exists(self, name: str) -> bool:
+        return await asyncio.to_thread(self.name_exists, name)
+
+    def id_exists(self, id: str) -> bool:
+        with self._lock:
+            self._load()
+            return any(entry["id"] == id for entry in self._entries)
+
+    def insert(self, documents: List[Document], filters: Optional[Dict[str, Any]] = None) -> None:
+        with timed("knowledge.insert", collection=self.collection_name, rows=len(documents)):
+            self._store(documents, filters, replace=False)
+
+    async def async_insert(self, documents: List[Document], filters: Optional[Dict[str, Any]] = None) -> None:
+        await asyncio.to_thread(self.insert, documents, filters)
+
+    def upsert_available(self) -> bool:
+        return True
+
+    def upsert(self, documents: List[Document], filters: Optional[Dict[str, Any]] = None) -> None:
+        with timed("knowledge.upsert", collection=self.collection_name, rows=len(documents)):
+            self._store(documents, filters, replace=True)
+
+    async def async_upsert(self, documents: List[Document], filters: Optional[Dict[str, Any]] = None) -> None:
+        await asyncio.to_thread(self.upsert, documents, filters)
+
+    def search(self, query: str, limit: int = 5, filters: Optional[Dict[str, Any]] = None) -> List[Document]:
+        """
+        Return the `limit` documents most similar to the query, among those whose metadata matches `filters`.
+        Each result's metadata carries its cosine distance as 'distances', as with Chroma.
+        """
+        with timed("knowledge.search", collection=self.collection_name) as span:
+            with self._lock:
+                self._load()
+                entries, matrix = self._entries, self._matrix
+            if not entries:
+                span["rows"] = 0
+                return []
+            embedding = self.embedder.get_embedding(query)
+            if not embedding:
+                logger.error(f"Error getting embedding for Query: {query}")
+                return []
+            vector = np.asarray(embedding, dtype=np.float32)
+            norm = np.linalg.norm(vector)
+            scores = matrix @ (vector / norm if norm else vector)
+            if filters:
+                mask = np.fromiter((_matches(entry["meta_data"], filters) for entry in entries), dtype=bool, count=len(entries))
+                scores = np.where(mask, scores, -np.inf)
+                candidates = int(mask.sum())
+            else:
+                candidates = len(entries)
+            k = min(limit, candidates)
+            if k <= 0:
+                span["rows"] = 0
+                return []
+            top = np.argpartition(-scores, k - 1)[:k] if k < len(entries) else np.arange(len(entries))
+            top = top[np.argsort(-scores[top], kind="stable")][:k]
+
+            results = []
+            for i in top:
+                entry = entries[i]
+                results.append(Document(
+                    id=entry["id"],
+                    name=entry["name"],
+                    content=entry["content"],
+                    meta_data={**entry["meta_data"], "distances": float(1.0 - scores[i])},
+                    embedding=matrix[i].tolist(),
+                ))
+            span["rows"] = len(results)
+        if self.reranker:
+            results = self.reranker.rerank(query=query, documents=results)
+        return results
+
+    async def async_search(self, query: str, limit: int = 5, filters: Optional[Dict[str, Any]] = None) -> List[Document]:
+        return await asyncio.to_thread(self.search, query, limit, filters)
+
+    def drop(self) -> None:
+        if self.exists():
+            log_debug(f"Deleting collection: {self.collection_name}")
+            with self._lock:
+                shutil.rmtree(self.path, ignore_errors=True)
+                self._load()
+
+    async def async_drop(self) -> None:
+        await asyncio.to_thread(self.drop)
+
+    def exists(self) -> bool:
+        return os.path.isdir(self.path)
+
+    async def async_exists(self) -> bool:
+        return await asyncio.to_thread(self.exists)
+
+    def get_count(self) -> int:
+        with self._lock:
+            self._load()
+            return len(self._entries)
+
+    def optimize(self) -> None:
+        pass
+
+    def delete(self) -> bool:
+        self.drop()
+        return True
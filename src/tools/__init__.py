@@ -0,0 +1,22 @@
+"""
+This module exposes the custom toolkits used by the data team and its members.
+
+Each toolkit wraps a capability the stock agno tools do not provide:
+- Dispatching independent tasks to several team members concurrently
+- Joining result sets from several databases in a local in-memory engine
+- Running member SQL through a validated, instrumented execution path
+- Looking up join paths between tables in a precomputed graph
+"""
+
+from tools.dispatch import MemberDispatchTools  # Runs member tasks in parallel with per-member timeouts
+from tools.federation import FederationTools     # Loads member results into local tables for cross-database joins
+from tools.sql import DatabaseSQLTools            # SQLTools for one registered database
+from tools.joins import JoinGraph, JoinPathTools   # Shortest join paths over foreign keys and inferred relationships
+
+__all__ = [
+    "MemberDispatchTools",
+    "FederationTools",
+    "DatabaseSQLTools",
+    "JoinGraph",
+    "JoinPathTools",
+]
@@ -0,0 +1,247 @@
+"""
+This module provides a team-level toolkit that lets the coordinator dispatch
+independent tasks to several members at once instead of one after another.
+"""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from textwrap import dedent
+from typing import Dict, List
+
+from agno.agent import Agent
+from agno.tools import Toolkit
+from agno.utils.log import log_debug, logger
+
+from constants import (
+    MAX_PARALLEL_MEMBERS,
+    MEMBER_TIMEOUT_SECONDS,
+)
+
+# Represents the outcome of one delegated task, including how long the member took
+@dataclass
+class MemberResult:
+    member_id: str
+    step: int
+    task: str
+    content: str
+    elapsed: float
+    status: str = "ok"
+
+class MemberDispatchTools(Toolkit):
+    """
+    Toolkit used by the team leader in coordinate mode to run member tasks concurrently.
+
+    Tasks are grouped by `step`: every task in a step runs in parallel (tasks sent to the
+    same member run in order on one worker, since an Agent is not thread-safe), and steps
+    run one after another so dependent work still sees the results it needs.
+
+    Each member gets `timeout` seconds from the moment its tasks start; members still queued
+    behind the worker limit when `timeout` has passed are not started. A member that timed out
+    keeps running in the background and is not dispatched again until it has finished.
+    """
+
+    def __init__(
+        self,
+        timeout: float = MEMBER_TIMEOUT_SECONDS,
+        max_workers: int = MAX_PARALLEL_MEMBERS,
+    ):
+        super().__init__(
+            name="member_dispatch_tools",
+            instructions=dedent("""\
+                When several members can work independently (for example, each database agent answering its own part of the question),
+                use `run_members_in_parallel` to send all of those tasks in one call instead of transferring them one at a time.
+                If a task needs the result of another task, give it a higher `step` number; its task description will receive the earlier results.
+                Report the per-member timings returned by the tool at the end of your answer.
+            """),
+            add_instructions=True,
+        )
+        self.timeout = timeout
+        self.max_workers = max_workers
+        # The Team is attached after construction because the team needs the toolkit first
+        self.team = None
+        # Runs of members that timed out and may still be running, by member ID
+        self._abandoned: Dict[str, Future] = {}
+        self.register(self.run_members_in_parallel)
+
+    def run_members_in_parallel(self, tasks: List[Dict[str, str]]) -> str:
+        """Use this function to dispatch several tasks to team members at the same time.
+
+        Args:
+            tasks (List[Dict[str, str]]): The tasks to run. Each task has the keys `member_id`, `task_description`,
+                and optionally `expected_output` and `step` (a number; tasks with the same step run in parallel,
+                higher steps run afterwards and receive the results of earlier steps).
+
+        Returns:
+            str: The result of every task, with the time each member took.
+        """
+        if self.team is None:
+            return "Member dispatch is not attached to a team."
+        if not tasks:
+            return "No tasks were provided."
+
+        steps: Dict[int, List[Dict[str, str]]] = {}
+        for task in tasks:
+            try:
+                step = int(task.get("step") or 1)
+            except ValueError:
+                step = 1
+            steps.setdefault(step, []).append(task)
+
+        started = time.perf_counter()
+        results: List[MemberResult] = []
+        for step in sorted(steps):
+            results.extend(self._run_step(step, steps[step], previous=list(results)))
+        wall = time.perf_counter() - started
+
+        return self._format_results(results, wall)
+
+    def _run_step(self, step: int, tasks: List[Dict[str, str]], previous: List[MemberResult]) -> List[MemberResult]:
+        """
+        Run every task of one step concurrently, one worker per member.
+        """
+        # Group tasks by member so the same Agent is never run from two threads
+        by_member: Dict[str, List[Dict[str, str]]] = {}
+        for task in tasks:
+            by_member.setdefault(task.get("member_id", ""), []).append(task)
+
+        results: List[MemberResult] = []
+        for member_id in list(by_member):
+            abandoned = self._abandoned.get(member_id)
+            if abandoned is None:
+                continue
+            if abandoned.done():
+                del self._abandoned[member_id]
+                continue
+            results.extend(
+                MemberResult(member_id, step, task.get("task_description", ""),
+                             "The member is still working on an earlier task that timed out; try again later.", 0.0, "busy")
+                for task in by_member.pop(member_id)
+            )
+        if not by_member:
+            return results
+
+        started: Dict[str, float] = {}
+
+        def run(member_id: str, member_tasks: List[Dict[str, str]]) -> List[MemberResult]:
+            started[member_id] = time.perf_counter()
+            return self._run_member_tasks(member_id, step, member_tasks, previous)
+
+        executor = ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(by_member))))
+        futures = {
+            executor.submit(run, member_id, member_tasks): (member_id, member_tasks)
+            for member_id, member_tasks in by_member.items()
+        }
+        step_started = time.perf_counter()
+        pending = set(futures)
+        timed_out = set()
+
+        def deadline(future: Future) -> float:
+            # A member's deadline runs from its start; queued members wait at most one timeout to start
+            return started.get(futures[future][0], step_started) + self.timeout
+
+        while pending:
+            next_deadline = min(deadline(future) for future in pending)
+            done, _ = wait(pending, timeout=max(0.0, next_deadline - time.perf_counter()), return_when=FIRST_COMPLETED)
+            now = time.perf_counter()
+            expired = {future for future in pending - done if deadline(future) <= now}
+            pending -= done | expired
+            timed_out |= expired
+
+        for future, (member_id, member_tasks) in futures.items():
+            if future not in timed_out:
+                try:
+                    results.extend(future.result())
+                except Exception as e:
+                    logger.error(f"Member {member_id} failed: {e}")
+                    results.append(MemberResult(member_id, step, member_tasks[0].get("task_description", ""), str(e), 0.0, "error"))
+            elif future.cancel():
+                results.extend(
+                    MemberResult(member_id, step, task.get("task_description", ""),
+                                 f"Not started within {self.timeout:g}s; too many members were busy.", self.timeout, "timeout")
+                    for task in member_tasks
+                )
+            else:
+                self._abandoned[member_id] = future
+                results.extend(
+                    MemberResult(member_id, step, task.get("task_description", ""),
+                                 f"No answer within {self.timeout:g}s.", self.timeout, "timeout")
+                    for task in member_tasks
+                )
+        # Do not block on timed-out members; their threads finish in the background
+        executor.shutdown(wait=False)
+
+        for member_id in {r.member_id for r in results if r.status == "ok"}:
+            self._record_member_run(member_id)
+        return results
+
+    def _run_member_tasks(
+        self,
+        member_id: str,
+        step: int,
+        tasks: List[Dict[str, str]],
+        previous: List[MemberResult],
+    ) -> List[MemberResult]:
+        """
+        Run the tasks assigned to one member in order and time each of them.
+        """
+        found = self.team._find_member_by_id(member_id)
+        if found is None:
+            return [
+                MemberResult(member_id, step, task.get("task_description", ""),
+                             f"Member with ID {member_id} not found in the team.", 0.0, "error")
+                for task in tasks
+            ]
+        _, member = found
+        self.team._initialize_member(member, session_id=self.team.session_id)
+
+        results: List[MemberResult] = []
+        for task in tasks:
+            message = self._member_message(task, previous)
+            log_debug(f"Dispatching step {step} task to {member_id}")
+            started = time.perf_counter()
+            response = member.run(message, stream=False)
+            elapsed = time.perf_counter() - started
+            content = response.content if response is not None and response.content is not None else "No response from the member agent."
+            results.append(MemberResult(member_id, step, task.get("task_description", ""), str(content), elapsed))
+        return results
+
+    def _member_message(self, task: Dict[str, str], previous: List[MemberResult]) -> str:
+        """
+        Build the message sent to a member, including results of earlier steps.
+        """
+        message = "You are a member of a team of agents. Your goal is to complete the following task:"
+        message += f"\n\n<task>\n{task.get('task_description', '')}\n</task>"
+        if task.get("expected_output"):
+            message += f"\n\n<expected_output>\n{task['expected_output']}\n</expected_output>"
+        if previous:
+            message += "\n\n<previous_results>"
+            for result in previous:
+                message += f"\n[{result.member_id}] {result.task}\n{result.content}\n"
+            message += "</previous_results>"
+        return message
+
+    def _record_member_run(self, member_id: str) -> None:
+        """
+        Attach a finished member run to the team run so it shows up with `show_members_responses`.
+        """
+        found = self.team._find_member_by_id(member_id)
+        run_response = getattr(self.team, "run_response", None)
+        if found is None or run_response is None:
+            return
+        member: Agent = found[1]
+        if member.run_response is not None:
+            run_response.add_member_run(member.run_response)
+
+    @staticmethod
+    def _format_results(results: List[MemberResult], wall: float) -> str:
+        """
+        Render results and per-member timings as markdown for the leader.
+        """
+        sequential = sum(r.elapsed for r in results)
+        lines = [f"Dispatched {len(results)} task(s): {wall:.2f}s wall time ({sequential:.2f}s if run sequentially)."]
+        for r in results:
+            lines.append(f"\n### {r.member_id} (step {r.step}, {r.elapsed:.2f}s, {r.status})\n{r.content}")
+        lines.append("\nTimings:")
+        lines.extend(f"- {r.member_id} step {r.step}: {r.elapsed:.2f}s ({r.status})" for r in results)
+        return "\n".join(lines)
@@ -0,0 +1,255 @@
+"""
+This module provides a toolkit that joins data from several databases locally.
+
+Instead of passing ID lists between agents as text, the team pulls each member's
+result set into an in-memory SQLite database as a temporary table and runs the
+join or aggregation there, so only the final result goes back through the model.
+
+Source queries go through the member's own checks first (`DatabaseSQLTools`): they
+must be read-only, are validated against the schema snapshot and estimated by the
+preflight guard, exactly like the queries the member runs itself. Local queries must
+be a single read-only statement, and the local engine denies ATTACH, DETACH and pragma
+writes, so model-written SQL cannot reach files on disk.
+"""
+
+import json
+import re
+import sqlite3
+import threading
+from datetime import date, datetime, time
+from decimal import Decimal
+from textwrap import dedent
+from typing import Any, Dict, List, Optional
+from uuid import uuid4
+
+from agno.tools import Toolkit
+from agno.utils.log import log_debug, logger
+from sqlalchemy import text
+
+from constants import (
+    FEDERATION_FETCH_SIZE,
+    FEDERATION_MAX_ROWS,
+)
+from tools.sql import DatabaseSQLTools
+from tools.validation import validate
+
+# Local table names must be plain identifiers since they are interpolated into DDL
+_TABLE_NAME = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+# Prefix of the tables results are streamed into before they replace the requested table
+_STAGING_PREFIX = "__staging_"
+
+def _authorize(action: int, arg1: Optional[str], arg2: Optional[str], database: Optional[str], trigger: Optional[str]) -> int:
+    """
+    SQLite authorizer of the local engine: model-written SQL must not reach files on disk
+    or change the connection, so ATTACH, DETACH and pragma writes are denied.
+    """
+    if action in (sqlite3.SQLITE_ATTACH, sqlite3.SQLITE_DETACH):
+        return sqlite3.SQLITE_DENY
+    # A pragma with an argument sets it (PRAGMA x = v, PRAGMA x(v)); the toolkit reads none itself
+    if action == sqlite3.SQLITE_PRAGMA and arg2 is not None:
+        return sqlite3.SQLITE_DENY
+    return sqlite3.SQLITE_OK
+
+def _to_sqlite_value(value: Any) -> Any:
+    """
+    Convert a driver value into a type SQLite can store.
+    """
+    if value is None or isinstance(value, (int, float, str, bytes)):
+        return value
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    return str(value)
+
+def _local_columns(keys: List[str]) -> List[str]:
+    """
+    Make result column names unique so they can be used as local column names.
+    """
+    columns: List[str] = []
+    for key in keys:
+        name, suffix = key, 1
+        while name in columns:
+            suffix += 1
+            name = f"{key}_{suffix}"
+        columns.append(name)
+    return columns
+
+class FederationTools(Toolkit):
+    """
+    Toolkit that loads query results from registered databases into a local
+    in-memory SQLite engine and runs cross-database joins there.
+    """
+
+    def __init__(
+        self,
+        sources: Dict[str, DatabaseSQLTools],
+        max_rows: int = FEDERATION_MAX_ROWS,
+        fetch_size: int = FEDERATION_FETCH_SIZE,
+    ):
+        super().__init__(
+            name="federation_tools",
+            instructions=dedent("""\
+                When a question needs data from more than one database, do not pass lists of IDs between members.
+                Instead, use `load_query_result` to pull each database's rows into a local table, then use `run_local_query`
+                to join and aggregate them with SQLite syntax. Only the final result should be returned to the user.
+            """),
+            add_instructions=True,
+        )
+        self.sources = sources
+        self.max_rows = max_rows
+        self.fetch_size = fetch_size
+        # One shared connection; tools may be called from several member threads.
+        # The lock is held per statement, not while source rows are fetched
+        self.conn = sqlite3.connect(":memory:", check_same_thread=False)
+        self.conn.set_authorizer(_authorize)
+        self.lock = threading.Lock()
+
+        self.register(self.list_databases)
+        self.register(self.load_query_result)
+        self.register(self.list_local_tables)
+        self.register(self.run_local_query)
+
+    def list_databases(self) -> str:
+        """Use this function to get the names of the databases that results can be loaded from.
+
+        Returns:
+            str: JSON list of database names.
+        """
+        return json.dumps(sorted(self.sources))
+
+    def load_query_result(self, database: str, query: str, table_name: str) -> str:
+        """Use this function to run a query on one database and store its rows in a local table for joining.
+
+        Args:
+            database (str): Name of the database to query, as returned by `list_databases`.
+            query (str): The SQL query to run on that database, in its own dialect.
+            table_name (str): Name of the local table that will hold the rows (replaced if it exists).
+
+        Returns:
+            str: The number of rows loaded and the columns of the local table.
+        """
+        if database not in self.sources:
+            return f"Unknown database '{database}'. Available: {', '.join(sorted(self.sources))}"
+        if not _TABLE_NAME.match(table_name):
+            return f"Invalid table name '{table_name}'. Use letters, digits and underscores only."
+        if table_name.startswith(_STAGING_PREFIX):
+            return f"Invalid table name '{table_name}'. Names starting with {_STAGING_PREFIX} are reserved."
+
+        source = self.sources[database]
+        errors = source.validate_query(query, read_only=True)
+        if errors:
+            return "Query rejected before execution:\n- " + "\n- ".join(errors)
+        sql, note = source.check_query(query, limit=self.max_rows)
+        if sql is None:
+            return note
+
+        try:
+            log_debug(f"Loading result of {database} into local table {table_name}")
+            rows_loaded, columns, truncated = self._load(source, sql, table_name)
+        except Exception as e:
+            logger.error(f"Error loading query result: {e}")
+            return f"Error loading query result: {e}"
+
+        message = f"Loaded {rows_loaded} rows into `{table_name}` with columns: {', '.join(columns)}."
+        if note:
+            message += f" {note}"
+        if truncated:
+            message += f" Result was truncated at {self.max_rows} rows; filter the source query to load everything."
+        return message
+
+    def _load(self, source: DatabaseSQLTools, query: str, table_name: str):
+        """
+        Stream the query result into a staging table in batches, then replace the requested table with it.
+        Other loads and local queries proceed while the source is read.
+        """
+        staging = f"{_STAGING_PREFIX}{uuid4().hex}"
+        try:
+            with source.db_engine.connect() as conn:
+                result = conn.execution_options(stream_results=True).execute(text(query))
+                columns = _local_columns(list(result.keys()))
+                column_sql = ", ".join('"' + c.replace('"', '""') + '"' for c in columns)
+                placeholders = ", ".join("?" for _ in columns)
+
+                with self.lock:
+                    self.conn.execute(f'CREATE TABLE "{staging}" ({column_sql})')
+                    self.conn.commit()
+                rows_loaded = 0
+                truncated = False
+                while True:
+                    batch = result.fetchmany(self.fetch_size)
+                    if not batch:
+                        break
+                    if rows_loaded + len(batch) > self.max_rows:
+                        batch = batch[: self.max_rows - rows_loaded]
+                        truncated = True
+                    rows = [tuple(_to_sqlite_value(v) for v in row) for row in batch]
+                    with self.lock:
+                        self.conn.executemany(f'INSERT INTO "{staging}" VALUES ({placeholders})', rows)
+                        self.conn.commit()
+                    rows_loaded += len(batch)
+                    if truncated:
+                        break
+
+            with self.lock:
+                self.conn.execute(f'DROP TABLE IF EXISTS "{table_name}"')
+                self.conn.execute(f'ALTER TABLE "{staging}" RENAME TO "{table_name}"')
+                self.conn.commit()
+        except Exception:
+            with self.lock:
+                self.conn.execute(f'DROP TABLE IF EXISTS "{staging}"')
+                self.conn.commit()
+            raise
+        return rows_loaded, columns, truncated
+
+    def list_local_tables(self) -> str:
+        """Use this function to list the local tables loaded so far, with their row counts.
+
+        Returns:
+            str: JSON object mapping table name to row count.
+        """
+        with self.lock:
+            names = [
+                row[0] for row in self.conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+                if not row[0].startswith(_STAGING_PREFIX)
+            ]
+            counts = {name: self.conn.execute(f'SELECT COUNT(*) FROM "{name}"').fetchone()[0] for name in names}
+        return json.dumps(counts)
+
+    def run_local_query(self, query: str, limit: Optional[int] = 50) -> str:
+        """Use this function to join or aggregate the local tables using SQLite syntax.
+
+        Args:
+            query (str): The SQLite query to run against the local tables.
+            limit (int, optional): The number of rows to return. Defaults to 50.
+
+        Returns:
+            str: Result of the query as JSON.
+        """
+        # Local queries are read-only, like the queries run on the registered databases
+        try:
+            errors = validate(query, "sqlite")
+        except Exception as e:
+            errors = [f"The query could not be checked: {e}"]
+        if errors:
+            return "Query rejected before execution:\n- " + "\n- ".join(errors)
+        try:
+            return json.dumps(self.run_local(query, limit=limit), default=str)
+        except Exception as e:
+            logger.error(f"Error running local query: {e}")
+            return f"Error running local query: {e}"
+
+    def run_local(self, query: str, limit: Optional[int] = None) -> List[dict]:
+        """
+        Internal function to run a query on the local engine and return rows as dicts.
+        """
+        log_debug(f"Running local sql |\n{query}")
+        with self.lock:
+            cursor = self.conn.execute(query)
+            if cursor.description is None:
+                self.conn.commit()
+                return []
+            columns = [d[0] for d in cursor.description]
+            rows = cursor.fetchmany(limit) if limit else cursor.fetchall()
+        return [dict(zip(columns, row)) for row in rows]
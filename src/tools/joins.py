@@ -0,0 +1,263 @@
+"""
+This module provides a join-path graph over a database's tables and the toolkit
+that lets agents query it.
+
+Edges come from declared foreign keys and from relationships inferred from column
+names (`orders.user_id` -> `users.id`). The graph is built once when a database is
+added and stored with its entry; for schemas up to a size threshold, shortest
+paths between all table pairs are precomputed so lookups need no search.
+"""
+
+import heapq
+import json
+from typing import Dict, List, Optional, Tuple, Union
+
+from agno.tools import Toolkit
+from agno.utils.log import log_debug
+
+from constants import JOIN_GRAPH_ALL_PAIRS_MAX_TABLES
+
+# Declared relationships are preferred over inferred ones when both connect two tables
+_WEIGHTS = {"foreign key": 1.0, "inferred": 1.5}
+
+def _plural_forms(name: str) -> List[str]:
+    """
+    Table names a `<name>_id` column may refer to.
+    """
+    forms = [name, f"{name}s", f"{name}es"]
+    if name.endswith("y"):
+        forms.append(f"{name[:-1]}ies")
+    return forms
+
+class JoinGraph:
+    """
+    Undirected graph of tables connected by join conditions.
+
+    Attributes:
+        tables (List[str]): Table names.
+        edges (List[Dict]): Join conditions: `left`, `left_columns`, `right`, `right_columns`, `kind`.
+        paths (Dict[str, List[int]]): Precomputed shortest paths as edge indexes, keyed by 'a\\tb' with a < b.
+    """
+
+    def __init__(self, tables: List[str], edges: List[Dict], paths: Optional[Dict[str, List[int]]] = None):
+        self.tables = tables
+        self.edges = edges
+        self.paths = paths or {}
+        self._lookup = {table.lower(): table for table in tables}
+        self._adjacency: Dict[str, List[Tuple[str, int]]] = {table: [] for table in tables}
+        for index, edge in enumerate(edges):
+            self._adjacency[edge["left"]].append((edge["right"], index))
+            self._adjacency[edge["right"]].append((edge["left"], index))
+
+    @classmethod
+    def from_schema(cls, schema: Union[str, dict], max_tables: int = JOIN_GRAPH_ALL_PAIRS_MAX_TABLES) -> "JoinGraph":
+        """
+        Build the graph from the catalog JSON produced by `Database.to_json()`.
+        """
+        document = json.loads(schema) if isinstance(schema, str) else schema
+        tables = document.get("tables", [])
+        names = {table["name"].lower(): table["name"] for table in tables}
+        edges, seen = [], set()
+
+        def add(left: str, left_columns: List[str], right: str, right_columns: List[str], kind: str) -> None:
+            key = tuple(sorted([(left, tuple(left_columns)), (right, tuple(right_columns))]))
+            if left != right and key not in seen:
+                seen.add(key)
+                edges.append({"left": left, "left_columns": left_columns, "right": right, "right_columns": right_columns, "kind": kind})
+
+        for table in tables:
+            for fk in table.get("foreign_keys", []):
+                ref_table = names.get(fk["ref_table"].lower())
+                if ref_table:
+                    add(table["name"], fk["columns"], ref_table, fk["ref_columns"], "foreign key")
+
+        # Infer `<table>_id` references and shared single-column primary keys where nothing is declared
+        declared = {(table["name"], column) for table in tables for fk in table.get("foreign_keys", []) for column in fk["columns"]}
+        columns = {table["name"]: {column["name"].lower(): column["name"] for column in table.get("columns", [])} for table in tables}
+        primary_keys = {table["name"]: table.get("primary_key") or [] for table in tables}
+        for table in tables:
+            for column in table.get("columns", []):
+                name = column["name"]
+                if (table["name"], name) in declared or name in primary_keys[table["name"]]:
+                    continue
+                lowered = name.lower()
+                if lowered.endswith("_id"):
+                    for form in _plural_forms(lowered[:-3]):
+                        target = names.get(form)
+                        if target and "id" in columns[target]:
+                            add(table["name"], [name], target, [columns[target]["id"]], "inferred")
+                            break
+                for target, key in primary_keys.items():
+                    if target != table["name"] and len(key) == 1 and key[0].lower() == lowered and lowered != "id":
+                        add(table["name"], [name], target, key, "inferred")
+
+        graph = cls([table["name"] for table in tables], edges)
+        if len(tables) <= max_tables:
+            graph.paths = graph._all_pairs()
+        return graph
+
+    @classmethod
+    def from_json(cls, data: Union[str, dict, None]) -> Optional["JoinGraph"]:
+        """
+        Load a graph stored with `to_json`; returns None when nothing was stored.
+        """
+        if not data:
+            return None
+        document = json.loads(data) if isinstance(data, str) else data
+        return cls(document.get("tables", []), document.get("edges", []), document.get("paths", {}))
+
+    def to_json(self) -> str:
+        """
+        Serialize the graph, with its precomputed paths, for storage with the database entry.
+        """
+        return json.dumps({"tables": self.tables, "edges": self.edges, "paths": self.paths})
+
+    def find_table(self, name: str) -> Optional[str]:
+        """Return the graph's spelling of a table name, matched case-insensitively."""
+        return self._lookup.get(name.lower())
+
+    def shortest_path(self, source: str, target: str) -> Optional[List[int]]:
+        """
+        Edge indexes on the cheapest path between two tables, or None when they are not connected.
+        """
+        if source == target:
+            return []
+        key = "\t".join(sorted([source, target]))
+        if self.paths:
+            path = self.paths.get(key)
+            return None if path is None else (path if source < target else list(reversed(path)))
+        return self._dijkstra(source).get(target)
+
+    def _dijkstra(self, source: str) -> Dict[str, List[int]]:
+        """
+        Cheapest paths from one table to every reachable table.
+        """
+        best = {source: 0.0}
+        paths: Dict[str, List[int]] = {source: []}
+        queue = [(0.0, source)]
+        while queue:
+            cost, table = heapq.heappop(queue)
+            if cost > best.get(table, float("inf")):
+                continue
+            for neighbour, edge in self._adjacency[table]:
+                candidate = cost + _WEIGHTS.get(self.edges[edge]["kind"], 1.0)
+                if candidate < best.get(neighbour, float("inf")):
+                    best[neighbour] = candidate
+                    paths[neighbour] = paths[table] + [edge]
+                    heapq.heappush(queue, (candidate, neighbour))
+        return paths
+
+    def _all_pairs(self) -> Dict[str, List[int]]:
+        """
+        Shortest paths between every connected pair of tables, keyed by 'a\\tb' with a < b.
+        """
+        paths = {}
+        for source in self.tables:
+            for target, path in self._dijkstra(source).items():
+                if source < target:
+                    paths[f"{source}\t{target}"] = path
+        return paths
+
+    def join_tree(self, tables: List[str]) -> Tuple[List[int], List[str]]:
+        """
+        Connect a set of tables with few joins: starting from the first table, repeatedly
+        attach the closest remaining table through its shortest path to the tree.
+
+        Returns the edge indexes of the tree and the tables that could not be connected.
+        """
+        tree_tables = [tables[0]]
+        tree_edges: List[int] = []
+        remaining = [table for table in tables[1:] if table != tables[0]]
+        unreachable = []
+        while remaining:
+            best = None
+            for table in remaining:
+                for member in tree_tables:
+                    path = self.shortest_path(member, table)
+                    if path is not None and (best is None or len(path) < len(best[1])):
+                        best = (table, path)
+            if best is None:
+                unreachable.extend(remaining)
+                break
+            table, path = best
+            remaining.remove(table)
+            for edge in path:
+                if edge not in tree_edges:
+                    tree_edges.append(edge)
+                for name in (self.edges[edge]["left"], self.edges[edge]["right"]):
+                    if name not in tree_tables:
+                        tree_tables.append(name)
+            remaining = [t for t in remaining if t not in tree_tables]
+        return tree_edges, unreachable
+
+class JoinPathTools(Toolkit):
+    """
+    Toolkit exposing a database's join-path graph to its agent.
+
+    Attributes:
+        graph (JoinGraph): Precomputed graph for the database.
+    """
+
+    def __init__(self, graph: JoinGraph, **kwargs):
+        super().__init__(name="join_path_tools", **kwargs)
+        self.graph = graph
+        self.register(self.find_join_path)
+
+    def find_join_path(self, tables: List[str]) -> str:
+        """Use this function to find how to join a set of tables, before writing a multi-table query.
+
+        Returns JOIN clauses connecting all the tables through the fewest joins, using declared
+        foreign keys first and relationships inferred from column names otherwise. Intermediate
+        tables needed to connect them are included.
+
+        Args:
+            tables (List[str]): Names of the tables the query needs, e.g. ["customers", "products"].
+        Returns:
+            str: FROM/JOIN clauses, or the tables that could not be connected.
+        """
+        resolved, unknown = [], []
+        for name in tables:
+            found = self.graph.find_table(name)
+            if found is None:
+                unknown.append(name)
+            elif found not in resolved:
+                resolved.append(found)
+        if unknown:
+            return f"Unknown tables: {', '.join(unknown)}. Known tables: {', '.join(sorted(self.graph.tables))}."
+        if not resolved:
+            return "No tables given."
+
+        tree, unreachable = self.graph.join_tree(resolved)
+        log_debug(f"Join path for {resolved}: {len(tree)} joins, unreachable {unreachable}")
+
+        # Order joins so each one references a table that is already joined
+        lines = [f"FROM {resolved[0]}"]
+        joined, pending = {resolved[0]}, list(tree)
+        while pending:
+            progress = False
+            for edge_index in pending:
+                edge = self.graph.edges[edge_index]
+                if edge["left"] in joined and edge["right"] in joined:
+                    pending.remove(edge_index)
+                    progress = True
+                    break
+                if edge["left"] in joined or edge["right"] in joined:
+                    new, old = (edge["right"], edge["left"]) if edge["left"] in joined else (edge["left"], edge["right"])
+                    new_columns = edge["right_columns"] if new == edge["right"] else edge["left_columns"]
+                    old_columns = edge["left_columns"] if new == edge["right"] else edge["right_columns"]
+                    condition = " AND ".join(
+                        f"{new}.{n} = {old}.{o}" for n, o in zip(new_columns, old_columns)
+                    )
+                    lines.append(f"JOIN {new} ON {condition}  -- {edge['kind']}")
+                    joined.add(new)
+                    pending.remove(edge_index)
+                    progress = True
+                    break
+            if not progress:
+                break
+        if unreachable:
+            lines.append(
+                f"-- No known relationship connects {', '.join(unreachable)}; "
+                "ask the user for the join columns instead of guessing."
+            )
+        return "\n".join(lines)
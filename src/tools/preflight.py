@@ -0,0 +1,131 @@
+"""
+This module estimates the cost of agent-generated SQL before it is executed.
+
+Each dialect's EXPLAIN output is reduced to an estimated row count, an optional
+planner cost, and a short plan summary the agent can use to reformulate.
+"""
+
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Any, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+# Matches a LIMIT clause at the end of a statement, e.g. "LIMIT 10" or "LIMIT 10 OFFSET 5"
+_TRAILING_LIMIT = re.compile(r"\blimit\s+\d+(\s*(,|offset)\s*\d+)?\s*$", re.IGNORECASE)
+
+# Statements that can be explained; anything else is executed without a preflight
+_EXPLAINABLE = re.compile(r"^\s*(select|with)\b", re.IGNORECASE)
+
+@dataclass
+class QueryPlan:
+    """
+    Estimated cost of a query.
+
+    Attributes:
+        rows (float): Estimated rows produced (PostgreSQL) or read (MySQL, ClickHouse).
+        cost (float): Planner cost, when the dialect reports one.
+        summary (List[str]): One line per plan node or scanned table.
+    """
+    rows: float = 0
+    cost: Optional[float] = None
+    summary: List[str] = field(default_factory=list)
+
+    def describe(self) -> str:
+        """Render the estimates and plan summary for the agent."""
+        cost = f", estimated cost {self.cost:,.0f}" if self.cost is not None else ""
+        return f"estimated rows {self.rows:,.0f}{cost}\n" + "\n".join(self.summary)
+
+def strip_statement(sql: str) -> str:
+    """
+    Remove surrounding whitespace and trailing semicolons from a statement.
+    """
+    return sql.strip().rstrip(";").strip()
+
+def is_explainable(sql: str) -> bool:
+    """
+    Check whether a statement is a query that EXPLAIN can estimate.
+    """
+    return bool(_EXPLAINABLE.match(sql))
+
+def has_limit(sql: str) -> bool:
+    """
+    Check whether a statement already ends with a LIMIT clause.
+    """
+    return bool(_TRAILING_LIMIT.search(strip_statement(sql)))
+
+def with_limit(sql: str, limit: int) -> str:
+    """
+    Wrap a query so that at most `limit` rows are produced.
+    """
+    return f"SELECT * FROM (\n{strip_statement(sql)}\n) AS preflight_limited LIMIT {int(limit)}"
+
+def explain(conn: Connection, dialect: str, sql: str) -> Optional[QueryPlan]:
+    """
+    Run the dialect's EXPLAIN for a query and parse the estimates.
+
+    Returns None when the dialect has no usable estimates.
+    """
+    sql = strip_statement(sql)
+    if dialect == "postgresql":
+        return _explain_postgresql(conn, sql)
+    if dialect == "mysql":
+        return _explain_mysql(conn, sql)
+    if dialect == "clickhouse":
+        return _explain_clickhouse(conn, sql)
+    return None
+
+def _explain_postgresql(conn: Connection, sql: str) -> QueryPlan:
+    raw = conn.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+    document = json.loads(raw) if isinstance(raw, str) else raw
+    root = document[0]["Plan"]
+
+    # The root node's cost already accounts for LIMIT, so it is used rather than the largest scan
+    plan = QueryPlan(rows=root.get("Plan Rows", 0), cost=root.get("Total Cost"))
+
+    def walk(node: dict, depth: int) -> None:
+        relation = f" on {node['Relation Name']}" if node.get("Relation Name") else ""
+        plan.summary.append(f"{'  ' * depth}{node.get('Node Type')}{relation} (rows={node.get('Plan Rows')}, cost={node.get('Total Cost')})")
+        for child in node.get("Plans", []):
+            walk(child, depth + 1)
+
+    walk(root, 0)
+    return plan
+
+def _explain_mysql(conn: Connection, sql: str) -> QueryPlan:
+    raw = conn.execute(text(f"EXPLAIN FORMAT=JSON {sql}")).scalar()
+    document = json.loads(raw)
+    block = document.get("query_block", {})
+    cost = block.get("cost_info", {}).get("query_cost")
+    plan = QueryPlan(cost=float(cost) if cost is not None else None)
+
+    def walk(node: Any) -> None:
+        if isinstance(node, dict):
+            if "table_name" in node:
+                scanned = float(node.get("rows_examined_per_scan", 0) or 0)
+                produced = float(node.get("rows_produced_per_join", 0) or 0)
+                plan.rows = max(plan.rows, scanned, produced)
+                key = node.get("key") or "no index"
+                plan.summary.append(
+                    f"{node.get('access_type', '?')} on {node['table_name']} using {key} "
+                    f"(rows examined={scanned:,.0f}, produced={produced:,.0f})"
+                )
+            for value in node.values():
+                walk(value)
+        elif isinstance(node, list):
+            for value in node:
+                walk(value)
+
+    walk(block)
+    return plan
+
+def _explain_clickhouse(conn: Connection, sql: str) -> QueryPlan:
+    rows = conn.execute(text(f"EXPLAIN ESTIMATE {sql}")).fetchall()
+    plan = QueryPlan()
+    for row in rows:
+        database, table, parts, table_rows, marks = row[:5]
+        plan.rows += float(table_rows or 0)
+        plan.summary.append(f"read {int(table_rows or 0):,} rows from {database}.{table} ({parts} parts, {marks} marks)")
+    return plan
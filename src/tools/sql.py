@@ -0,0 +1,243 @@
+"""
+This module provides the SQL toolkit used by database member agents.
+
+It extends agno's SQLTools so every query executed by an agent goes through
+the platform's own execution path: local validation against the schema snapshot,
+an EXPLAIN-based cost preflight, then instrumented execution that can be
+cancelled on the server with Ctrl-C.
+"""
+
+import json
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from typing import Callable, List, Optional, Tuple, Union
+from uuid import uuid4
+
+from agno.tools.sql import SQLTools
+from agno.utils.log import log_debug, logger
+from sqlalchemy import text
+
+from config import Config
+from constants import INDEX_LINT_MIN_ROWS
+from db.engine import cancel_query, session_id
+from instrument import timed
+from tools.preflight import (
+    explain,
+    has_limit,
+    is_explainable,
+    with_limit,
+)
+from tools.validation import SchemaSnapshot, lint_indexes, validate
+
+class DatabaseSQLTools(SQLTools):
+    """
+    SQLTools for one registered database.
+
+    Attributes:
+        database (str): Name of the agent/database, used to label measurements.
+        snapshot (SchemaSnapshot): Tables and columns queries are validated against.
+        validation (bool): Parse and validate queries locally before running them.
+        preflight (bool): Estimate queries with EXPLAIN before running them.
+        max_rows (float): Estimated row count above which a query is rewritten or rejected.
+        max_cost (float): Planner cost above which a query is rewritten or rejected.
+        on_rejected (Callable): Called with the reason when validation rejects a query,
+            e.g. to escalate a model cascade.
+    """
+
+    def __init__(
+        self,
+        database: str = "",
+        snapshot: Union[str, dict, None] = None,
+        validation: Optional[bool] = None,
+        preflight: Optional[bool] = None,
+        max_rows: Optional[float] = None,
+        max_cost: Optional[float] = None,
+        on_rejected: Optional[Callable[[str], None]] = None,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        app_config = Config().app_config
+        self.database = database
+        # `schema` is agno's database schema name, passed to the inspector by describe_table/list_tables
+        self.snapshot = SchemaSnapshot.from_json(snapshot)
+        self.validation = app_config.validation_enabled if validation is None else validation
+        self.preflight = app_config.preflight_enabled if preflight is None else preflight
+        self.max_rows = max_rows or app_config.preflight_max_rows
+        self.max_cost = max_cost or app_config.preflight_max_cost
+        self.on_rejected = on_rejected
+
+    def run_sql_query(self, query: str, limit: Optional[int] = 10) -> str:
+        """Use this function to run a SQL query and return the result.
+
+        Args:
+            query (str): The query to run.
+            limit (int, optional): The number of rows to return. Defaults to 10. Use `None` to show all results.
+        Returns:
+            str: Result of the SQL query.
+        Notes:
+            - The result may be empty if the query does not return any data.
+            - Queries with syntax errors, unknown tables or columns, or writes are rejected before execution.
+            - Queries estimated to be too expensive are rejected with their plan so they can be reformulated.
+        """
+        errors = self.validate_query(query)
+        if errors:
+            if self.on_rejected is not None:
+                self.on_rejected(f"query rejected: {errors[0]}")
+            return "Query rejected before execution:\n- " + "\n- ".join(errors)
+
+        notes = self.lint_query(query)
+        sql, note = self.check_query(query, limit)
+        if note:
+            notes.append(note)
+        if sql is None:
+            return "\n".join(notes)
+        result = super().run_sql_query(query=sql, limit=limit)
+        return "\n".join(notes + [result]) if notes else result
+
+    def validate_query(self, query: str, read_only: bool = False) -> List[str]:
+        """
+        Parse a query locally and check it against the schema snapshot.
+
+        With `read_only`, the query is checked for writes even when validation is disabled,
+        and a query the validator cannot check is rejected.
+
+        Returns the errors to report to the agent; empty when the query may run.
+        """
+        if not self.validation and not read_only:
+            return []
+
+        dialect = self.db_engine.dialect.name
+        try:
+            with timed("sql.validate", database=self.database, dialect=dialect) as span:
+                errors = validate(query, dialect, self.snapshot if self.validation else None)
+                span["rejected"] = 1 if errors else 0
+        except Exception as e:
+            if read_only:
+                return [f"The query could not be checked: {e}"]
+            # A validator failure must not block the query; execution reports real errors
+            logger.warning(f"Validation failed, running query unchecked: {e}")
+            return []
+        if errors:
+            log_debug(f"Validation rejected query: {errors}")
+        return errors
+
+    def lint_query(self, query: str) -> List[str]:
+        """
+        Warn when predicates on large tables match no index. Warnings never block the query.
+        """
+        if not self.validation or self.snapshot is None or not self.snapshot.indexes:
+            return []
+        try:
+            return lint_indexes(query, self.db_engine.dialect.name, self.snapshot, INDEX_LINT_MIN_ROWS)
+        except Exception as e:
+            log_debug(f"Index lint skipped: {e}")
+            return []
+
+    def check_query(self, query: str, limit: Optional[int] = None) -> Tuple[Optional[str], str]:
+        """
+        Estimate a query before execution.
+
+        Returns the SQL to run (possibly rewritten with a LIMIT) and a note for the agent,
+        or None and the rejection message when the query is over the thresholds.
+        """
+        if not self.preflight or not is_explainable(query):
+            return query, ""
+
+        dialect = self.db_engine.dialect.name
+        with timed("sql.preflight", database=self.database, dialect=dialect):
+            try:
+                with self.db_engine.connect() as conn:
+                    plan = explain(conn, dialect, query)
+            except Exception as e:
+                # The guard must not block queries it cannot estimate; execution reports real errors
+                logger.warning(f"Preflight failed, running query without estimate: {e}")
+                return query, ""
+            if plan is None or self._within_limits(plan):
+                return query, ""
+
+            # Large results without a LIMIT are capped before giving up on the query
+            if not has_limit(query):
+                rewritten = with_limit(query, limit or 1000)
+                try:
+                    with self.db_engine.connect() as conn:
+                        rewritten_plan = explain(conn, dialect, rewritten)
+                except Exception as e:
+                    # The original is already over the limits, so a failed rewrite rejects it
+                    log_debug(f"Preflight could not estimate the query with a LIMIT: {e}")
+                    rewritten_plan = None
+                if rewritten_plan is not None and self._within_limits(rewritten_plan):
+                    log_debug(f"Preflight rewrote query with LIMIT {limit or 1000}")
+                    return rewritten, f"Note: query was capped at {limit or 1000} rows by the preflight guard ({plan.describe().splitlines()[0]})."
+
+        return None, (
+            f"Query rejected by the preflight guard: {plan.describe()}\n"
+            f"Limits: {self.max_rows:,.0f} rows, {self.max_cost:,.0f} cost.\n"
+            "Reformulate the query: filter on indexed or partition columns, avoid cross joins, "
+            "aggregate before joining, or add a LIMIT."
+        )
+
+    def _within_limits(self, plan) -> bool:
+        """
+        Check an estimated plan against the configured thresholds.
+        """
+        if plan.rows > self.max_rows:
+            return False
+        if plan.cost is not None and plan.cost > self.max_cost:
+            return False
+        return True
+
+    def run_sql(self, sql: str, limit: Optional[int] = None) -> List[dict]:
+        """
+        Run a query and record its wall time, row count and result size.
+        """
+        with timed("sql.execute", database=self.database, dialect=self.db_engine.dialect.name) as span:
+            rows = self._run_cancellable(sql=sql, limit=limit)
+            span["rows"] = len(rows)
+            span["bytes"] = len(json.dumps(rows, default=str))
+        return rows
+
+    def _run_cancellable(self, sql: str, limit: Optional[int] = None) -> List[dict]:
+        """
+        Execute on a worker thread so Ctrl-C reaches the main thread while the driver blocks,
+        then cancel the query on the server instead of leaving it running.
+        """
+        log_debug(f"Running sql |\n{sql}")
+        # ClickHouse queries are found for cancellation by a unique marker in their text
+        marker = uuid4().hex
+        sql = f"/* data-ai:{marker} */ {sql}"
+
+        with self.db_engine.connect() as conn:
+            session = session_id(conn)
+            executor = ThreadPoolExecutor(max_workers=1)
+            future = executor.submit(self._execute, conn, sql, limit)
+            try:
+                while True:
+                    try:
+                        return future.result(timeout=0.2)
+                    except TimeoutError:
+                        continue
+            except KeyboardInterrupt:
+                logger.warning(f"Cancelling query on {self.database}")
+                try:
+                    cancel_query(self.db_engine, session=session, marker=marker)
+                except Exception as e:
+                    logger.error(f"Failed to cancel query on {self.database}: {e}")
+                try:
+                    # Give the driver a moment to return once the server stops the query
+                    future.exception(timeout=5)
+                except TimeoutError:
+                    pass
+                raise
+            finally:
+                executor.shutdown(wait=False)
+
+    @staticmethod
+    def _execute(conn, sql: str, limit: Optional[int]) -> List[dict]:
+        """
+        Run a statement on a connection and return its rows as dicts.
+        """
+        result = conn.execute(text(sql))
+        rows = []
+        if result.returns_rows:
+            rows = result.fetchmany(limit) if limit else result.fetchall()
+        conn.commit()
+        return [row._asdict() for row in rows]
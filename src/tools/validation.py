@@ -0,0 +1,334 @@
+"""
+This module validates agent-generated SQL locally, before it reaches the database.
+
+Statements are parsed with sqlglot in the database's dialect, anything other than
+a read-only query is rejected, and table and column references are checked
+against the schema snapshot captured when the database was added. A lint also
+warns when predicates on large tables match no index.
+"""
+
+import json
+import logging
+import re
+from dataclasses import dataclass, field
+from difflib import get_close_matches
+from typing import Dict, List, Optional, Union
+
+import sqlglot
+from sqlglot import exp
+from sqlglot.errors import OptimizeError, ParseError
+from sqlglot.optimizer.normalize_identifiers import normalize_identifiers
+from sqlglot.optimizer.qualify import qualify
+from sqlglot.schema import MappingSchema
+
+# SQLAlchemy dialect names mapped to sqlglot dialects
+DIALECTS = {
+    "postgresql": "postgres",
+    "mysql": "mysql",
+    "clickhouse": "clickhouse",
+    "sqlite": "sqlite",
+}
+
+# Dialects whose identifiers resolve regardless of case, quoted or not
+_CASE_INSENSITIVE = {"mysql", "clickhouse"}
+
+# Statements an agent may run
+_READ_STATEMENTS = (exp.Query, exp.Show, exp.Describe)
+
+# Nodes that write data, change the schema or session, or lock rows, wherever they appear
+_WRITE_NODES = (
+    exp.Insert, exp.Update, exp.Delete, exp.Merge,
+    exp.Create, exp.Drop, exp.Alter, exp.TruncateTable,
+    exp.Grant, exp.Copy, exp.Set, exp.Command,
+    exp.Into, exp.Lock,
+)
+
+# Extracts the column name from sqlglot's resolution errors
+_UNRESOLVED_COLUMN = re.compile(r"(?:Column '([^']+)'|Unknown column: (\S+))")
+
+# Unsupported syntax is reported through the returned errors, not sqlglot's warnings
+logging.getLogger("sqlglot").setLevel(logging.ERROR)
+
+@dataclass
+class SchemaSnapshot:
+    """
+    Tables and columns of a database at the time it was added.
+
+    Attributes:
+        database (str): Name of the database (or current schema) the tables belong to.
+        tables (Dict[str, List[str]]): Column names per table; tables outside the default
+            schema are named `schema.table`.
+        indexes (Dict[str, List[List[str]]]): Indexed columns per table, one list per index
+            (the primary key included), leading column first.
+        rows (Dict[str, float]): Estimated rows per table, where the catalog reports them.
+    """
+    database: str = ""
+    tables: Dict[str, List[str]] = field(default_factory=dict)
+    indexes: Dict[str, List[List[str]]] = field(default_factory=dict)
+    rows: Dict[str, float] = field(default_factory=dict)
+
+    @classmethod
+    def from_json(cls, schema: Union[str, dict, None]) -> Optional["SchemaSnapshot"]:
+        """
+        Build a snapshot from the catalog JSON produced by `Database.to_json()`.
+
+        Returns None when no snapshot was stored.
+        """
+        if not schema:
+            return None
+        document = json.loads(schema) if isinstance(schema, str) else schema
+        tables = document.get("tables", [])
+        return cls(
+            database=str(document.get("database") or ""),
+            tables={table["name"]: [column["name"] for column in table.get("columns", [])] for table in tables},
+            indexes={
+                table["name"]: ([table["primary_key"]] if table.get("primary_key") else [])
+                + [index["columns"] for index in table.get("indexes", []) if index.get("columns")]
+                for table in tables
+            },
+            rows={table["name"]: table["rows"] for table in tables if table.get("rows") is not None},
+        )
+
+    def find_table(self, name: str) -> Optional[str]:
+        """Return the snapshot's spelling of a table name, matched case-insensitively."""
+        lowered = name.lower()
+        return next((table for table in self.tables if table.lower() == lowered), None)
+
+    def resolve(self, table: exp.Table) -> Optional[str]:
+        """Return the snapshot table a parsed table reference points to, if known."""
+        if table.db.lower() in self.own_schemas():
+            return self.find_table(table.name)
+        return self.find_table(f"{table.db}.{table.name}")
+
+    def own_schemas(self) -> set:
+        """Schema qualifiers that refer to the snapshot's default schema."""
+        return {"", "public", self.database.lower()}
+
+    def has_schema(self, schema: str) -> bool:
+        """Whether the snapshot holds tables of a non-default schema."""
+        prefix = f"{schema.lower()}."
+        return any(table.lower().startswith(prefix) for table in self.tables)
+
+def validate(sql: str, dialect: str, snapshot: Optional[SchemaSnapshot] = None) -> List[str]:
+    """
+    Validate a statement without touching the database.
+
+    Args:
+        sql (str): The statement to check.
+        dialect (str): SQLAlchemy dialect name of the target database.
+        snapshot (SchemaSnapshot): Known tables and columns; references are not checked without it.
+
+    Returns:
+        List[str]: Errors for the agent; empty when the statement may run.
+    """
+    read = DIALECTS.get(dialect)
+    try:
+        statements = [s for s in sqlglot.parse(sql, read=read) if s is not None]
+    except ParseError as e:
+        return [_parse_error(e)]
+
+    if len(statements) != 1:
+        return [f"Expected exactly one statement, got {len(statements)}. Run statements one at a time."]
+    statement = statements[0]
+
+    if not isinstance(statement, _READ_STATEMENTS):
+        return [f"Only read-only queries are allowed; {statement.key.upper()} statements are rejected."]
+    for node in statement.walk():
+        if isinstance(node, _WRITE_NODES):
+            return [f"Only read-only queries are allowed; the query contains {node.key.upper()}."]
+
+    if snapshot is None or not isinstance(statement, exp.Query):
+        return []
+
+    errors, checkable = _check_tables(statement, snapshot)
+    if errors or not checkable:
+        return errors
+    return _check_columns(statement, read, snapshot)
+
+def _parse_error(error: ParseError) -> str:
+    """
+    Render the first parser error with its position.
+    """
+    if not error.errors:
+        return f"Syntax error: {error}"
+    detail = error.errors[0]
+    near = (detail.get("highlight") or "").strip()
+    near = f" near '{near}'" if near else ""
+    return f"Syntax error at line {detail.get('line')}, column {detail.get('col')}{near}: {detail.get('description')}"
+
+def _check_tables(statement: exp.Expression, snapshot: SchemaSnapshot):
+    """
+    Check that every referenced table exists in the snapshot.
+
+    Returns the errors, and whether columns can be checked (all tables are known).
+    """
+    ctes = {cte.alias_or_name.lower() for cte in statement.find_all(exp.CTE)}
+    own_schemas = snapshot.own_schemas()
+    errors = []
+    checkable = True
+    for table in statement.find_all(exp.Table):
+        if not isinstance(table.this, exp.Identifier):
+            # Table functions such as generate_series() or numbers()
+            checkable = False
+            continue
+        name = table.name
+        if not table.db and name.lower() in ctes:
+            continue
+        if table.db.lower() not in own_schemas and not snapshot.has_schema(table.db):
+            # System catalogs and other databases are outside the snapshot
+            checkable = False
+            continue
+        if table.db.lower() not in own_schemas:
+            name = f"{table.db}.{name}"
+        found = snapshot.resolve(table)
+        if found is not None and not snapshot.tables[found]:
+            # Tables introspected without column metadata cannot be resolved column by column
+            checkable = False
+        if found is None:
+            suggestion = get_close_matches(name, list(snapshot.tables), n=3)
+            hint = f" Did you mean {', '.join(repr(s) for s in suggestion)}?" if suggestion else ""
+            errors.append(f"Unknown table '{name}'.{hint}")
+    if errors:
+        known = sorted(snapshot.tables)
+        listed = ", ".join(known[:30]) + (f" and {len(known) - 30} more" if len(known) > 30 else "")
+        errors.append(f"Known tables: {listed}.")
+    return errors, checkable
+
+def _resolver_dialect(read: Optional[str]) -> Optional[str]:
+    """
+    Dialect used to resolve names: the database's own, folding identifiers the way its server does.
+    """
+    if read in _CASE_INSENSITIVE:
+        return f"{read}, normalization_strategy = case_insensitive"
+    return read
+
+def _mapping(snapshot: SchemaSnapshot, read: Optional[str]) -> MappingSchema:
+    """
+    Build the sqlglot schema used to resolve columns; types are not needed.
+
+    Catalog names are quoted, so they keep their exact spelling and only query identifiers are
+    folded, as the server does (e.g. unquoted identifiers are lowercased on PostgreSQL).
+    Snapshots with `schema.table` names are nested by schema, with unqualified tables under `public`.
+    """
+    def quoted(name: str) -> str:
+        return exp.to_identifier(name, quoted=True).sql(dialect=read)
+
+    tables = {
+        table: {quoted(column): "UNKNOWN" for column in columns}
+        for table, columns in snapshot.tables.items() if columns
+    }
+    if not any("." in table for table in tables):
+        return MappingSchema({quoted(table): columns for table, columns in tables.items()}, dialect=_resolver_dialect(read))
+    nested: Dict[str, Dict[str, Dict[str, str]]] = {}
+    for table, columns in tables.items():
+        schema, name = table.split(".", 1) if "." in table else ("public", table)
+        nested.setdefault(quoted(schema), {})[quoted(name)] = columns
+    return MappingSchema(nested, dialect=_resolver_dialect(read))
+
+def _qualify(statement: exp.Expression, snapshot: SchemaSnapshot, read: Optional[str], validate: bool) -> exp.Expression:
+    """
+    Qualify tables and columns against the snapshot.
+    """
+    schema = _mapping(snapshot, read)
+    # Nested schemas need a default schema for unqualified tables
+    db = "public" if schema.depth() > 1 else None
+    return qualify(statement, schema=schema, db=db, dialect=_resolver_dialect(read), validate_qualify_columns=validate)
+
+def _check_columns(statement: exp.Expression, read: Optional[str], snapshot: SchemaSnapshot) -> List[str]:
+    """
+    Resolve every column against the snapshot, naming the columns available instead.
+    """
+    try:
+        _qualify(statement.copy(), snapshot, read, validate=True)
+        return []
+    except OptimizeError as e:
+        message = str(e)
+
+    referenced = []
+    misfolded = []
+    for table in statement.find_all(exp.Table):
+        found = snapshot.resolve(table)
+        if found and found not in referenced:
+            referenced.append(found)
+        # Tables are matched case-insensitively above, but the server folds unquoted names
+        if found and read not in _CASE_INSENSITIVE:
+            name = normalize_identifiers(table.this.copy(), dialect=read).name
+            if name != found.split(".")[-1]:
+                misfolded.append((name, found))
+    if misfolded:
+        return [
+            f"Table '{name}' could not be resolved: unquoted names are case-folded; "
+            f"quote it as {exp.to_identifier(found.split('.')[-1], quoted=True).sql(dialect=read)}."
+            for name, found in misfolded
+        ]
+
+    match = _UNRESOLVED_COLUMN.search(message)
+    column = (match.group(1) or match.group(2)) if match else ""
+
+    # Names introduced by dialect constructs the resolver does not follow (e.g. ARRAY JOIN ... AS a)
+    aliases = {alias.alias.lower() for alias in statement.find_all(exp.Alias)}
+    if column and column.lower() in aliases:
+        return []
+
+    candidates = [c for table in referenced for c in snapshot.tables[table]]
+    suggestion = get_close_matches(column, candidates, n=3) if column else []
+
+    errors = [message if message.endswith(".") else f"{message}."]
+    if suggestion:
+        errors.append(f"Did you mean {', '.join(repr(s) for s in suggestion)}?")
+    # The server folded an unquoted identifier to a case the catalog does not use
+    folded = [c for c in candidates if column and c.lower() == column.lower() and c != column]
+    if folded:
+        errors.append(f"Unquoted names are case-folded; quote the column as {exp.to_identifier(folded[0], quoted=True).sql(dialect=read)}.")
+    for table in referenced:
+        errors.append(f"Columns of '{table}': {', '.join(snapshot.tables[table])}.")
+    return errors
+
+def lint_indexes(sql: str, dialect: str, snapshot: SchemaSnapshot, min_rows: float) -> List[str]:
+    """
+    Warn when WHERE or JOIN predicates on a large table match the leading column of none of its indexes.
+
+    Args:
+        sql (str): A statement that passed `validate`.
+        dialect (str): SQLAlchemy dialect name of the target database.
+        snapshot (SchemaSnapshot): Known tables with their indexes and row estimates.
+        min_rows (float): Tables with fewer estimated rows are not linted.
+
+    Returns:
+        List[str]: Warnings for the agent; the query still runs.
+    """
+    read = DIALECTS.get(dialect)
+    statement = _qualify(sqlglot.parse_one(sql, read=read), snapshot, read, validate=False)
+
+    # Qualified columns refer to tables by alias
+    aliases = {}
+    for table in statement.find_all(exp.Table):
+        found = snapshot.resolve(table)
+        if found:
+            aliases[table.alias_or_name.lower()] = found
+
+    predicates = [where.this for where in statement.find_all(exp.Where)]
+    predicates += [join.args["on"] for join in statement.find_all(exp.Join) if join.args.get("on")]
+    used: Dict[str, List[str]] = {}
+    for predicate in predicates:
+        for column in predicate.find_all(exp.Column):
+            table = aliases.get(column.table.lower())
+            if table and column.name not in used.setdefault(table, []):
+                used[table].append(column.name)
+
+    warnings = []
+    for table, columns in used.items():
+        rows = snapshot.rows.get(table, 0)
+        if rows < min_rows:
+            continue
+        indexes = snapshot.indexes.get(table, [])
+        leading = {index[0].lower() for index in indexes}
+        if any(column.lower() in leading for column in columns):
+            continue
+        available = "; ".join(f"({', '.join(index)})" for index in indexes) or "none"
+        warnings.append(
+            f"Index lint: predicates on {table} (~{rows:,.0f} rows) use {', '.join(columns)}, "
+            f"but no index starts with these columns (indexes: {available}). "
+            "Filter or join on a leading indexed column if the question allows it."
+        )
+    return warnings